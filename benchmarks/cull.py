@@ -0,0 +1,44 @@
+"""
+Compares culling the weakest tenth of a horde by sorting and rebuilding it against selecting them with weakest_members
+and removing them in place.
+
+Usage: python benchmarks/cull.py [members]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from goblincommander.creature_groups import Horde  # noqa: E402
+from goblincommander.creatures import Goblin, GoblinCommander, generate_batch  # noqa: E402
+
+
+def build_horde(n: int, columnar: bool) -> Horde:
+    horde = Horde(columnar=columnar)
+    horde.members = generate_batch(Goblin, n - 1) + [GoblinCommander("Grub", "Brainy")]
+    return horde
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    for columnar in (False, True):
+        mode = "columnar" if columnar else "list"
+
+        horde = build_horde(n, columnar)
+        k = horde.size // 10
+        start = time.perf_counter()
+        horde.members = sorted(horde.members, key=lambda c: c.stats.beef.value, reverse=True)[:-k]
+        print(f"{mode:<10}sort and rebuild {(time.perf_counter() - start) * 1000:8.0f} ms")
+
+        horde = build_horde(n, columnar)
+        start = time.perf_counter()
+        weakest = horde.weakest_members(k)
+        selected = time.perf_counter()
+        horde.cull(weakest)
+        culled = time.perf_counter()
+        print(f"{mode:<10}select {(selected - start) * 1000:8.0f} ms, cull {(culled - selected) * 1000:8.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
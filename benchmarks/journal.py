@@ -0,0 +1,58 @@
+"""
+Journals a game of the given number of turns, played by the greedy simulation policy, then times fast-forwarding to
+its last turn from the nearest checkpoint against replaying it from the seed.
+
+Usage: python benchmarks/journal.py [turns]
+"""
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from random import Random
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from goblincommander import journal, main  # noqa: E402
+from goblincommander.creatures import GoblinCommander  # noqa: E402
+from goblincommander.simulation import Action, GreedyPolicy, take_action  # noqa: E402
+
+
+def main_():
+    turns = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    policy = GreedyPolicy()
+    with tempfile.TemporaryDirectory() as directory, redirect_stdout(io.StringIO()):
+        path = os.path.join(directory, "campaign.journal")
+        main.start_game(GoblinCommander("Grub", "Brainy"), Random(0))
+        main.journal = journal.Journal.start(0, path)
+        policy_rng = Random(1)
+        start = time.perf_counter()
+        for turn in range(turns):
+            action, target = policy.choose_action(main.state, policy_rng)
+            if main.state[main.StateKey.VICTORIOUS]:
+                # Keep the game going past victory so the journal reaches the requested length
+                action, target = Action.CULL_HORDE, None
+            take_action(action, target, policy)
+        journaled = time.perf_counter() - start
+        main.close_journal()
+
+        from_seed = os.path.join(directory, "from-seed.journal")
+        with open(from_seed, "w") as from_seed_file:
+            from_seed_file.writelines(json.dumps(e) + "\n" for e in journal.read_entries(path)
+                                      if e["event"] != "checkpoint")
+
+        start = time.perf_counter()
+        journal.replay(path, turns)
+        fast_forwarded = time.perf_counter() - start
+        start = time.perf_counter()
+        journal.replay(from_seed, turns)
+        replayed = time.perf_counter() - start
+
+    print(f"{turns} turns: played and journaled in {journaled * 1000:.0f} ms, fast-forwarded from the last "
+          f"checkpoint in {fast_forwarded * 1000:.0f} ms, replayed from the seed in {replayed * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main_()
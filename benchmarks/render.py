@@ -0,0 +1,85 @@
+"""
+Measures what one turn of the game costs to put on a terminal: the recruit screen's header and report, followed by
+the week counter and stash. Output goes to a pseudo-terminal, comparing unbuffered writes with a clear command, one
+buffered write with an ANSI clear, and the week counter and stash kept as status rows that are updated in place.
+
+Usage: python benchmarks/render.py [turns]
+"""
+import os
+import pty
+import sys
+import threading
+import time
+from contextlib import nullcontext, redirect_stdout
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from goblincommander import console, main  # noqa: E402
+from goblincommander.creatures import GoblinCommander  # noqa: E402
+from goblincommander.main import StateKey  # noqa: E402
+from goblincommander.rng import RandomStream  # noqa: E402
+
+# Bytes that have reached the terminal side so far
+received = [0]
+
+
+def drain(fd: int):
+    """Reads and counts the terminal side, as a terminal emulator would, until it is closed."""
+    try:
+        while data := os.read(fd, 65536):
+            received[0] += len(data)
+    except OSError:
+        pass
+
+
+def time_turns(terminal, turns: int, buffered: bool, status: bool) -> tuple[float, float]:
+    """Returns the mean wall-clock time, in milliseconds, and the mean bytes written to render one turn."""
+    with redirect_stdout(open(os.devnull, "w")):
+        main.start_game(GoblinCommander("Grub", "Brainy"), RandomStream(0))
+    main.state[StateKey.STASH].food = main.state[StateKey.STASH].gold = 10 ** 9
+
+    start = time.perf_counter()
+    received_at_start = received[0]
+    with redirect_stdout(terminal):
+        for _ in range(turns):
+            with console.buffered_output() if buffered else nullcontext():
+                main.recruit_goblins_fn()
+                if status:
+                    console.show_status(main.get_status_lines())
+                else:
+                    print(f"\nWeek {main.state[StateKey.WEEK]}")
+                    main.show_stash()
+            terminal.flush()
+        console.hide_status()
+    elapsed = time.perf_counter() - start
+    # Let the reader catch up before counting
+    time.sleep(0.2)
+    return elapsed / turns * 1000, (received[0] - received_at_start) / turns
+
+
+def main_():
+    turns = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    controller, follower = pty.openpty()
+    threading.Thread(target=drain, args=(controller,), daemon=True).start()
+    terminal = os.fdopen(os.dup(follower), "w", buffering=1)
+
+    # The clear command writes to the process's own stdout, so point that at the terminal too while timing
+    stdout_fd = os.dup(1)
+    os.dup2(follower, 1)
+    ansi = console.supports_ansi
+    try:
+        console.supports_ansi = lambda: False
+        results = [("clear command, unbuffered", time_turns(terminal, turns, buffered=False, status=False))]
+        console.supports_ansi = ansi
+        results.append(("ANSI clear, buffered", time_turns(terminal, turns, buffered=True, status=False)))
+        results.append(("status updated in place", time_turns(terminal, turns, buffered=True, status=True)))
+    finally:
+        console.supports_ansi = ansi
+        os.dup2(stdout_fd, 1)
+
+    for label, (milliseconds, size) in results:
+        print(f"{label:<32}{milliseconds:8.2f} ms/turn{size:10.0f} bytes/turn")
+
+
+if __name__ == "__main__":
+    main_()
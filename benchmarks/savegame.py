@@ -0,0 +1,86 @@
+"""
+Times saving and loading a game whose horde has the given number of members, and reports the save file's size. The
+save is then opened memory-mapped in a fresh process, which reports how long opening it and reading the horde's
+aggregates and first page took and how much resident memory that added.
+
+Usage: python benchmarks/savegame.py [members]
+"""
+import io
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from random import Random
+
+SOURCE = os.path.join(os.path.dirname(__file__), "..", "src")
+sys.path.insert(0, SOURCE)
+
+from goblincommander import main, savegame  # noqa: E402
+from goblincommander.creature_groups import Horde  # noqa: E402
+from goblincommander.creatures import Goblin, GoblinCommander, Ogre, Orc, generate_batch  # noqa: E402
+from goblincommander.main import StateKey  # noqa: E402
+
+
+OPEN_MAPPED = """
+import io, os, sys, time
+from goblincommander import printers, savegame
+from goblincommander.main import StateKey
+
+def memory():
+    # Resident bytes, and the part of them that is private rather than pages shared with the file cache
+    with open("/proc/self/statm") as statm:
+        resident, shared = map(int, statm.read().split()[1:3])
+    return resident * os.sysconf("SC_PAGE_SIZE"), (resident - shared) * os.sysconf("SC_PAGE_SIZE")
+
+before = memory()
+start = time.perf_counter()
+horde = savegame.load(sys.argv[1])[StateKey.HORDE]
+summary = horde.summarize()
+upkeep = horde.get_upkeep()
+opened = time.perf_counter() - start
+printers.print_creature_group(horde, page_size=20, pause=lambda: False, out=io.StringIO())
+paged = time.perf_counter() - start
+resident, private = (after - start for after, start in zip(memory(), before))
+print(f"mapped: opened with aggregates in {opened * 1000:.1f} ms, first page after {paged * 1000:.1f} ms, "
+      f"{resident / 2 ** 20:.1f} MiB more resident, {private / 2 ** 20:.1f} MiB of it private")
+"""
+
+
+def main_():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    with redirect_stdout(io.StringIO()):
+        main.start_game(GoblinCommander("Grub", "Brainy"), Random(0))
+    # Release the commander from the starting horde to lead a much bigger one
+    main.state[StateKey.HORDE].members = []
+    horde = Horde(columnar=True)
+    horde.members = (generate_batch(Goblin, n * 8 // 10) + generate_batch(Ogre, n // 10) +
+                     generate_batch(Orc, n - 1 - n * 8 // 10 - n // 10) + [main.state[StateKey.COMMANDER]])
+    horde.shift_reputation(0.5)
+    main.state[StateKey.HORDE] = horde
+
+    out = io.BytesIO()
+    start = time.perf_counter()
+    savegame.dump(main.state, out)
+    saved = time.perf_counter() - start
+    data = out.getvalue()
+
+    start = time.perf_counter()
+    # Kept until after the clock stops, so that freeing it isn't timed along with loading it
+    loaded_state = savegame.loads(data)
+    loaded = time.perf_counter() - start
+    del loaded_state
+
+    print(f"{n} members: saved in {saved * 1000:.0f} ms, loaded in {loaded * 1000:.0f} ms, "
+          f"{len(data) / n:.1f} bytes per member")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "campaign.sav")
+        with open(path, "wb") as save_file:
+            save_file.write(data)
+        subprocess.run([sys.executable, "-c", OPEN_MAPPED, path], env={**os.environ, "PYTHONPATH": SOURCE}, check=True)
+
+
+if __name__ == "__main__":
+    main_()
@@ -0,0 +1,29 @@
+"""
+Measures headless simulation throughput, in games per second, for increasing numbers of worker processes.
+
+Usage: python benchmarks/simulation.py [games]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from goblincommander.simulation import simulate_games  # noqa: E402
+
+
+def main():
+    games = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    summary = None
+    workers = 1
+    while workers <= (os.cpu_count() or 1):
+        start = time.perf_counter()
+        summary, _ = simulate_games(games, workers=workers)
+        elapsed = time.perf_counter() - start
+        print(f"{workers:>3} worker(s){games / elapsed:10.1f} games/s")
+        workers *= 2
+    print(summary)
+
+
+if __name__ == "__main__":
+    main()
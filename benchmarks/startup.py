@@ -0,0 +1,34 @@
+"""
+Measures how long a fresh interpreter takes to import the game's modules.
+
+Usage: python benchmarks/startup.py [runs]
+"""
+import os
+import subprocess
+import sys
+import time
+
+MODULES = ["goblincommander.creatures", "goblincommander.settlements", "goblincommander.main"]
+
+
+def time_import(module: str, runs: int) -> float:
+    """Returns the best wall-clock time, in milliseconds, to start Python and import module."""
+    env = dict(os.environ, PYTHONPATH=os.path.join(os.path.dirname(__file__), "..", "src"))
+    best = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", f"import {module}"], env=env, check=True)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    baseline = time_import("json", runs)
+    print(f"{'interpreter + json':<32}{baseline:8.1f} ms")
+    for module in MODULES:
+        print(f"{module:<32}{time_import(module, runs):8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+import random
+from enum import Enum
+from functools import lru_cache
+from typing import NamedTuple
+
+from goblincommander.creature_groups import GroupSummary
+from goblincommander.creatures import Human
+from goblincommander.distributions import largest_satisfying, probability_at_most
+
+# Horde average reputation above which defenders lose their wits, or may offer to surrender
+FEARSOME_REPUTATION = 4.5
+# Militia average cunning above which a fearsome horde is offered a surrender
+SURRENDER_CUNNING = 7.0
+
+
+class ModifierKind(str, Enum):
+    DEMORALIZED = "demoralized"
+    AMBUSHED = "ambushed"
+    SCOUTED_RALLY = "scouted_rally"
+    RALLIED = "rallied"
+    SCOUTED_EDGE = "scouted_edge"
+    CUNNING_EDGE = "cunning_edge"
+    OUTWITTED = "outwitted"
+
+
+class Modifier(NamedTuple):
+    """A raid modifier that was applied, with the size of the stat change it caused."""
+    kind: ModifierKind
+    amount: float
+
+
+class RaidOutcome(NamedTuple):
+    """Result of a raid, free of terminal I/O and game state so it can be tested and simulated directly."""
+    base_horde_beef: float
+    base_militia_beef: float
+    horde_beef: float
+    militia_beef: float
+    modifiers: tuple[Modifier, ...]
+    victory: bool
+    casualties: int
+
+
+def surrender_offered(horde_summary: GroupSummary, militia_summary: GroupSummary) -> bool:
+    """Whether a settlement offers its militia to the horde before the raid begins."""
+    return (horde_summary.avg_reputation > FEARSOME_REPUTATION
+            and militia_summary.avg_cunning > SURRENDER_CUNNING)
+
+
+def resolve_raid(horde_summary: GroupSummary, militia_summary: GroupSummary, scouted: bool, rng=None) -> RaidOutcome:
+    """
+    Applies the raid rules to the two sides' aggregates and decides the battle. A lost raid draws the number of horde
+    casualties from rng, which defaults to the random module.
+    """
+    horde_beef = horde_summary.total_beef
+    militia_beef = militia_summary.total_beef
+    militia_cunning = militia_summary.total_cunning
+    modifiers = []
+
+    if horde_summary.avg_reputation > FEARSOME_REPUTATION:
+        modifiers.append(Modifier(ModifierKind.DEMORALIZED, militia_cunning * 0.3))
+        militia_cunning *= 0.7
+
+    if horde_summary.avg_quickness > militia_summary.avg_quickness:
+        modifiers.append(Modifier(ModifierKind.AMBUSHED, militia_beef * 0.1))
+        militia_beef *= 0.9
+    elif scouted:
+        modifiers.append(Modifier(ModifierKind.SCOUTED_RALLY, 0.0))
+    else:
+        modifiers.append(Modifier(ModifierKind.RALLIED, horde_beef * 0.1))
+        horde_beef *= 0.9
+
+    # Use the modified militia cunning, which may have been demoralized
+    if scouted or horde_summary.avg_cunning > militia_cunning / militia_summary.size:
+        kind = ModifierKind.SCOUTED_EDGE if scouted else ModifierKind.CUNNING_EDGE
+        modifiers.append(Modifier(kind, horde_beef * 0.1))
+        horde_beef *= 1.1
+    else:
+        modifiers.append(Modifier(ModifierKind.OUTWITTED, militia_beef * 0.1))
+        militia_beef *= 1.1
+
+    victory = horde_beef > militia_beef
+    casualties = 0 if victory else (rng or random).randint(3, 5)
+    return RaidOutcome(horde_summary.total_beef, militia_summary.total_beef, horde_beef, militia_beef,
+                       tuple(modifiers), victory, casualties)
+
+
+@lru_cache(maxsize=4096)
+def win_probability(horde_summary: GroupSummary,
+                    minimum_militia_size: int,
+                    maximum_militia_size: int,
+                    scouted=False) -> float:
+    """
+    Probability that the horde wins a raid, under resolve_raid's rules, against a militia of Humans whose size is drawn
+    uniformly from the given range. Surrenders are not counted.
+
+    Given its size, a militia's beef, cunning and quickness totals are independent sums of uniform draws, and each rule
+    is a threshold on one of them. The probability is therefore computed exactly from those sums' distributions rather
+    than by sampling, and results are cached per horde summary and settlement size range.
+    """
+    h = horde_summary
+    demoralized = h.avg_reputation > FEARSOME_REPUTATION
+    cunning_factor = 0.7 if demoralized else 1.0
+    sizes = range(max(minimum_militia_size, 1), max(maximum_militia_size, minimum_militia_size, 1) + 1)
+
+    total = 0.0
+    for n in sizes:
+        low_q, high_q = n * Human.MINIMUM_QUICKNESS, n * Human.MAXIMUM_QUICKNESS
+        fastest_q = largest_satisfying(low_q, high_q, lambda q: h.avg_quickness > q / n)
+        p_fast = probability_at_most(n, Human.MINIMUM_QUICKNESS, Human.MAXIMUM_QUICKNESS, fastest_q)
+
+        if scouted:
+            p_edge = 1.0
+        else:
+            low_c, high_c = n * Human.MINIMUM_CUNNING, n * Human.MAXIMUM_CUNNING
+            dullest_c = largest_satisfying(low_c, high_c, lambda c: h.avg_cunning > c * cunning_factor / n)
+            p_edge = probability_at_most(n, Human.MINIMUM_CUNNING, Human.MAXIMUM_CUNNING, dullest_c)
+
+        for fast, p_quickness in ((True, p_fast), (False, 1.0 - p_fast)):
+            for edge, p_cunning in ((True, p_edge), (False, 1.0 - p_edge)):
+                if p_quickness <= 0.0 or p_cunning <= 0.0:
+                    continue
+                # Mirror resolve_raid's arithmetic so ties fall the same way
+                horde_beef = h.total_beef
+                if not fast and not scouted:
+                    horde_beef *= 0.9
+                if edge:
+                    horde_beef *= 1.1
+
+                def horde_wins(militia_beef: float, fast=fast, edge=edge, horde_beef=horde_beef) -> bool:
+                    if fast:
+                        militia_beef *= 0.9
+                    if not edge:
+                        militia_beef *= 1.1
+                    return horde_beef > militia_beef
+
+                strongest_b = largest_satisfying(n * Human.MINIMUM_BEEF, n * Human.MAXIMUM_BEEF, horde_wins)
+                p_beef = probability_at_most(n, Human.MINIMUM_BEEF, Human.MAXIMUM_BEEF, strongest_b)
+                total += p_quickness * p_cunning * p_beef
+
+    return total / len(sizes)
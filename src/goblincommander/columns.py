@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+from array import array
+from typing import Iterable
+
+
+class StringTable(dict):
+    """Indices of a list of strings, in order. Looking up a new string adds it to the end of the table."""
+
+    def __init__(self, strings: Iterable[str] = ()):
+        super().__init__((string, index) for index, string in enumerate(dict.fromkeys(strings)))
+        self.strings = list(self)
+
+    def __missing__(self, string: str) -> int:
+        index = self[string] = len(self.strings)
+        self.strings.append(string)
+        return index
+
+
+class CreatureColumns:
+    """
+    Parallel arrays holding the stats and upkeep of a group's members, one row per creature, along with each member's
+    labels and position in the group's per-type index. The creature_type column holds indices into CREATURE_TYPES, and
+    name and adjective hold indices into the label table shared by every group; see get_label_table.
+
+    Keeping each value in its own typed column lets group aggregates run as a single C-level reduction over the array
+    instead of walking every creature's attribute chain.
+    """
+
+    TYPECODES = {
+        "beef": "q",
+        "cunning": "q",
+        "quickness": "q",
+        "reputation": "d",
+        "food": "q",
+        "gold": "q",
+        "type_slot": "q",
+        "creature_type": "b",
+        "name": "i",
+        "adjective": "i",
+    }
+
+    def __init__(self):
+        self.beef = array("q")
+        self.cunning = array("q")
+        self.quickness = array("q")
+        self.reputation = array("d")
+        self.food = array("q")
+        self.gold = array("q")
+        self.type_slot = array("q")
+        self.creature_type = array("b")
+        self.name = array("i")
+        self.adjective = array("i")
+
+    def __len__(self) -> int:
+        return len(self.beef)
+
+    def append(self, beef: int, cunning: int, quickness: int, reputation: float, food: int, gold: int,
+               type_slot: int, creature_type: int, name: int, adjective: int) -> int:
+        """Adds a row to the end of the columns and returns its index."""
+        self.beef.append(beef)
+        self.cunning.append(cunning)
+        self.quickness.append(quickness)
+        self.reputation.append(reputation)
+        self.food.append(food)
+        self.gold.append(gold)
+        self.type_slot.append(type_slot)
+        self.creature_type.append(creature_type)
+        self.name.append(name)
+        self.adjective.append(adjective)
+        return len(self.beef) - 1
+
+    def get(self, field: str, row: int) -> int | float:
+        return getattr(self, field)[row]
+
+    def set(self, field: str, row: int, value: int | float):
+        getattr(self, field)[row] = value
+
+    def total(self, field: str) -> int | float:
+        """Sums an entire column."""
+        return sum(getattr(self, field))
+
+    def swap_remove(self, row: int):
+        """Removes a row in O(1) by moving the last row into its place."""
+        # The instance holds nothing but its columns, so this skips looking each one up by name
+        for column in vars(self).values():
+            column[row] = column[-1]
+            column.pop()
+
+    def clear(self):
+        for field, typecode in CreatureColumns.TYPECODES.items():
+            setattr(self, field, array(typecode))
+
+
+# Names of the slots that hold each field while a ColumnView is not backed by columns
+LOCAL_SLOTS = {field: f"_{field}" for field in CreatureColumns.TYPECODES}
+
+
+class ColumnView:
+    """
+    Base class for small value objects owned by a creature group. The owner is told about every field change so it can
+    keep running totals, and a columnar owner can also move the fields into one row of its CreatureColumns. Attaching
+    keeps the object's public API working while the group tracks or stores the data.
+
+    Subclasses list their FIELDS and declare a slot named after each field with a leading underscore.
+    """
+
+    __slots__ = ("_owner", "_columns", "_row")
+
+    FIELDS: tuple[str, ...] = ()
+
+    def __init__(self):
+        self._owner = None
+        self._columns: CreatureColumns | None = None
+        self._row: int | None = None
+
+    def get(self, field: str) -> int | float:
+        return self.load(field)
+
+    def set(self, field: str, value: int | float):
+        if self._owner is not None:
+            self._owner.field_changed(field, self.get(field), value)
+        self.store(field, value)
+
+    def load(self, field: str) -> int | float:
+        """Reads the stored value of a field, wherever it lives, without notifying or consulting the owner."""
+        if self._columns is None:
+            return getattr(self, LOCAL_SLOTS[field])
+        return getattr(self._columns, field)[self._row]
+
+    def store(self, field: str, value: int | float):
+        """Writes the stored value of a field without notifying the owner."""
+        if self._columns is None:
+            setattr(self, LOCAL_SLOTS[field], value)
+        else:
+            getattr(self._columns, field)[self._row] = value
+
+    def is_attached(self) -> bool:
+        return self._owner is not None
+
+    def attach(self, owner, columns: CreatureColumns | None = None, row: int | None = None):
+        """
+        Reports future field changes to owner. If columns are given, storage moves to the given row, which must
+        already hold the current values.
+        """
+        self._owner = owner
+        self._columns = columns
+        self._row = row
+
+    def relocate(self, row: int):
+        """Points this object at a new row after its values were moved there."""
+        self._row = row
+
+    def detach(self):
+        """Stops reporting changes and copies the fields out of any row so they no longer depend on the columns."""
+        if self._columns is not None:
+            for field in self.FIELDS:
+                setattr(self, LOCAL_SLOTS[field], getattr(self._columns, field)[self._row])
+        self._owner = None
+        self._columns = None
+        self._row = None
@@ -1,9 +1,17 @@
+import io
 import os
+import shutil
+import sys
+from contextlib import contextmanager
 from enum import Enum
-from typing import Optional, Callable
+from functools import cache
+from typing import Optional, Callable, TextIO
 
 from termcolor import colored
 
+# Moves the cursor home, then erases the screen and the scrollback
+ANSI_CLEAR = "\033[H\033[2J\033[3J"
+
 
 class ConsoleColor(str, Enum):
     BLUE = "blue"
@@ -11,9 +19,183 @@ class ConsoleColor(str, Enum):
     RED = "red"
 
 
+class OutputBuffer(io.StringIO):
+    """Holds a screen's output in memory until it is flushed to the underlying stream in one write."""
+
+    def __init__(self, stream: TextIO):
+        super().__init__()
+        self.stream = stream
+
+    def isatty(self) -> bool:
+        return self.stream.isatty()
+
+    def flush(self):
+        text = self.getvalue()
+        if text:
+            self.stream.write(text)
+            self.seek(0)
+            self.truncate()
+        self.stream.flush()
+
+
+@contextmanager
+def buffered_output():
+    """
+    Collects everything printed inside into one buffer that is written out in a single write when the block ends, or
+    earlier whenever a prompt needs the terminal. Nested blocks share the outermost buffer.
+    """
+    if isinstance(sys.stdout, OutputBuffer):
+        yield sys.stdout
+        return
+
+    buffer = OutputBuffer(sys.stdout)
+    sys.stdout = buffer
+    try:
+        yield buffer
+    finally:
+        sys.stdout = buffer.stream
+        buffer.flush()
+
+
+@contextmanager
+def direct_output():
+    """Flushes any buffered output, then writes straight to the terminal inside, as interactive prompts need."""
+    buffer = sys.stdout
+    if not isinstance(buffer, OutputBuffer):
+        yield
+        return
+
+    buffer.flush()
+    sys.stdout = buffer.stream
+    try:
+        yield
+    finally:
+        sys.stdout = buffer
+
+
+def _enable_windows_ansi() -> bool:
+    """Turns on escape sequence processing for the Windows console, returning whether it is available."""
+    try:
+        import ctypes
+
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.GetStdHandle(-11)
+        mode = ctypes.c_uint32()
+        if not kernel32.GetConsoleMode(handle, ctypes.byref(mode)):
+            return False
+        # ENABLE_VIRTUAL_TERMINAL_PROCESSING
+        return bool(kernel32.SetConsoleMode(handle, mode.value | 0x0004))
+    except (AttributeError, OSError):
+        return False
+
+
+@cache
+def supports_ansi() -> bool:
+    if os.environ.get("TERM") == "dumb":
+        return False
+    return os.name != "nt" or _enable_windows_ansi()
+
+
+def can_move_cursor(out: Optional[TextIO] = None) -> bool:
+    return (out or sys.stdout).isatty() and supports_ansi()
+
+
+class ScreenModel:
+    """
+    The lines last drawn in a block of terminal rows starting at row top. Rendering new lines rewrites only the rows
+    that changed, reaching them with cursor-movement escapes, so a repaint sends a few bytes rather than the whole
+    screen. Whatever else overwrites the block must call invalidate, so that the next render draws it in full.
+    """
+
+    def __init__(self, top: int = 1):
+        self.top = top
+        self.lines: Optional[list[str]] = None
+
+    def invalidate(self):
+        self.lines = None
+
+    def available_rows(self) -> int:
+        return shutil.get_terminal_size().lines - self.top + 1
+
+    def fits(self, lines: list[str]) -> bool:
+        """Whether lines fit below top without wrapping or scrolling, which would move them off the rows tracked."""
+        columns = shutil.get_terminal_size().columns
+        return len(lines) < self.available_rows() and all(len(line) < columns for line in lines)
+
+    def changes(self, lines: list[str]) -> str:
+        """Escapes and text that bring the block from its last render to lines, and records lines as rendered."""
+        parts = [f"\033[{self.top + row};1H{line}\033[K" for row, line in enumerate(lines)
+                 if self.lines is None or row >= len(self.lines) or self.lines[row] != line]
+        self.lines = list(lines)
+        return "".join(parts)
+
+    def render(self, lines: list[str], out: Optional[TextIO] = None):
+        """
+        Draws lines in the block, leaving the cursor below them with the rest of the screen erased. Lines are written
+        out plainly instead when the output can't take cursor movement or they don't fit on screen.
+        """
+        out = out or sys.stdout
+        if not can_move_cursor(out) or not self.fits(lines):
+            self.invalidate()
+            out.write("".join(f"{line}\n" for line in lines))
+            return
+        out.write(self.changes(lines) + f"\033[{self.top + len(lines)};1H\033[J")
+
+
+# Rows pinned at the top of the terminal by show_status
+_status = ScreenModel()
+
+
+def body_top() -> int:
+    """First terminal row below the status rows, where screens start."""
+    return len(_status.lines) + 1 if _status.lines is not None else 1
+
+
+def show_status(lines: list[str]):
+    """
+    Keeps lines pinned at the top of the terminal above a scrolling region for everything else. Later calls with the
+    same number of lines rewrite only the rows that changed. Without cursor movement, lines are simply printed.
+    """
+    out = sys.stdout
+    if not can_move_cursor(out) or not _status.fits(lines + ["", ""]):
+        hide_status()
+        out.write("".join(f"{line}\n" for line in lines))
+        return
+
+    # Rows are saved and restored around each update, so output below carries on where it was
+    if _status.lines is not None and len(_status.lines) == len(lines):
+        out.write("\0337" + _status.changes(lines) + "\0338")
+        return
+
+    hide_status()
+    # Push what's on screen down to make room for the status rows, then keep them out of the scrolling region
+    height = len(lines)
+    out.write(f"\0337\033[H\033[{height}L" + _status.changes(lines) + f"\033[{height + 1}r\0338\033[{height}B")
+
+
+def hide_status():
+    """Releases the status rows, leaving their last lines on screen as ordinary text."""
+    if _status.lines is None:
+        return
+    # Resetting the scrolling region moves the cursor home, so it is saved and restored around it
+    sys.stdout.write("\0337\033[r\0338")
+    _status.invalidate()
+
+
 def clear():
-    """Pushes old content off the top of the terminal."""
-    os.system('cls' if os.name == 'nt' else 'clear')
+    """Pushes old content off the top of the terminal. Does nothing when output is not going to a terminal."""
+    if not sys.stdout.isatty():
+        return
+    if supports_ansi():
+        if _status.lines is not None:
+            # Only the rows below the status are cleared, since the status is redrawn in place
+            sys.stdout.write(f"\033[{body_top()};1H\033[J")
+        else:
+            sys.stdout.write(ANSI_CLEAR)
+    else:
+        # The clear command writes to the terminal itself, so anything buffered has to go out first
+        sys.stdout.flush()
+        os.system('cls' if os.name == 'nt' else 'clear')
 
 
 def print_styled(text: str, color: Optional[ConsoleColor] = None, transformer: Optional[Callable[[str], str]] = None):
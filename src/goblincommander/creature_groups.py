@@ -1,114 +1,724 @@
 from __future__ import annotations
 
-from random import choices, randint
-from typing import Type, TypeVar, Optional
-
-from goblincommander.creatures import Creature, Goblin, Human
+from array import array
+import gc
+from collections import Counter
+from contextlib import contextmanager
+from itertools import islice
+from math import fsum, inf, isclose
+from operator import attrgetter
+import random
+from typing import Iterator, NamedTuple, Sequence, Type, TypeVar, Optional
+
+from goblincommander.columns import LOCAL_SLOTS, CreatureColumns, StringTable
+from goblincommander.creatures import (CREATURE_TYPES, Creature, Goblin, Human, Ogre, Orc, REPUTATION_STEPS,
+                                       generate_batch, get_adjective_table, get_adjectives)
+from goblincommander.distributions import sample_uniform_counts
+from goblincommander.stats import Stats
 from goblincommander.upkeep import Upkeep
 
 G = TypeVar('G')
 
 
+class GroupSummary(NamedTuple):
+    """Snapshot of a creature group's size and stat totals."""
+    size: int
+    total_beef: int
+    total_cunning: int
+    total_quickness: int
+    total_reputation: float
+
+    @property
+    def avg_cunning(self) -> float:
+        return self.total_cunning / self.size
+
+    @property
+    def avg_quickness(self) -> float:
+        return self.total_quickness / self.size
+
+    @property
+    def avg_reputation(self) -> float:
+        return self.total_reputation / self.size
+
+
+@contextmanager
+def paused_garbage_collection():
+    """
+    Holds off the cyclic garbage collector while creating millions of objects at once. None of them can be garbage
+    yet, but each batch of allocations would otherwise trigger a collection that walks all of them again. Afterwards
+    the new objects go straight to the oldest generation, where they would end up anyway, rather than being walked by
+    the first collection once the collector is back on.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        gc.freeze()
+        gc.unfreeze()
+        if enabled:
+            gc.enable()
+
+
+TYPE_INDICES = {creature_type: index for index, creature_type in enumerate(CREATURE_TYPES)}
+
+_label_table: Optional[StringTable] = None
+
+
+def get_label_table() -> StringTable:
+    """
+    The table that columnar groups' name and adjective columns index into, shared by every group so that labels can be
+    compared and saved as they are. It starts with the creature resource tables, so most indices are positions in the
+    resource data, and grows with any other label a member is given.
+    """
+    global _label_table
+    if _label_table is None:
+        strings = [name for creature_type in (Goblin, Human, Ogre, Orc) for name in creature_type.name_options]
+        strings.extend(adjective for bucket in get_adjectives().values() for adjective in bucket)
+        _label_table = StringTable(strings)
+    return _label_table
+
+
+# Group-wide reputation changes come in whole steps of this size, so pending shifts compose with integer arithmetic
+REPUTATION_STEPS_PER_POINT = 20
+
+
+class ReputationShift(NamedTuple):
+    """
+    A change waiting to be applied to every reputation in a group: x -> min(high, max(low, x + offset)). Clamped
+    offsets compose into another shift of the same form, so any run of them collapses into one. The offset and bounds
+    are counted in reputation steps, which keeps composition exact: a run of shifts ends at the same shift in any
+    grouping.
+    """
+    offset: int = 0
+    low: float = -inf
+    high: float = inf
+
+    @staticmethod
+    def to_steps(value: float) -> int:
+        steps = round(value * REPUTATION_STEPS_PER_POINT)
+        if not isclose(steps, value * REPUTATION_STEPS_PER_POINT, abs_tol=1e-9):
+            raise ValueError(f"Reputation shifts come in steps of 1/{REPUTATION_STEPS_PER_POINT}, not {value}.")
+        return steps
+
+    def apply(self, value: float) -> float:
+        return min(self.high / REPUTATION_STEPS_PER_POINT,
+                   max(self.low / REPUTATION_STEPS_PER_POINT, value + self.offset / REPUTATION_STEPS_PER_POINT))
+
+    def then(self, delta: float, low: float, high: float) -> ReputationShift:
+        """The shift that applies this one, then adds delta clamped to [low, high]."""
+        delta, low, high = map(ReputationShift.to_steps, (delta, low, high))
+        return ReputationShift(self.offset + delta,
+                               min(high, max(low, self.low + delta)),
+                               min(high, max(low, self.high + delta)))
+
+    def invert(self, value: float) -> Optional[float]:
+        """Returns a stored value that this shift maps to value, or None if the shift cannot produce value exactly."""
+        # Values at a bound are stored past it, so later shifts keep them exactly on the bound
+        if value == self.high / REPUTATION_STEPS_PER_POINT:
+            return inf
+        if value == self.low / REPUTATION_STEPS_PER_POINT:
+            return -inf
+        stored = value - self.offset / REPUTATION_STEPS_PER_POINT
+        return stored if self.apply(stored) == value else None
+
+
 def generate(creature_group_cls: Type[G],
              creature_types,
              minimum_size: int,
              maximum_size: int,
              type_weights=None,
-             commander=None) -> G:
+             commander=None,
+             columnar=False,
+             rng=None) -> G:
     # Validate range specification, coercing if necessary
     if minimum_size > maximum_size:
         minimum_size, maximum_size = maximum_size, minimum_size
     minimum_size = max(minimum_size, 1)
     maximum_size = max(maximum_size, minimum_size)
 
-    group = creature_group_cls()
-    generated_creature_types = choices(creature_types, type_weights, k=randint(minimum_size, maximum_size))
-    group.members = [creature_type() for creature_type in generated_creature_types]
+    rng = rng or random
+    group = creature_group_cls(columnar=columnar)
+    size = rng.randint(minimum_size, maximum_size)
+    if len(creature_types) == 1:
+        type_counts = Counter({creature_types[0]: size})
+    else:
+        type_counts = Counter(rng.choices(creature_types, type_weights, k=size))
+    members = []
+    for creature_type in creature_types:
+        members.extend(generate_batch(creature_type, type_counts[creature_type], rng))
     if commander:
-        group.members.append(commander)
+        members.append(commander)
+    group.members = members
     return group
 
 
 class CreatureGroup:
-    """Base class for various groups of creatures."""
-
-    def __init__(self, creature_type: Type[Creature], commander: Optional[Creature] = None):
-        self.members: list[creature_type] = []
+    """
+    Base class for various groups of creatures.
+
+    The group keeps running totals of its members' stats and upkeep. Members' Stats and Upkeep report every change to
+    the group, so the totals stay current in O(1) per change and aggregate queries never walk the member list.
+
+    A columnar group additionally stores those values in a CreatureColumns, with each member's Stats and Upkeep bound
+    to its row as a view, so a full recompute is a handful of column reductions.
+
+    Every member knows its slot in the member list (and its row, which is the same index) and its slot in a per-type
+    index. Removal swaps the last member into the vacated slot, so culling k creatures costs O(k) regardless of group
+    size. This reorders members, but always in the same way for the same sequence of operations.
+
+    Group-wide reputation changes are kept as a pending ReputationShift that members' Stats apply on read. The group
+    counts its members' stored reputations by value, so the exact reputation total after a shift costs one pass over
+    the distinct values rather than over the members.
+    """
+
+    AGGREGATE_FIELDS = ("beef", "cunning", "quickness", "reputation", "food", "gold")
+
+    # When set, every aggregate query is checked against a full recompute. Meant for tests.
+    check_aggregates = False
+
+    def __init__(self, creature_type: Type[Creature], commander: Optional[Creature] = None, columnar=False):
+        self._members: list[creature_type] = []
+        self._columns: Optional[CreatureColumns] = CreatureColumns() if columnar else None
+        self._totals: dict[str, int | float] = dict.fromkeys(CreatureGroup.AGGREGATE_FIELDS, 0)
+        # Non-commander members by exact type, for candidate selection without scanning the whole group
+        self._by_type: dict[type, list[Creature]] = {}
+        self._commanders: dict[Creature, None] = {}
+        self._reputation_shift = ReputationShift()
+        self._stored_reputations: Counter[float] = Counter()
         self.commander = commander
 
+    @classmethod
+    def from_columns(cls: Type[G],
+                     columns: CreatureColumns,
+                     commander_rows: Sequence[int] = (),
+                     reputation_shift: ReputationShift = ReputationShift()) -> G:
+        """
+        Builds a columnar group whose members' values and labels are already in columns, one row per member in member
+        order. The members are created straight onto their rows and the totals come from column reductions, rather
+        than attaching each creature and its values one at a time. The reputation column holds stored reputations,
+        relative to reputation_shift, and the type_slot column each non-commander's position among the members of its
+        type.
+        """
+        group = cls(columnar=True)
+        group._columns = columns
+        group._reputation_shift = reputation_shift
+        with paused_garbage_collection():
+            group._build_members(commander_rows)
+        group._stored_reputations = Counter(columns.reputation)
+        group._totals = group.recompute_totals()
+        return group
+
+    def _build_members(self, commander_rows: Sequence[int], existing: Optional[dict[int, Creature]] = None):
+        """
+        Fills the member list with a creature for each row of the group's columns. Creatures in existing, by row, are
+        pointed at the columns and kept in place of new ones. The per-type index is laid out as the type_slot column
+        says, which after removals is not the order of the rows.
+        """
+        columns = self._columns
+        strings = get_label_table().strings
+        counts = Counter(columns.creature_type)
+        for row in commander_rows:
+            counts[columns.creature_type[row]] -= 1
+        pools = [[None] * counts[type_index] for type_index in range(len(CREATURE_TYPES))]
+        new_stats = Stats.__new__
+        new_upkeep = Upkeep.__new__
+
+        def create(row: int, type_index: int, name: int, adjective: int, type_slot: int) -> Creature:
+            # As in _column_member, with fields set directly because this runs for millions of members
+            stats = new_stats(Stats)
+            stats._owner, stats._columns, stats._row = self, columns, row
+            upkeep = new_upkeep(Upkeep)
+            upkeep._owner, upkeep._columns, upkeep._row = self, columns, row
+            creature_type = CREATURE_TYPES[type_index]
+            creature = creature_type.__new__(creature_type)
+            creature._name, creature._adjective = strings[name], strings[adjective]
+            creature.stats, creature.upkeep, creature._slot = stats, upkeep, row
+            if type_slot < 0:
+                creature.is_commander, creature._type_slot = True, None
+            else:
+                creature.is_commander, creature._type_slot = False, type_slot
+                pools[type_index][type_slot] = creature
+            return creature
+
+        # Mapping over the columns keeps the loop in C, which matters more than anything else done per member here
+        members = self._members = list(map(create, range(len(columns)), columns.creature_type, columns.name,
+                                           columns.adjective, columns.type_slot))
+        for row, creature in (existing or {}).items():
+            creature.stats.attach(self, columns, row)
+            creature.upkeep.attach(self, columns, row)
+            creature._slot, creature.is_commander, creature._type_slot = row, members[row].is_commander, \
+                members[row]._type_slot
+            members[row] = creature
+            if creature._type_slot is not None:
+                pools[columns.creature_type[row]][creature._type_slot] = creature
+        self._by_type = {CREATURE_TYPES[type_index]: pool for type_index, pool in enumerate(pools) if pool}
+        for row in sorted(commander_rows):
+            self._commanders[members[row]] = None
+
+    def _column_member(self, creature_type: Type[Creature], name: str, adjective: str, row: int,
+                       is_commander=False) -> Creature:
+        """Creates a creature whose values already sit in the given row of the group's columns."""
+        stats = Stats.__new__(Stats)
+        stats.attach(self, self._columns, row)
+        upkeep = Upkeep.__new__(Upkeep)
+        upkeep.attach(self, self._columns, row)
+        creature = creature_type.__new__(creature_type)
+        Creature.__init__(creature, name, adjective, stats, upkeep, is_commander)
+        creature._slot = row
+        return creature
+
+    @property
+    def columnar(self) -> bool:
+        return self._columns is not None
+
+    @property
+    def size(self) -> int:
+        return len(self._members)
+
+    @property
+    def commanders(self) -> list[Creature]:
+        return list(self._commanders)
+
+    @property
+    def members(self) -> list[Creature]:
+        """The creatures in the group. Add or remove them through the group rather than mutating this list."""
+        return self._members
+
+    @members.setter
+    def members(self, members: list[Creature]):
+        for m in self._members:
+            self._detach(m)
+        if self._columns is not None:
+            self._columns.clear()
+        self._totals = dict.fromkeys(CreatureGroup.AGGREGATE_FIELDS, 0)
+        self._by_type = {}
+        self._reputation_shift = ReputationShift()
+        self._stored_reputations = Counter()
+        self._members = []
+        self._add_members(members)
+
+    def field_changed(self, field: str, old_value: int | float, new_value: int | float):
+        """Called by a member's Stats or Upkeep when one of its values changes."""
+        self._totals[field] += new_value - old_value
+
+    def label_changed(self, creature: Creature, field: str, label: str):
+        """Called by a member when its name or adjective changes."""
+        if self._columns is not None:
+            getattr(self._columns, field)[creature._slot] = get_label_table()[label]
+
+    def _attach(self, creature: Creature):
+        if creature.stats.is_attached() or creature.upkeep.is_attached():
+            raise ValueError(f"{creature.name} already belongs to a creature group.")
+
+        values = {field: creature.stats.get(field) for field in creature.stats.FIELDS}
+        values.update({field: creature.upkeep.get(field) for field in creature.upkeep.FIELDS})
+        for field, value in values.items():
+            self._totals[field] += value
+        # Stored reputations are relative to the pending shift
+        values["reputation"] = self._store_reputation(values["reputation"])
+        creature.stats.store("reputation", values["reputation"])
+
+        if creature.is_commander:
+            self._commanders[creature] = None
+        else:
+            same_type = self._by_type.setdefault(type(creature), [])
+            creature._type_slot = len(same_type)
+            same_type.append(creature)
+
+        creature._slot = len(self._members)
+        self._members.append(creature)
+        if self._columns is not None:
+            labels = get_label_table()
+            self._columns.append(**values,
+                                 type_slot=-1 if creature._type_slot is None else creature._type_slot,
+                                 creature_type=TYPE_INDICES[type(creature)],
+                                 name=labels[creature.name],
+                                 adjective=labels[creature.adjective])
+            creature.stats.attach(self, self._columns, creature._slot)
+            creature.upkeep.attach(self, self._columns, creature._slot)
+        else:
+            creature.stats.attach(self)
+            creature.upkeep.attach(self)
+
+    def _detach(self, creature: Creature):
+        reputation = creature.stats.get("reputation")
+        self._count_reputation(creature.stats.load("reputation"), -1)
+        creature.stats.detach()
+        creature.upkeep.detach()
+        creature.stats.store("reputation", reputation)
+        for field in creature.stats.FIELDS:
+            self._totals[field] -= creature.stats.get(field)
+        for field in creature.upkeep.FIELDS:
+            self._totals[field] -= creature.upkeep.get(field)
+        self._commanders.pop(creature, None)
+        creature._slot = None
+        creature._type_slot = None
+
+    def _add_members(self, creatures: list[Creature]):
+        for c in creatures:
+            self._attach(c)
+
+    def _remove_member(self, creature: Creature):
+        slot = creature._slot
+        if slot is None or slot >= len(self._members) or self._members[slot] is not creature:
+            raise ValueError(f"{creature.name} is not a member of this group.")
+
+        if creature._type_slot is not None:
+            same_type = self._by_type[type(creature)]
+            last = same_type.pop()
+            if last is not creature:
+                same_type[creature._type_slot] = last
+                last._type_slot = creature._type_slot
+                if self._columns is not None:
+                    self._columns.type_slot[last._slot] = last._type_slot
+
+        self._detach(creature)
+        last = self._members.pop()
+        if self._columns is not None:
+            self._columns.swap_remove(slot)
+        if last is not creature:
+            self._members[slot] = last
+            last._slot = slot
+            if self._columns is not None:
+                last.stats.relocate(slot)
+                last.upkeep.relocate(slot)
+
+    def _remove_members(self, creatures: list[Creature]):
+        for c in creatures:
+            self._remove_member(c)
+
+    def iter_members(self) -> Iterator[Creature]:
+        """Iterates over the members without requiring a lazily loaded group to create all of them at once."""
+        return iter(self._members)
+
+    def stored_values(self, field: str) -> Sequence[int | float]:
+        """
+        Every member's stored value of a stat or upkeep field, in member order: the column itself for a columnar group.
+        Stored reputations are relative to the pending reputation shift.
+        """
+        if self._columns is not None:
+            return getattr(self._columns, field)
+        holder = "stats" if field in Stats.FIELDS else "upkeep"
+        return list(map(attrgetter(f"{holder}.{LOCAL_SLOTS[field]}"), self._members))
+
+    def type_slots(self) -> Sequence[int]:
+        """Every member's position among the other members of its type, or -1 for commanders, in member order."""
+        if self._columns is not None:
+            return self._columns.type_slot
+        return [-1 if m._type_slot is None else m._type_slot for m in self._members]
+
+    def reputations(self) -> Sequence[float]:
+        """
+        Every member's reputation with the pending shift applied, in member order. The shift is worked out once per
+        distinct stored value rather than once per member.
+        """
+        stored = self.stored_values("reputation")
+        if self._reputation_shift == ReputationShift():
+            return stored
+        shifted = {value: self._reputation_shift.apply(value) for value in self._stored_reputations}
+        return array("d", map(shifted.__getitem__, stored))
+
+    def reputation_counts(self) -> Counter[float]:
+        """How many members hold each reputation, with the pending shift applied."""
+        counts = Counter()
+        for value, count in self._stored_reputations.items():
+            counts[self._reputation_shift.apply(value)] += count
+        return counts
+
+    def stored_reputation_counts(self) -> Counter[float]:
+        """How many members hold each stored reputation, relative to the pending shift."""
+        return Counter(self._stored_reputations)
+
+    def count_members(self, creature_types: list[Type[Creature]]) -> int:
+        """Counts the non-commander members whose exact type is one of creature_types."""
+        return sum([len(self._by_type.get(t, [])) for t in set(creature_types)])
+
+    def sample_members(self, creature_types: list[Type[Creature]], k: int, rng=None) -> list[Creature]:
+        """
+        Picks up to k distinct non-commander members of the given exact types uniformly at random. Selection works on
+        the per-type index, so its cost follows k rather than the size of the group.
+        """
+        pools = [self._by_type[t] for t in dict.fromkeys(creature_types) if self._by_type.get(t)]
+        total = sum([len(p) for p in pools])
+        selected = []
+        for index in (rng or random).sample(range(total), k=min(k, total)):
+            for pool in pools:
+                if index < len(pool):
+                    selected.append(pool[index])
+                    break
+                index -= len(pool)
+        return selected
+
+    def weakest_members(self, k: int, field: str = "beef") -> list[Creature]:
+        """
+        Picks the k non-commander members with the lowest value of a stat in O(n), without sorting the group: counting
+        the values finds the cutoff, then one pass collects every member below it and as many at it as are needed.
+        Among equal values, later members are picked first.
+        """
+        if k <= 0:
+            return []
+        if self._columns is not None:
+            values = getattr(self._columns, field)
+        else:
+            values = [m.stats.get(field) for m in self._members]
+        commander_rows = {c._slot for c in self._commanders}
+
+        counts = Counter(values)
+        for row in commander_rows:
+            counts[values[row]] -= 1
+        cutoff, ties_needed = inf, 0
+        below = 0
+        for value in sorted(counts):
+            if below + counts[value] >= k:
+                cutoff, ties_needed = value, k - below
+                break
+            below += counts[value]
+
+        rows = [row for row, value in enumerate(values) if value < cutoff and row not in commander_rows]
+        rows.extend(islice((row for row in range(len(values) - 1, -1, -1)
+                            if values[row] == cutoff and row not in commander_rows), ties_needed))
+        return [self._members[row] for row in rows]
+
+    @property
+    def reputation_shift(self) -> ReputationShift:
+        return self._reputation_shift
+
+    def shift_reputation(self, delta: float, low: float = 0.0, high: float = 5.0):
+        """
+        Adds delta to every member's reputation, clamped to [low, high]. Members are not touched: the change folds into
+        the group's pending shift, and the total is recomputed exactly from the distinct stored reputations.
+        """
+        self._reputation_shift = shift = self._reputation_shift.then(delta, low, high)
+        self._totals["reputation"] = fsum([shift.apply(value) * count
+                                           for value, count in self._stored_reputations.items()])
+
+    def apply_reputation_shift(self):
+        """Writes the pending shift into every member's stored reputation in one pass, then clears it."""
+        shift = self._reputation_shift
+        if shift == ReputationShift():
+            return
+        if self._columns is not None:
+            self._columns.reputation = array("d", map(shift.apply, self._columns.reputation))
+        else:
+            for m in self._members:
+                m.stats.store("reputation", shift.apply(m.stats.load("reputation")))
+        self._stored_reputations = self.reputation_counts()
+        self._reputation_shift = ReputationShift()
+
+    def reputation_written(self, stats: Stats, value: float):
+        """Called by a member's Stats to set its reputation to value under the group's pending shift."""
+        old_value = stats.get("reputation")
+        self._count_reputation(stats.load("reputation"), -1)
+        stored = self._store_reputation(value)
+        self._totals["reputation"] += self._reputation_shift.apply(stored) - old_value
+        stats.store("reputation", stored)
+
+    def _store_reputation(self, value: float) -> float:
+        """
+        Returns the stored value that represents reputation value under the pending shift and counts it. A value the
+        shift cannot produce makes the group apply its shift first.
+        """
+        stored = self._reputation_shift.invert(value)
+        if stored is None:
+            self.apply_reputation_shift()
+            stored = value
+        self._count_reputation(stored, 1)
+        return stored
+
+    def _count_reputation(self, stored: float, n: int):
+        self._stored_reputations[stored] += n
+        if not self._stored_reputations[stored]:
+            del self._stored_reputations[stored]
+
+    def recompute_totals(self) -> dict[str, int | float]:
+        """Computes every aggregate from scratch, ignoring the running totals."""
+        if self._columns is not None:
+            totals = {field: self._columns.total(field) for field in CreatureGroup.AGGREGATE_FIELDS}
+            totals["reputation"] = fsum(self.reputations())
+            return totals
+        totals = {field: sum([m.stats.get(field) for m in self._members]) for field in Stats.FIELDS}
+        totals["reputation"] = fsum([m.stats.get("reputation") for m in self._members])
+        totals.update({field: sum([m.upkeep.get(field) for m in self._members]) for field in Upkeep.FIELDS})
+        return totals
+
+    def verify_totals(self):
+        """Raises an AssertionError if any running total has drifted from a full recompute."""
+        expected = self.recompute_totals()
+        for field, value in expected.items():
+            if not isclose(self._totals[field], value, abs_tol=1e-6):
+                raise AssertionError(f"Running {field} total {self._totals[field]} does not match recomputed {value}.")
+
+    def _total(self, field: str) -> int | float:
+        if CreatureGroup.check_aggregates:
+            self.verify_totals()
+        return self._totals[field]
+
     def get_upkeep(self) -> Upkeep:
-        return Upkeep(food=sum([g.upkeep.food for g in self.members]),
-                      gold=sum([g.upkeep.gold for g in self.members]))
+        return Upkeep(food=self._total("food"), gold=self._total("gold"))
 
     def get_total_beef(self) -> int:
-        return sum([m.stats.beef.value for m in self.members])
+        return self._total("beef")
 
     def get_avg_beef(self) -> float:
-        return self.get_total_beef() / len(self.members)
+        return self.get_total_beef() / self.size
 
     def get_total_cunning(self) -> int:
-        return sum([m.stats.cunning.value for m in self.members])
+        return self._total("cunning")
 
     def get_avg_cunning(self) -> float:
-        return self.get_total_cunning() / len(self.members)
+        return self.get_total_cunning() / self.size
 
     def get_total_quickness(self) -> int:
-        return sum([m.stats.quickness.value for m in self.members])
+        return self._total("quickness")
 
     def get_avg_quickness(self) -> float:
-        return self.get_total_quickness() / len(self.members)
+        return self.get_total_quickness() / self.size
 
     def get_total_reputation(self) -> float:
-        return sum([m.stats.reputation.value for m in self.members])
+        return self._total("reputation")
 
     def get_avg_reputation(self) -> float:
-        return self.get_total_reputation() / len(self.members)
+        return self.get_total_reputation() / self.size
+
+    def summarize(self) -> GroupSummary:
+        return GroupSummary(self.size,
+                            self.get_total_beef(),
+                            self.get_total_cunning(),
+                            self.get_total_quickness(),
+                            self.get_total_reputation())
 
 
 class Horde(CreatureGroup):
     """Model representing a collection of Goblins"""
 
-    def __init__(self):
-        super().__init__(Goblin)
+    def __init__(self, columnar=False):
+        super().__init__(Goblin, columnar=columnar)
 
     def bolster(self, new_creatures: list[Creature]):
         """
         Adds the specified creatures to the horde's members.
         """
-        self.members.extend(new_creatures)
+        self._add_members(new_creatures)
 
     def cull(self, creatures_to_remove: list[Creature]):
         """
         Removes the specified creatures from the horde.
         """
-        for c in creatures_to_remove:
-            self.members.remove(c)
+        self._remove_members(creatures_to_remove)
 
 
 def generate_horde(minimum_size: Optional[int] = None,
                    maximum_size: Optional[int] = None,
-                   commander: Optional[Creature] = None) -> Horde:
+                   commander: Optional[Creature] = None,
+                   columnar=False,
+                   rng=None) -> Horde:
     """Returns a new Horde with a number of Goblins between minimum_size and maximum_size."""
     if minimum_size is None:
         minimum_size = 1
     if maximum_size is None:
         maximum_size = 10
 
-    return generate(Horde, [Goblin], minimum_size, maximum_size, commander=commander)
+    return generate(Horde, [Goblin], minimum_size, maximum_size, commander=commander, columnar=columnar, rng=rng)
 
 
 class Militia(CreatureGroup):
     """Model representing a Settlement's defense force"""
 
-    def __init__(self):
-        super().__init__(Human)
-
-
-def generate_militia(minimum_size: Optional[int] = None, maximum_size: Optional[int] = None) -> Militia:
-    """Returns a new Militia with a number of Humans between minimum_size and maximum_size."""
+    def __init__(self, columnar=False):
+        super().__init__(Human, columnar=columnar)
+
+
+class StatisticalMilitia(Militia):
+    """
+    A Militia known only by its aggregates until its members are needed.
+
+    For each stat, the number of Humans holding each possible value is drawn exactly from the multinomial distribution
+    of n independent uniform draws, which fixes the stat totals without creating anyone. Reading `members` materializes
+    the Humans by dealing each stat's values out in random order, which is exactly the distribution of n independently
+    generated Humans given those counts. Creating and fighting a militia of any size therefore costs the same.
+    """
+
+    def __init__(self, size: int, columnar=False, rng=None):
+        super().__init__(columnar=columnar)
+        rng = rng or random
+        h = Human
+        self._pending_size = size
+        self._value_counts = {
+            "beef": self._draw_counts(size, range(h.MINIMUM_BEEF, h.MAXIMUM_BEEF + 1), rng),
+            "cunning": self._draw_counts(size, range(h.MINIMUM_CUNNING, h.MAXIMUM_CUNNING + 1), rng),
+            "quickness": self._draw_counts(size, range(h.MINIMUM_QUICKNESS, h.MAXIMUM_QUICKNESS + 1), rng),
+            "reputation": self._draw_counts(size, REPUTATION_STEPS, rng),
+        }
+        # Materialization draws from its own seed, so it does not depend on when it happens
+        self._materialize_seed = rng.getrandbits(64)
+        self._totals = self.recompute_totals()
+
+    @staticmethod
+    def _draw_counts(n: int, values, rng) -> dict[int | float, int]:
+        return dict(zip(values, sample_uniform_counts(n, 0, len(values) - 1, rng)))
+
+    @property
+    def materialized(self) -> bool:
+        return self._pending_size is None
+
+    @property
+    def size(self) -> int:
+        return len(self._members) if self._pending_size is None else self._pending_size
+
+    @property
+    def members(self) -> list[Creature]:
+        if self._pending_size is not None:
+            self.members = self._materialize()
+        return self._members
+
+    @members.setter
+    def members(self, members: list[Creature]):
+        self._pending_size = None
+        CreatureGroup.members.fset(self, members)
+
+    def _materialize(self) -> list[Creature]:
+        rng = random.Random(self._materialize_seed)
+        columns = []
+        for field in Stats.FIELDS:
+            values = [value for value, count in self._value_counts[field].items() for _ in range(count)]
+            rng.shuffle(values)
+            columns.append(values)
+
+        table = get_adjective_table(Human)
+        names = rng.choices(Human.name_options, k=self._pending_size)
+        return [Human(name, table.pick(stat_values, rng), Stats(*stat_values),
+                      Upkeep(Human.FOOD_UPKEEP, Human.GOLD_UPKEEP))
+                for name, stat_values in zip(names, zip(*columns))]
+
+    def recompute_totals(self) -> dict[str, int | float]:
+        if self._pending_size is None:
+            return super().recompute_totals()
+        totals = {field: sum([value * count for value, count in counts.items()])
+                  for field, counts in self._value_counts.items()}
+        totals["reputation"] = fsum([value * count for value, count in self._value_counts["reputation"].items()])
+        totals.update(food=Human.FOOD_UPKEEP * self._pending_size, gold=Human.GOLD_UPKEEP * self._pending_size)
+        return totals
+
+
+def generate_militia(minimum_size: Optional[int] = None,
+                     maximum_size: Optional[int] = None,
+                     columnar=False,
+                     rng=None,
+                     statistical=False) -> Militia:
+    """
+    Returns a new Militia with a number of Humans between minimum_size and maximum_size. A statistical militia draws
+    only its aggregates up front; see StatisticalMilitia.
+    """
     if minimum_size is None:
         minimum_size = 4
     if maximum_size is None:
         maximum_size = 15
 
-    return generate(Militia, [Human], minimum_size, maximum_size)
+    if statistical:
+        rng = rng or random
+        return StatisticalMilitia(rng.randint(max(min(minimum_size, maximum_size), 1),
+                                              max(minimum_size, maximum_size, 1)),
+                                  columnar=columnar,
+                                  rng=rng)
+    return generate(Militia, [Human], minimum_size, maximum_size, columnar=columnar, rng=rng)
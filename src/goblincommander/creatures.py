@@ -1,16 +1,32 @@
-import json
-from importlib.resources import files
-from random import choice, randint
-from typing import Optional
+import math
+import random
+from bisect import bisect_right
+from typing import Optional, Type, TypeVar
 
-from tabulate import tabulate
-
-import goblincommander.resources
+from goblincommander import resources
+from goblincommander.resources import LazyResource
 from goblincommander.stats import Stats
 from goblincommander.upkeep import Upkeep
 
-# Load creature adjectives from file
-adjectives = json.loads(files(goblincommander.resources).joinpath('creature_adjectives.json').read_text())
+
+def get_adjectives() -> dict[str, list[str]]:
+    """
+    Returns the creature adjectives by bucket, loading them from file on first use. Assigning a module-level
+    `adjectives` replaces the file data.
+    """
+    return globals().get("adjectives") or resources.load("creature_adjectives")
+
+
+def __getattr__(name: str):
+    # Lets `creatures.adjectives` be read before anything has loaded or replaced it
+    if name == "adjectives":
+        return get_adjectives()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# Memory held by one creature with its Stats and Upkeep on 64-bit CPython: three slotted objects (88 + 88 + 72 bytes)
+# and the reputation float (24 bytes). Names and adjectives are shared strings from the resource tables.
+BYTES_PER_CREATURE = 272
 
 
 def get_stat_rating(actual: int | float, minimum: int, maximum: int) -> float:
@@ -29,17 +45,17 @@ def get_stat_rating(actual: int | float, minimum: int, maximum: int) -> float:
     return (actual - minimum) / (maximum - minimum)
 
 
-def get_adjective(stats: Stats,
-                  min_beef,
-                  max_beef,
-                  min_cunning,
-                  max_cunning,
-                  min_quickness,
-                  max_quickness) -> str:
+def get_adjective_buckets(stats: Stats,
+                          min_beef,
+                          max_beef,
+                          min_cunning,
+                          max_cunning,
+                          min_quickness,
+                          max_quickness) -> list[str]:
     """
-    Determines an adjective for a creature based on their current stats and their initial stat possibilities. Based on
-    whether they are in the bottom 10%, the top 10%, or neither of the range, they are assigned possible buckets from
-    which their adjectives can be drawn. Special buckets exist for various combinations of high and low stats.
+    Determines the adjective buckets a creature can draw from based on their current stats and their initial stat
+    possibilities. Based on whether they are in the bottom 10%, the top 10%, or neither of the range, they are assigned
+    possible buckets. Special buckets exist for various combinations of high and low stats.
     """
 
     # For each stat, determine a rating based on how high the creature is in its range
@@ -90,7 +106,24 @@ def get_adjective(stats: Stats,
     if is_weak and is_dumb and is_slow:
         buckets.append("useless")
 
-    return choice(adjectives[choice(buckets)])
+    return buckets
+
+
+def get_adjective(stats: Stats,
+                  min_beef,
+                  max_beef,
+                  min_cunning,
+                  max_cunning,
+                  min_quickness,
+                  max_quickness,
+                  rng=None) -> str:
+    """
+    Determines an adjective for a creature based on their current stats and their initial stat possibilities. A bucket
+    is picked from get_adjective_buckets, then an adjective from that bucket.
+    """
+    rng = rng or random
+    buckets = get_adjective_buckets(stats, min_beef, max_beef, min_cunning, max_cunning, min_quickness, max_quickness)
+    return rng.choice(get_adjectives()[rng.choice(buckets)])
 
 
 def generate_stats(min_beef: int,
@@ -98,27 +131,63 @@ def generate_stats(min_beef: int,
                    min_cunning: int,
                    max_cunning: int,
                    min_quickness: int,
-                   max_quickness: int):
-    return Stats(randint(min_beef, max_beef),
-                 randint(min_cunning, max_cunning),
-                 randint(min_quickness, max_quickness),
-                 .5 * randint(1, 10))
+                   max_quickness: int,
+                   rng=None):
+    rng = rng or random
+    return Stats(rng.randint(min_beef, max_beef),
+                 rng.randint(min_cunning, max_cunning),
+                 rng.randint(min_quickness, max_quickness),
+                 .5 * rng.randint(1, 10))
 
 
 class Creature:
-    """Base class representing any creature in a horde"""
+    """
+    Base class representing any creature in a horde
+
+    Creatures, their Stats and their Upkeep all use __slots__ and share stat metadata at class level, so a creature
+    costs about BYTES_PER_CREATURE bytes on top of the names and adjectives it shares with every other creature.
+    """
+
+    __slots__ = ("_name", "_adjective", "stats", "upkeep", "is_commander", "_slot", "_type_slot")
 
     def __init__(self, name: str,
                  adjective: str,
                  stats: Stats,
                  upkeep: Upkeep,
                  is_commander=False):
-        self.name = name
-        self.adjective = adjective
+        self._name = name
+        self._adjective = adjective
         self.stats = stats
         self.upkeep = upkeep
         self.is_commander = is_commander
 
+        # Positions in the owning group's member list and per-type index, maintained by the group
+        self._slot: Optional[int] = None
+        self._type_slot: Optional[int] = None
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @name.setter
+    def name(self, name: str):
+        self._name = name
+        self._label_changed("name", name)
+
+    @property
+    def adjective(self) -> str:
+        return self._adjective
+
+    @adjective.setter
+    def adjective(self, adjective: str):
+        self._adjective = adjective
+        self._label_changed("adjective", adjective)
+
+    def _label_changed(self, field: str, value: str):
+        # A columnar group keeps its members' labels in columns as well
+        if self.stats.is_attached():
+            self.stats._owner.label_changed(self, field, value)
+
     def describe(self, creature_type: str = "creature") -> str:
         """Gets a basic description string of the creature."""
         return f'A {self.adjective} {creature_type} named {self.name}.'
@@ -138,6 +207,8 @@ class Creature:
 class Goblin(Creature):
     """Model representing an individual Goblin in the horde"""
 
+    __slots__ = ()
+
     # Goblin stat configuration
     MINIMUM_BEEF = 1
     MAXIMUM_BEEF = 4
@@ -149,34 +220,27 @@ class Goblin(Creature):
     FOOD_UPKEEP = 5
     GOLD_UPKEEP = 1
 
-    # Load Goblin descriptive data
-    goblin_data = json.loads(files(goblincommander.resources).joinpath('goblin_data.json').read_text())
-    name_options = goblin_data["name_options"]
-    del goblin_data
+    # Goblin descriptive data, loaded on first use
+    name_options = LazyResource("goblin_data", "name_options")
 
     def __init__(self, name: Optional[str] = None,
                  adjective: Optional[str] = None,
                  stats: Optional[Stats] = None,
                  upkeep: Optional[Upkeep] = None,
-                 is_commander=False):
+                 is_commander=False,
+                 rng=None):
         if not Goblin.name_options:
             raise RuntimeError("You forgot to set Goblin data, idiot.")
 
         if not name:
-            name = choice(Goblin.name_options)
+            name = (rng or random).choice(Goblin.name_options)
 
         if not stats:
             stats = generate_stats(Goblin.MINIMUM_BEEF, Goblin.MAXIMUM_BEEF, Goblin.MINIMUM_CUNNING,
-                                   Goblin.MAXIMUM_CUNNING, Goblin.MINIMUM_QUICKNESS, Goblin.MAXIMUM_QUICKNESS)
+                                   Goblin.MAXIMUM_CUNNING, Goblin.MINIMUM_QUICKNESS, Goblin.MAXIMUM_QUICKNESS, rng)
 
         if not adjective:
-            adjective = get_adjective(stats,
-                                      Goblin.MINIMUM_BEEF,
-                                      Goblin.MAXIMUM_BEEF,
-                                      Goblin.MINIMUM_CUNNING,
-                                      Goblin.MAXIMUM_CUNNING,
-                                      Goblin.MINIMUM_QUICKNESS,
-                                      Goblin.MAXIMUM_QUICKNESS)
+            adjective = get_adjective_table(Goblin).pick(stats, rng)
 
         if not upkeep:
             upkeep = Upkeep(Goblin.FOOD_UPKEEP, Goblin.GOLD_UPKEEP)
@@ -190,6 +254,8 @@ class Goblin(Creature):
 
 class GoblinCommander(Goblin):
 
+    __slots__ = ()
+
     def __init__(self, name: str, title: str):
         stats = Stats(3, 8, 5, 3.0)
 
@@ -206,6 +272,8 @@ class GoblinCommander(Goblin):
         super().__init__(name, title, stats, Upkeep(0, 0), True)
 
     def print_profile(self):
+        from tabulate import tabulate
+
         print(tabulate([[self.name, self.adjective,
                          str(self.stats.beef.value),
                          str(self.stats.cunning.value),
@@ -218,6 +286,8 @@ class GoblinCommander(Goblin):
 class Human(Creature):
     """Model representing an individual Human protecting a settlement."""
 
+    __slots__ = ()
+
     # Human stat configuration
     MINIMUM_BEEF = 1
     MAXIMUM_BEEF = 6
@@ -229,28 +299,31 @@ class Human(Creature):
     FOOD_UPKEEP = 8
     GOLD_UPKEEP = 4
 
-    # Human descriptive data
-    human_data = json.loads(files(goblincommander.resources).joinpath('human_data.json').read_text())
-    name_options = human_data["name_options"]
-    del human_data
+    # Human descriptive data, loaded on first use
+    name_options = LazyResource("human_data", "name_options")
 
-    def __init__(self):
+    def __init__(self, name: Optional[str] = None,
+                 adjective: Optional[str] = None,
+                 stats: Optional[Stats] = None,
+                 upkeep: Optional[Upkeep] = None,
+                 rng=None):
         if not Human.name_options:
             raise RuntimeError("You forgot to set the Human data, idiot.")
 
-        stats = generate_stats(Human.MINIMUM_BEEF, Human.MAXIMUM_BEEF, Human.MINIMUM_CUNNING, Human.MAXIMUM_CUNNING,
-                               Human.MINIMUM_QUICKNESS, Human.MAXIMUM_QUICKNESS)
+        if not name:
+            name = (rng or random).choice(Human.name_options)
 
-        super().__init__(choice(Human.name_options),
-                         get_adjective(stats,
-                                       Human.MINIMUM_BEEF,
-                                       Human.MAXIMUM_BEEF,
-                                       Human.MINIMUM_CUNNING,
-                                       Human.MAXIMUM_CUNNING,
-                                       Human.MINIMUM_QUICKNESS,
-                                       Human.MAXIMUM_QUICKNESS),
-                         stats,
-                         Upkeep(Human.FOOD_UPKEEP, Human.GOLD_UPKEEP))
+        if not stats:
+            stats = generate_stats(Human.MINIMUM_BEEF, Human.MAXIMUM_BEEF, Human.MINIMUM_CUNNING,
+                                   Human.MAXIMUM_CUNNING, Human.MINIMUM_QUICKNESS, Human.MAXIMUM_QUICKNESS, rng)
+
+        if not adjective:
+            adjective = get_adjective_table(Human).pick(stats, rng)
+
+        if not upkeep:
+            upkeep = Upkeep(Human.FOOD_UPKEEP, Human.GOLD_UPKEEP)
+
+        super().__init__(name, adjective, stats, upkeep)
 
     def describe(self) -> str:
         """Gets a basic description string of the Human."""
@@ -260,6 +333,8 @@ class Human(Creature):
 class Ogre(Creature):
     """Model representing an individual Ogre in the horde."""
 
+    __slots__ = ()
+
     # Ogre stat configuration
     MINIMUM_BEEF = 6
     MAXIMUM_BEEF = 10
@@ -271,28 +346,31 @@ class Ogre(Creature):
     FOOD_UPKEEP = 12
     GOLD_UPKEEP = 4
 
-    # Load Ogre descriptive data
-    ogre_data = json.loads(files(goblincommander.resources).joinpath('ogre_data.json').read_text())
-    name_options = ogre_data["name_options"]
-    del ogre_data
+    # Ogre descriptive data, loaded on first use
+    name_options = LazyResource("ogre_data", "name_options")
 
-    def __init__(self):
+    def __init__(self, name: Optional[str] = None,
+                 adjective: Optional[str] = None,
+                 stats: Optional[Stats] = None,
+                 upkeep: Optional[Upkeep] = None,
+                 rng=None):
         if not Ogre.name_options:
             raise RuntimeError("You forgot to set Ogre data, idiot.")
 
-        stats = generate_stats(Ogre.MINIMUM_BEEF, Ogre.MAXIMUM_BEEF, Ogre.MINIMUM_CUNNING, Ogre.MAXIMUM_CUNNING,
-                               Ogre.MINIMUM_QUICKNESS, Ogre.MAXIMUM_QUICKNESS)
+        if not name:
+            name = (rng or random).choice(Ogre.name_options)
+
+        if not stats:
+            stats = generate_stats(Ogre.MINIMUM_BEEF, Ogre.MAXIMUM_BEEF, Ogre.MINIMUM_CUNNING,
+                                   Ogre.MAXIMUM_CUNNING, Ogre.MINIMUM_QUICKNESS, Ogre.MAXIMUM_QUICKNESS, rng)
 
-        super().__init__(choice(Ogre.name_options),
-                         get_adjective(stats,
-                                       Ogre.MINIMUM_BEEF,
-                                       Ogre.MAXIMUM_BEEF,
-                                       Ogre.MINIMUM_CUNNING,
-                                       Ogre.MAXIMUM_CUNNING,
-                                       Ogre.MINIMUM_QUICKNESS,
-                                       Ogre.MAXIMUM_QUICKNESS),
-                         stats,
-                         Upkeep(Ogre.FOOD_UPKEEP, Ogre.GOLD_UPKEEP))
+        if not adjective:
+            adjective = get_adjective_table(Ogre).pick(stats, rng)
+
+        if not upkeep:
+            upkeep = Upkeep(Ogre.FOOD_UPKEEP, Ogre.GOLD_UPKEEP)
+
+        super().__init__(name, adjective, stats, upkeep)
 
     def describe(self) -> str:
         """Gets a basic description string of the Ogre."""
@@ -302,6 +380,8 @@ class Ogre(Creature):
 class Orc(Creature):
     """Model representing an individual Orc in the horde."""
 
+    __slots__ = ()
+
     # Orc stat configuration
     MINIMUM_BEEF = 4
     MAXIMUM_BEEF = 7
@@ -313,29 +393,146 @@ class Orc(Creature):
     FOOD_UPKEEP = 8
     GOLD_UPKEEP = 2
 
-    # Load Orc descriptive data
-    orc_data = json.loads(files(goblincommander.resources).joinpath('orc_data.json').read_text())
-    name_options = orc_data["name_options"]
-    del orc_data
+    # Orc descriptive data, loaded on first use
+    name_options = LazyResource("orc_data", "name_options")
 
-    def __init__(self):
+    def __init__(self, name: Optional[str] = None,
+                 adjective: Optional[str] = None,
+                 stats: Optional[Stats] = None,
+                 upkeep: Optional[Upkeep] = None,
+                 rng=None):
         if not Orc.name_options:
             raise RuntimeError("You forgot to set Orc data, idiot.")
 
-        stats = generate_stats(Orc.MINIMUM_BEEF, Orc.MAXIMUM_BEEF, Orc.MINIMUM_CUNNING, Orc.MAXIMUM_CUNNING,
-                               Orc.MINIMUM_QUICKNESS, Orc.MAXIMUM_QUICKNESS)
+        if not name:
+            name = (rng or random).choice(Orc.name_options)
+
+        if not stats:
+            stats = generate_stats(Orc.MINIMUM_BEEF, Orc.MAXIMUM_BEEF, Orc.MINIMUM_CUNNING,
+                                   Orc.MAXIMUM_CUNNING, Orc.MINIMUM_QUICKNESS, Orc.MAXIMUM_QUICKNESS, rng)
 
-        super().__init__(choice(Orc.name_options),
-                         get_adjective(stats,
-                                       Orc.MINIMUM_BEEF,
-                                       Orc.MAXIMUM_BEEF,
-                                       Orc.MINIMUM_CUNNING,
-                                       Orc.MAXIMUM_CUNNING,
-                                       Orc.MINIMUM_QUICKNESS,
-                                       Orc.MAXIMUM_QUICKNESS),
-                         stats,
-                         Upkeep(Orc.FOOD_UPKEEP, Orc.GOLD_UPKEEP))
+        if not adjective:
+            adjective = get_adjective_table(Orc).pick(stats, rng)
+
+        if not upkeep:
+            upkeep = Upkeep(Orc.FOOD_UPKEEP, Orc.GOLD_UPKEEP)
+
+        super().__init__(name, adjective, stats, upkeep)
 
     def describe(self) -> str:
         """Gets a basic description string of the Orc."""
         return super().describe("orc")
+
+
+# Creature classes by their index in creature type columns, both in memory and in save files. Append new types; never
+# reorder.
+CREATURE_TYPES = [Goblin, GoblinCommander, Human, Ogre, Orc]
+
+C = TypeVar('C', bound=Creature)
+
+# Possible starting reputations, shared by every generated creature
+REPUTATION_STEPS = tuple(.5 * step for step in range(1, 11))
+
+
+class AdjectiveTable:
+    """
+    Adjective candidates for one creature type, keyed by stat tuple.
+
+    Every combination of the type's starting stat ranges and half-step reputations is worked out up front. Each entry
+    is a flattened candidate list with integer cumulative weights that reproduce get_adjective's bucket-then-adjective
+    draw, so picking an adjective is one dict lookup plus one random draw. Stat tuples outside the table, such as those
+    of creatures whose stats changed mid-game, are worked out on demand and cached by their bucket combination.
+    """
+
+    def __init__(self, creature_type: Type[Creature]):
+        self.creature_type = creature_type
+        self.source = get_adjectives()
+        self._by_buckets: dict[tuple[str, ...], tuple[list[str], list[int]]] = {}
+        self._by_stats: dict[tuple, tuple[list[str], list[int]]] = {}
+        t = creature_type
+        for beef in range(t.MINIMUM_BEEF, t.MAXIMUM_BEEF + 1):
+            for cunning in range(t.MINIMUM_CUNNING, t.MAXIMUM_CUNNING + 1):
+                for quickness in range(t.MINIMUM_QUICKNESS, t.MAXIMUM_QUICKNESS + 1):
+                    for reputation in REPUTATION_STEPS:
+                        key = (beef, cunning, quickness, reputation)
+                        self._by_stats[key] = self._build_entry(key)
+
+    def _build_entry(self, stat_values: tuple) -> tuple[list[str], list[int]]:
+        t = self.creature_type
+        buckets = tuple(get_adjective_buckets(Stats(*stat_values),
+                                              t.MINIMUM_BEEF,
+                                              t.MAXIMUM_BEEF,
+                                              t.MINIMUM_CUNNING,
+                                              t.MAXIMUM_CUNNING,
+                                              t.MINIMUM_QUICKNESS,
+                                              t.MAXIMUM_QUICKNESS))
+        entry = self._by_buckets.get(buckets)
+        if entry is None:
+            # Weight each adjective by 1 / (bucket count * bucket size), scaled to integers
+            denominators = [len(buckets) * len(self.source[b]) for b in buckets]
+            scale = math.lcm(*denominators)
+            candidates = []
+            cum_weights = []
+            total = 0
+            for bucket, denominator in zip(buckets, denominators):
+                for adjective in self.source[bucket]:
+                    total += scale // denominator
+                    candidates.append(adjective)
+                    cum_weights.append(total)
+            entry = self._by_buckets[buckets] = (candidates, cum_weights)
+        return entry
+
+    def candidates(self, stat_values: tuple) -> tuple[list[str], list[int]]:
+        """
+        Returns the candidate adjectives and their cumulative weights for a (beef, cunning, quickness, reputation)
+        tuple.
+        """
+        entry = self._by_stats.get(stat_values)
+        if entry is None:
+            entry = self._build_entry(stat_values)
+        return entry
+
+    def pick(self, stats: Stats | tuple, rng=None) -> str:
+        """Draws an adjective for the given Stats or stat tuple."""
+        if isinstance(stats, Stats):
+            stats = tuple([stats.get(field) for field in Stats.FIELDS])
+        candidates, cum_weights = self.candidates(stats)
+        return candidates[bisect_right(cum_weights, (rng or random).randrange(cum_weights[-1]))]
+
+
+_adjective_tables: dict[type, AdjectiveTable] = {}
+
+
+def get_adjective_table(creature_type: Type[Creature]) -> AdjectiveTable:
+    """Returns the creature type's adjective table, building it on first use or when the adjective data changes."""
+    table = _adjective_tables.get(creature_type)
+    if table is None or table.source is not get_adjectives():
+        table = _adjective_tables[creature_type] = AdjectiveTable(creature_type)
+    return table
+
+
+def generate_batch(creature_type: Type[C], n: int, rng=None) -> list[C]:
+    """
+    Generates n creatures of the given type. Names and each stat are drawn for the whole batch in one call, and each
+    adjective comes from the type's precomputed AdjectiveTable.
+
+    The rng may be any object with the random module's interface and defaults to the module itself.
+    """
+    if n <= 0:
+        return []
+    if rng is None:
+        rng = random
+
+    t = creature_type
+    names = rng.choices(t.name_options, k=n)
+    beef = rng.choices(range(t.MINIMUM_BEEF, t.MAXIMUM_BEEF + 1), k=n)
+    cunning = rng.choices(range(t.MINIMUM_CUNNING, t.MAXIMUM_CUNNING + 1), k=n)
+    quickness = rng.choices(range(t.MINIMUM_QUICKNESS, t.MAXIMUM_QUICKNESS + 1), k=n)
+    reputation = rng.choices(REPUTATION_STEPS, k=n)
+
+    table = get_adjective_table(t)
+    creatures = []
+    for name, stat_values in zip(names, zip(beef, cunning, quickness, reputation)):
+        creatures.append(t(name, table.pick(stat_values, rng), Stats(*stat_values),
+                           Upkeep(t.FOOD_UPKEEP, t.GOLD_UPKEEP)))
+    return creatures
@@ -0,0 +1,119 @@
+import random
+from functools import cache
+from math import exp, lgamma, log
+from typing import Callable
+
+
+# Distributions of sums of 0, 1, 2, ... uniform integers, by (low, high)
+_sum_pmfs: dict[tuple[int, int], list[tuple[float, ...]]] = {}
+
+
+def _add_uniform(pmf: tuple[float, ...], width: int) -> tuple[float, ...]:
+    """Convolves a distribution with one more uniform draw over `width` consecutive integers."""
+    # Each new draw spreads every previous outcome evenly over the next `width` sums
+    result = []
+    window = 0.0
+    for i in range(len(pmf) + width - 1):
+        if i < len(pmf):
+            window += pmf[i]
+        if i >= width:
+            window -= pmf[i - width]
+        result.append(max(window, 0.0) / width)
+    return tuple(result)
+
+
+def uniform_sum_pmf(n: int, low: int, high: int) -> tuple[float, ...]:
+    """
+    Probability mass function of the sum of n independent uniform integers in [low, high]. Index i holds the
+    probability that the sum is n * low + i.
+    """
+    pmfs = _sum_pmfs.setdefault((low, high), [(1.0,)])
+    while len(pmfs) <= n:
+        pmfs.append(_add_uniform(pmfs[-1], high - low + 1))
+    return pmfs[max(n, 0)]
+
+
+@cache
+def uniform_sum_cdf(n: int, low: int, high: int) -> tuple[float, ...]:
+    """Cumulative form of uniform_sum_pmf. Index i holds the probability that the sum is at most n * low + i."""
+    cdf = []
+    total = 0.0
+    for p in uniform_sum_pmf(n, low, high):
+        total += p
+        cdf.append(min(total, 1.0))
+    return tuple(cdf)
+
+
+def probability_at_most(n: int, low: int, high: int, value: int) -> float:
+    """Probability that the sum of n uniform integers in [low, high] is at most value."""
+    if value < n * low:
+        return 0.0
+    if value >= n * high:
+        return 1.0
+    return uniform_sum_cdf(n, low, high)[value - n * low]
+
+
+def largest_satisfying(low: int, high: int, predicate: Callable[[int], bool]) -> int:
+    """
+    Finds the largest integer in [low, high] for which predicate holds, given that it holds for a prefix of the range.
+    Returns low - 1 if it holds nowhere.
+    """
+    while low <= high:
+        middle = (low + high) // 2
+        if predicate(middle):
+            low = middle + 1
+        else:
+            high = middle - 1
+    return high
+
+
+def sample_binomial(n: int, p: float, rng=None) -> int:
+    """
+    Draws from Binomial(n, p) by inversion. Outcomes are visited outward from the mode, so a draw takes
+    O(sqrt(n * p * (1 - p))) steps on average rather than O(n).
+    """
+    if n <= 0 or p <= 0.0:
+        return 0
+    if p >= 1.0:
+        return n
+
+    q = 1.0 - p
+    mode = min(int((n + 1) * p), n)
+    pmf_mode = exp(lgamma(n + 1) - lgamma(mode + 1) - lgamma(n - mode + 1) + mode * log(p) + (n - mode) * log(q))
+    u = (rng or random).random() - pmf_mode
+    if u < 0:
+        return mode
+
+    up = down = mode
+    pmf_up = pmf_down = pmf_mode
+    while up < n or down > 0:
+        if up < n:
+            pmf_up *= (n - up) / (up + 1) * p / q
+            up += 1
+            u -= pmf_up
+            if u < 0:
+                return up
+        if down > 0:
+            pmf_down *= down / (n - down + 1) * q / p
+            down -= 1
+            u -= pmf_down
+            if u < 0:
+                return down
+    # Only reachable through rounding in the last few ulps of u
+    return mode
+
+
+def sample_uniform_counts(n: int, low: int, high: int, rng=None) -> list[int]:
+    """
+    Draws how many of n independent uniform integers in [low, high] land on each value, from low up. The counts are
+    multinomial, drawn exactly as a chain of binomials, so their weighted sum follows uniform_sum_pmf.
+    """
+    counts = []
+    remaining = n
+    width = high - low + 1
+    for i in range(width - 1):
+        count = sample_binomial(remaining, 1 / (width - i), rng)
+        counts.append(count)
+        remaining -= count
+    counts.append(remaining)
+    return counts
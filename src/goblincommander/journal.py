@@ -0,0 +1,222 @@
+"""
+An append-only journal of the actions taken in a game, and headless replay of it.
+
+A journal is a JSON-lines file. Its first entry starts the game, either from a new game's random seed and commander
+or from a checkpoint. Each later entry records one game menu action: its turn number, its name, the target settlement
+of a raid or scouting trip and whether a surrender was accepted, a checksum of the random number generator's state
+before the turn, and the outcome the turn reached. Every checkpoint_interval turns the game is also saved to a
+checkpoint beside the journal, so replaying up to a late turn only re-runs the turns since the checkpoint before it.
+
+Every session, from starting or loading a game until returning to the main menu, gets a journal and checkpoints of
+its own, named for when it started, so earlier sessions are never overwritten.
+"""
+import json
+import os
+import sys
+import time
+import zlib
+from array import array
+from contextlib import redirect_stdout
+from itertools import count
+from random import Random
+from typing import Any, Callable, Optional, TextIO
+
+from goblincommander import main, menus, savegame
+from goblincommander.creatures import GoblinCommander
+from goblincommander.main import StateKey
+from goblincommander.settlements import Settlement
+
+CHECKPOINT_INTERVAL = 100
+
+ACTION_NAMES = {function: name for name, function in main.TURN_ACTIONS.items()}
+
+
+def get_journal_dir() -> str:
+    """Location of the journals, beside the save file."""
+    return os.path.join(os.path.dirname(savegame.get_save_path()), "journals")
+
+
+def create_journal_file(seed: Optional[int] = None) -> TextIO:
+    """Creates a journal for a new session, named for the time it started and the seed of a new game."""
+    directory = get_journal_dir()
+    os.makedirs(directory, exist_ok=True)
+    stem = os.path.join(directory, f"{time.strftime('%Y%m%d-%H%M%S')}-{'loaded' if seed is None else seed}")
+    for n in count(1):
+        try:
+            return open(f"{stem}.journal" if n == 1 else f"{stem}-{n}.journal", "x", encoding="utf-8")
+        except FileExistsError:
+            continue
+
+
+def get_latest_journal_path() -> str:
+    """The journal written to most recently."""
+    directory = get_journal_dir()
+    names = os.listdir(directory) if os.path.isdir(directory) else []
+    paths = [os.path.join(directory, name) for name in names if name.endswith(".journal")]
+    if not paths:
+        raise FileNotFoundError(f"There are no journals in {directory}.")
+    return max(paths, key=lambda path: (os.path.getmtime(path), path))
+
+
+def get_checkpoint_dir(path: str) -> str:
+    return f"{os.path.splitext(path)[0]}-checkpoints"
+
+
+def rng_checksum(rng: Random) -> int:
+    """A CRC of the generator's internal state, enough to tell whether two generators are about to draw alike."""
+    return zlib.crc32(array("Q", rng.getstate()[1]).tobytes())
+
+
+def get_outcome(state: dict[StateKey, Any]) -> dict[str, Any]:
+    """The parts of the game state a turn is checked against when it is replayed."""
+    horde = state[StateKey.HORDE]
+    return {"week": state[StateKey.WEEK],
+            "victorious": state[StateKey.VICTORIOUS],
+            "food": state[StateKey.STASH].food,
+            "gold": state[StateKey.STASH].gold,
+            "horde_size": horde.size,
+            "horde_beef": horde.get_total_beef(),
+            "settlements": len(state[StateKey.SETTLEMENTS]),
+            "defeated": state[StateKey.SETTLEMENTS].defeated_count,
+            "rng": rng_checksum(state[StateKey.RNG])}
+
+
+class Journal:
+    """
+    Appends an entry for every action taken in the game held by main.state. Each entry is flushed as soon as it is
+    written, so a journal survives the game crashing mid-session.
+    """
+
+    def __init__(self, path: str, checkpoint_interval: Optional[int] = None):
+        self.path = path
+        self.checkpoint_interval = checkpoint_interval or CHECKPOINT_INTERVAL
+        self.turn = 0
+        self._file: Optional[TextIO] = None
+
+    @classmethod
+    def start(cls,
+              seed: Optional[int] = None,
+              path: Optional[str] = None,
+              checkpoint_interval: Optional[int] = None) -> "Journal":
+        """
+        Starts a journal of the game in main.state at path, which must not exist yet, or in a new file of its own. A
+        new game started from a Random seeded with seed is journaled from that seed; otherwise the journal starts
+        from a checkpoint of the current state.
+        """
+        journal_file = open(path, "x", encoding="utf-8") if path else create_journal_file(seed)
+        journal = cls(journal_file.name, checkpoint_interval)
+        journal._file = journal_file
+        os.makedirs(get_checkpoint_dir(journal.path), exist_ok=True)
+
+        if seed is None:
+            journal._write({"event": "start", "checkpoint": journal.save_checkpoint()})
+        else:
+            commander = main.state[StateKey.COMMANDER]
+            journal._write({"event": "start", "seed": seed, "commander": commander.name, "title": commander.adjective})
+        return journal
+
+    def record(self, function: Callable[..., Any], *args):
+        """Takes an action, called with args, and journals it along with its outcome."""
+        state = main.state
+        entry = {"event": "action", "turn": self.turn + 1, "action": ACTION_NAMES[function]}
+        if args and isinstance(args[0], Settlement):
+            entry["target"] = state[StateKey.SETTLEMENTS].position(args[0])
+        entry["rng"] = rng_checksum(state[StateKey.RNG])
+
+        if function is main.raid:
+            decide = args[1] if len(args) > 1 and args[1] is not None else menus.show_surrender_menu
+
+            def accept_surrender(settlement: Settlement, commander: GoblinCommander) -> bool:
+                entry["surrender"] = decide(settlement, commander)
+                return entry["surrender"]
+
+            args = (args[0], accept_surrender)
+
+        function(*args)
+        self.turn += 1
+        entry["outcome"] = get_outcome(state)
+        self._write(entry)
+        if self.turn % self.checkpoint_interval == 0:
+            self._write({"event": "checkpoint", "turn": self.turn, "checkpoint": self.save_checkpoint()})
+
+    def save_checkpoint(self) -> str:
+        """Saves the game as it stands after the current turn and returns the checkpoint's file name."""
+        name = f"{self.turn:08d}.sav"
+        savegame.save(main.state, os.path.join(get_checkpoint_dir(self.path), name))
+        return name
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _write(self, entry: dict[str, Any]):
+        self._file.write(json.dumps(entry) + "\n")
+        self._file.flush()
+
+
+def read_entries(path: Optional[str] = None) -> list[dict[str, Any]]:
+    """The complete entries of the journal at path, or of the latest journal."""
+    with open(path or get_latest_journal_path(), encoding="utf-8") as journal_file:
+        # A crash can leave the last line half written
+        return [json.loads(line) for line in journal_file if line.endswith("\n")]
+
+
+def replay(path: Optional[str] = None, turn: Optional[int] = None) -> dict[StateKey, Any]:
+    """
+    Rebuilds main.state as it stood after the given turn of the journal at path, or of the latest journal, or after
+    its last turn, without prompts or output. Replay starts from the latest checkpoint at or before the turn rather
+    than from the start of the game. Raises ValueError if a replayed turn doesn't reach the outcome the journal
+    recorded for it.
+    """
+    path = path or get_latest_journal_path()
+    entries = read_entries(path)
+    if not entries or entries[0]["event"] != "start":
+        raise ValueError("Not a Goblin Commander journal.")
+    actions = [e for e in entries if e["event"] == "action"]
+    turn = len(actions) if turn is None else turn
+    if not 0 <= turn <= len(actions):
+        raise ValueError(f"The journal has no turn {turn}; it ends at turn {len(actions)}.")
+
+    start, first_turn = entries[0], 0
+    for entry in entries:
+        if entry["event"] == "checkpoint" and entry["turn"] <= turn:
+            start, first_turn = entry, entry["turn"]
+
+    with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+        if "checkpoint" in start:
+            main.state.update(savegame.load(os.path.join(get_checkpoint_dir(path), start["checkpoint"])))
+        else:
+            main.start_game(GoblinCommander(start["commander"], start["title"]), Random(start["seed"]))
+
+        for entry in actions[first_turn:turn]:
+            replay_action(entry)
+    return main.state
+
+
+def replay_action(entry: dict[str, Any]):
+    """Takes a journaled action again and checks that it reaches the same outcome."""
+    state = main.state
+    if rng_checksum(state[StateKey.RNG]) != entry["rng"]:
+        raise ValueError(f"Replay diverged from the journal before turn {entry['turn']}.")
+
+    function = main.TURN_ACTIONS[entry["action"]]
+    args = []
+    if "target" in entry:
+        args.append(list(state[StateKey.SETTLEMENTS])[entry["target"]])
+    if function is main.raid:
+        args.append(lambda settlement, commander: entry.get("surrender", False))
+    function(*args)
+
+    outcome = get_outcome(state)
+    if outcome != entry["outcome"]:
+        differences = ", ".join([f"{key} {outcome[key]} (journaled {value})"
+                                 for key, value in entry["outcome"].items() if outcome.get(key) != value])
+        raise ValueError(f"Turn {entry['turn']} replayed differently from the journal: {differences}.")
+
+
+if __name__ == "__main__":
+    # Replays a journal and prints where it leaves the game. Usage: python -m goblincommander.journal [path] [turn]
+    replay_path = sys.argv[1] if len(sys.argv) > 1 else None
+    replay_turn = int(sys.argv[2]) if len(sys.argv) > 2 else None
+    print(json.dumps(get_outcome(replay(replay_path, replay_turn))))
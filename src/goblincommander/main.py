@@ -1,15 +1,14 @@
-import random
-import sys
 from enum import Enum
-from random import randint, choices, choice, sample
-from typing import Any, Type
+from functools import partial
+from random import Random, choice
+from typing import Any, Callable, Optional, Type
 
-from goblincommander import console, creature_groups, menus
+from goblincommander import battle, console, creature_groups, menus
+from goblincommander.battle import Modifier, ModifierKind
 from goblincommander.creature_groups import Horde
-from goblincommander.creatures import Goblin, GoblinCommander, Ogre, Orc, Creature
+from goblincommander.creatures import Goblin, GoblinCommander, Ogre, Orc, Creature, generate_batch
 from goblincommander.printers import print_creature_group, print_title_figure, print_victory_figure
-from goblincommander.settlements import Settlement, NomadEncampment, QuietVillage, BusyTown, BustlingCity, \
-    GleamingCastle
+from goblincommander.settlements import Settlement, GleamingCastle, SettlementRegistry, get_settlement_factory
 from goblincommander.stash import Stash
 
 
@@ -19,49 +18,57 @@ class StateKey(str, Enum):
     SETTLEMENTS = "settlements"
     STASH = "stash"
     WEEK = "week"
+    VICTORIOUS = "victorious"
+    RNG = "rng"
+
+
+class Screen(str, Enum):
+    MAIN_MENU = "main_menu"
+    GAME_MENU = "game_menu"
+    QUIT = "quit"
 
 
 state: dict[StateKey, Any] = {}
 
+# The journal.Journal of the game being played from the menus, if it is being journaled
+journal = None
 
-def show_stash():
+
+def get_stash_lines() -> list[str]:
     horde_upkeep = state[StateKey.HORDE].get_upkeep()
     stash = state[StateKey.STASH]
-    print(f"You have {stash.food} food and {stash.gold} gold remaining in your stash.")
+    lines = [f"You have {stash.food} food and {stash.gold} gold remaining in your stash."]
     if horde_upkeep.food > 0 and horde_upkeep.gold > 0:
         remaining_weeks = min(stash.food // horde_upkeep.food, stash.gold // horde_upkeep.gold)
-        print(f"This is enough to keep your horde happy for {remaining_weeks} week(s).")
+        lines.append(f"This is enough to keep your horde happy for {remaining_weeks} week(s).")
+    return lines
+
+
+def show_stash():
+    for line in get_stash_lines():
+        print(line)
+
+
+def get_status_lines() -> list[str]:
+    """The week counter and stash shown above the game menu, always four lines so the status keeps its height."""
+    lines = [f"Week {state[StateKey.WEEK]}"] + get_stash_lines()
+    return lines + [""] * (4 - len(lines))
 
 
 def add_minimum_settlements(week_number: int):
-    if week_number < 5:
-        state[StateKey.SETTLEMENTS].extend([NomadEncampment(), QuietVillage(), QuietVillage()])
-    elif week_number < 10:
-        state[StateKey.SETTLEMENTS].extend([QuietVillage(), QuietVillage(), BusyTown()])
-    elif week_number < 15:
-        state[StateKey.SETTLEMENTS].extend([BusyTown(), BusyTown(), BustlingCity()])
-    else:
-        state[StateKey.SETTLEMENTS].extend([BusyTown(), BustlingCity(), BustlingCity()])
+    state[StateKey.SETTLEMENTS].extend(get_settlement_factory("minimum").spawn(week_number, rng=state[StateKey.RNG]))
 
 
 def add_random_settlement(week_number: int):
-    if week_number < 5:
-        state[StateKey.SETTLEMENTS].append(random.choice([NomadEncampment(), QuietVillage()]))
-    elif week_number < 10:
-        state[StateKey.SETTLEMENTS].append(random.choice([QuietVillage(), BusyTown(), BustlingCity()]))
-    elif week_number < 15:
-        state[StateKey.SETTLEMENTS].append(
-            random.choice([QuietVillage(), BusyTown(), BustlingCity(), GleamingCastle()]))
-    else:
-        state[StateKey.SETTLEMENTS].append(random.choice([BustlingCity(), GleamingCastle()]))
+    state[StateKey.SETTLEMENTS].extend(get_settlement_factory("random").spawn(week_number, rng=state[StateKey.RNG]))
 
 
 def update_settlements(week_number: int):
-    active_settlements = list(filter(lambda s: not s.defeated, state[StateKey.SETTLEMENTS]))
-    needs_settlements = len(active_settlements) == 0
+    active_count = state[StateKey.SETTLEMENTS].active_count
+    needs_settlements = active_count == 0
     if needs_settlements:
         add_minimum_settlements(week_number)
-    elif len(active_settlements) < week_number and random.random() > 0.8:
+    elif active_count < week_number and state[StateKey.RNG].random() > 0.8:
         add_random_settlement(week_number)
 
 
@@ -85,17 +92,19 @@ def pass_weeks(n: int, dry_run=False) -> bool:
     return True
 
 
-def quit_game():
+def quit_game() -> Screen:
     print("Goodbye, commander.")
-    sys.exit()
+    return Screen.QUIT
 
 
 def check_for_victory():
     # If not all settlements are defeated or there are no castles, no victory yet
-    if any(map(lambda s: not s.defeated, state[StateKey.SETTLEMENTS])) or all(
-            map(lambda s: not isinstance(s, GleamingCastle), state[StateKey.SETTLEMENTS])):
+    settlements = state[StateKey.SETTLEMENTS]
+    if settlements.active_count > 0 or not settlements.has_type(GleamingCastle):
         return
 
+    state[StateKey.VICTORIOUS] = True
+
     commander = state[StateKey.COMMANDER]
     stash = state[StateKey.STASH]
     print_victory_figure()
@@ -103,19 +112,18 @@ def check_for_victory():
     print(f"The horde of {commander.name} the {commander.adjective} has swarmed over the land, "
           f"conquering {len(state[StateKey.SETTLEMENTS])} settlements in {state[StateKey.WEEK]} weeks.")
     print(f"\nYour horde had {stash.food} food and {stash.gold} gold remaining.")
-    main_menu()
 
 
 def add_members_to_horde(horde: Horde, creature_type: Type[Creature], minimum: int, maximum: int) -> None:
     """
     Adds a number of creatures to the horde between the minimum and maximum values of the creature type provided.
     """
-    num_new_creatures = randint(minimum, maximum)
+    rng = state[StateKey.RNG]
+    num_new_creatures = rng.randint(minimum, maximum)
     if num_new_creatures > 0:
         name = creature_type.__name__.lower()
         print(f"\nYou've attracted {num_new_creatures} new {name}s!")
-        # noinspection PyArgumentList
-        new_creatures = [creature_type() for _ in range(num_new_creatures)]
+        new_creatures = generate_batch(creature_type, num_new_creatures, rng)
         new_reputation = horde.get_avg_reputation() * 0.9
         for creature in new_creatures:
             creature.stats.reputation.value = max(creature.stats.reputation.value, new_reputation)
@@ -130,86 +138,93 @@ def cull_horde(horde: Horde, creature_types: list[Type[Creature]], minimum: int,
     Removes a number of creatures between the minimum and maximum values based
     on the candidate creature types provided.
     """
-    num_to_cull = min(randint(minimum, maximum), len(horde.members))
-    candidate_creatures = [m for m in horde.members if type(m) in creature_types and not m.is_commander]
-    if num_to_cull <= 0 or len(candidate_creatures) == 0:
+    remove_casualties(horde, creature_types, state[StateKey.RNG].randint(minimum, maximum))
+
+
+def remove_casualties(horde: Horde, creature_types: list[Type[Creature]], casualties: int):
+    """Removes up to the given number of random creatures of the candidate creature types."""
+    num_to_cull = min(casualties, len(horde.members))
+    candidate_count = horde.count_members(creature_types)
+    if num_to_cull <= 0 or candidate_count == 0:
         print("\nLooks like everyone survived today.")
     else:
-        num_to_cull = min(len(candidate_creatures), num_to_cull)
+        num_to_cull = min(candidate_count, num_to_cull)
         print(f"\n{num_to_cull} of your horde didn't make it back alive.")
-        horde.cull(sample(candidate_creatures, k=num_to_cull))
+        horde.cull(horde.sample_members(creature_types, num_to_cull, state[StateKey.RNG]))
+
+
+# Message and styled effect printed for each raid modifier, filled in with the settlement name and modifier amount
+RAID_MODIFIER_MESSAGES = {
+    ModifierKind.DEMORALIZED: ("[REP] The {name} defense is losing their wits in the face of your famous might. ",
+                               "(-{amount:.2f} militia Cunning)", console.ConsoleColor.GREEN),
+    ModifierKind.AMBUSHED: ("[QCK] Your speedy horde got the drop on the {name} defenses! "
+                            "You've caught them unprepared. ",
+                            "(-{amount:.2f} militia Beef)", console.ConsoleColor.GREEN),
+    ModifierKind.SCOUTED_RALLY: ("[QCK] The {name} militia rallied quickly, but your scouts found a critical flaw in "
+                                 "their defenses. Not to worry. (No change)", None, None),
+    ModifierKind.RALLIED: ("[QCK] Uh oh. The {name} defenses rallied their forces in record time. "
+                           "You've got your work cut out for you. ",
+                           "(-{amount:.2f} horde Beef)", console.ConsoleColor.RED),
+    ModifierKind.SCOUTED_EDGE: ("[CUN] The information from your scouts has given you the tactical edge. ",
+                                "(+{amount:.2f} horde Beef)", console.ConsoleColor.GREEN),
+    ModifierKind.CUNNING_EDGE: ("[CUN] The {name} defenses don't seem too bright. Let's show them who's boss. ",
+                                "(+{amount:.2f} horde Beef)", console.ConsoleColor.GREEN),
+    ModifierKind.OUTWITTED: ("[CUN] Hmm. These men defending {name} are smarter than we thought. "
+                             "Best keep our heads on straight. ",
+                             "(+{amount:.2f} militia Beef)", console.ConsoleColor.RED),
+}
+
+
+def print_raid_modifier(modifier: Modifier, settlement: Settlement):
+    message, effect, color = RAID_MODIFIER_MESSAGES[modifier.kind]
+    if effect is None:
+        print(message.format(name=settlement.name))
+    else:
+        print(message.format(name=settlement.name), end="")
+        console.print_styled(effect.format(amount=modifier.amount), color)
 
 
-def _raid(horde: Horde, settlement: Settlement) -> None:
+def _raid(horde: Horde,
+          settlement: Settlement,
+          accept_surrender: Optional[Callable[[Settlement, GoblinCommander], bool]] = None) -> None:
+    """
+    Presents a raid on the settlement, resolved by battle.resolve_raid, and applies its outcome to the game.
+    accept_surrender decides whether to take the militia's surrender when one is offered, asking the player by default.
+    """
     if settlement.defeated or not settlement.militia:
         raise ValueError("Raid target is not a valid settlement for raiding.")
 
-    # TODO: Refactor this process for testability
-
-    horde_beef = horde.get_total_beef()
-
-    militia_beef = settlement.militia.get_total_beef()
-    militia_cunning = settlement.militia.get_total_cunning()
+    horde_summary = horde.summarize()
+    militia_summary = settlement.militia.summarize()
 
     print(settlement.description)
 
-    print(f"\nBase horde Beef: {horde_beef:.2f}")
-    print(f"Base militia Beef: {militia_beef:.2f}\n")
-
-    if horde.get_avg_reputation() > 4.5:
-        if settlement.militia.get_avg_cunning() > 7.0:
-            accepted_surrender = menus.show_surrender_menu(settlement, state[StateKey.COMMANDER])
-            if accepted_surrender:
-                console.print_header("victory", console.ConsoleColor.GREEN)
-                print(f"The {len(settlement.militia.members)} men of {settlement.name}'s "
-                      "militia have joined your horde!")
-                horde.bolster(settlement.militia.members)
-                settlement.defeated = True
-                settlement.scouted = True
-                settlement.militia.members = []
-                for creature in state[StateKey.HORDE].members:
-                    creature.stats.reputation.value = min(creature.stats.reputation.value + settlement.reputation,
-                                                          5.0)
-                check_for_victory()
-                return
-
-        print(f"[REP] The {settlement.name} defense is losing their wits in the face of your famous might. ", end="")
-        console.print_styled(f"(-{militia_cunning * 0.3:.2f} militia Cunning)", console.ConsoleColor.GREEN)
-        militia_cunning *= 0.7
-
-    if horde.get_avg_quickness() > settlement.militia.get_avg_quickness():
-        print(
-            f"[QCK] Your speedy horde got the drop on the {settlement.name} defenses! You've caught them unprepared. ",
-            end="")
-        console.print_styled(f"(-{militia_beef * 0.1:.2f} militia Beef)", console.ConsoleColor.GREEN)
-        militia_beef *= 0.9
-    else:
-        if settlement.scouted:
-            print(f"[QCK] The {settlement.name} militia rallied quickly,"
-                  " but your scouts found a critical flaw in their defenses. Not to worry. (No change)")
-        else:
-            print(f"[QCK] Uh oh. The {settlement.name} defenses rallied their forces in record time."
-                  f" You've got your work cut out for you. ", end="")
-            console.print_styled(f"(-{horde_beef * 0.1:.2f} horde Beef)", console.ConsoleColor.RED)
-            horde_beef *= 0.9
-
-    # Need to use local militia cunning to allow for modification
-    if settlement.scouted or horde.get_avg_cunning() > militia_cunning / len(settlement.militia.members):
-        if settlement.scouted:
-            print(f"[CUN] The information from your scouts has given you the tactical edge. ", end="")
-        else:
-            print(f"[CUN] The {settlement.name} defenses don't seem too bright. Let's show them who's boss. ", end="")
-        console.print_styled(f"(+{horde_beef * 0.1:.2f} horde Beef)", console.ConsoleColor.GREEN)
-        horde_beef *= 1.1
-    else:
-        print(f"[CUN] Hmm. These men defending {settlement.name} are smarter than we thought."
-              f" Best keep our heads on straight. ", end="")
-        console.print_styled(f"(+{militia_beef * 0.1:.2f} militia Beef)", console.ConsoleColor.RED)
-        militia_beef *= 1.1
-
-    print(f"\nAdjusted horde Beef: {horde_beef:.2f}")
-    print(f"Adjusted militia Beef: {militia_beef:.2f}\n")
-    if horde_beef > militia_beef:
+    print(f"\nBase horde Beef: {horde_summary.total_beef:.2f}")
+    print(f"Base militia Beef: {militia_summary.total_beef:.2f}\n")
+
+    if battle.surrender_offered(horde_summary, militia_summary):
+        accept_surrender = accept_surrender or menus.show_surrender_menu
+        accepted_surrender = accept_surrender(settlement, state[StateKey.COMMANDER])
+        if accepted_surrender:
+            console.print_header("victory", console.ConsoleColor.GREEN)
+            print(f"The {len(settlement.militia.members)} men of {settlement.name}'s "
+                  "militia have joined your horde!")
+            absorbed_militia = settlement.militia.members
+            settlement.militia.members = []
+            horde.bolster(absorbed_militia)
+            settlement.defeated = True
+            settlement.scouted = True
+            horde.shift_reputation(settlement.reputation)
+            check_for_victory()
+            return
+
+    outcome = battle.resolve_raid(horde_summary, militia_summary, settlement.scouted, state[StateKey.RNG])
+    for modifier in outcome.modifiers:
+        print_raid_modifier(modifier, settlement)
+
+    print(f"\nAdjusted horde Beef: {outcome.horde_beef:.2f}")
+    print(f"Adjusted militia Beef: {outcome.militia_beef:.2f}\n")
+    if outcome.victory:
         console.print_styled("VICTORY", console.ConsoleColor.GREEN)
         print(f"Your horde defeated the pitiful defenses of {settlement.name}.")
         settlement.defeated = True
@@ -218,25 +233,24 @@ def _raid(horde: Horde, settlement: Settlement) -> None:
         print(f"Your successful raid added {settlement.reward.food} food "
               f"and {settlement.reward.gold} gold to the stash.")
         state[StateKey.STASH] += settlement.reward
-        for creature in state[StateKey.HORDE].members:
-            creature.stats.reputation.value = min(creature.stats.reputation.value + settlement.reputation, 5.0)
+        horde.shift_reputation(settlement.reputation)
         check_for_victory()
     else:
         console.print_styled("DEFEAT", console.ConsoleColor.RED)
         print(f"Your pitiful horde was defeated by the defenses of {settlement.name}. "
               "Some of them didn't make it back.")
-        cull_horde(horde, [Goblin, Ogre, Orc], 3, 5)
-        for creature in state[StateKey.HORDE].members:
-            creature.stats.reputation.value = max(creature.stats.reputation.value - settlement.reputation,
-                                                  0.0)
+        remove_casualties(horde, [Goblin, Ogre, Orc], outcome.casualties)
+        horde.shift_reputation(-settlement.reputation)
     settlement.scouted = True
 
 
-def raid(s: Settlement):
+def raid(s: Settlement, accept_surrender: Optional[Callable[[Settlement, GoblinCommander], bool]] = None):
     pass_weeks(1, dry_run=True)
     console.print_header("raid")
     print(f"You've chosen to raid {s.name}.")
-    _raid(state[StateKey.HORDE], s)
+    _raid(state[StateKey.HORDE], s, accept_surrender)
+    if state[StateKey.VICTORIOUS]:
+        return
     pass_weeks(1)
     update_settlements(state[StateKey.WEEK])
 
@@ -296,12 +310,14 @@ def recruit_orcs(horde: Horde):
 
 def raid_fn():
     if pass_weeks(1, dry_run=True):
-        menus.show_raid_menu(state[StateKey.HORDE].get_total_beef(), state[StateKey.SETTLEMENTS], raid_fn=raid)
+        menus.show_raid_menu(state[StateKey.HORDE].get_total_beef(), state[StateKey.SETTLEMENTS],
+                             raid_fn=partial(take_turn, raid), horde_summary=state[StateKey.HORDE].summarize())
 
 
 def scout_fn():
     if pass_weeks(1, dry_run=True):
-        menus.show_scout_menu(state[StateKey.HORDE].get_total_beef(), state[StateKey.SETTLEMENTS], scout_fn=scout)
+        menus.show_scout_menu(state[StateKey.HORDE].get_total_beef(), state[StateKey.SETTLEMENTS],
+                              scout_fn=partial(take_turn, scout), horde_summary=state[StateKey.HORDE].summarize())
 
 
 def recruit_goblins_fn():
@@ -329,17 +345,29 @@ def explore_fn():
 
 def cull_horde_fn():
     horde = state[StateKey.HORDE]
-    cull_count = len(horde.members) // 10
+    cull_count = horde.size // 10
     if cull_count > 0:
         print("You can't let this many creatures get their mitts on your stash. We're kicking out the weakest "
               f"{cull_count} members of the horde.")
-        horde.members.sort(key=lambda c: c.stats.beef.value, reverse=True)
-        state[StateKey.HORDE].members = horde.members[:-cull_count]
+        horde.cull(horde.weakest_members(cull_count))
+
+
+# The actions that take a turn, by the names journals and simulation.Action give them
+TURN_ACTIONS: dict[str, Callable[..., Any]] = {
+    "raid": raid,
+    "scout": scout,
+    "recruit_goblins": recruit_goblins_fn,
+    "recruit_ogres": recruit_ogres_fn,
+    "recruit_orcs": recruit_orcs_fn,
+    "explore": explore_fn,
+    "cull_horde": cull_horde_fn,
+}
 
 
 def view_horde_fn():
     console.clear()
-    print_creature_group(state[StateKey.HORDE])
+    print_creature_group(state[StateKey.HORDE], pause=menus.show_more_prompt,
+                         screen=console.ScreenModel(top=console.body_top()))
 
 
 def view_profile_fn():
@@ -349,23 +377,48 @@ def view_profile_fn():
     show_stash()
 
 
-def game_menu():
-    print(f"\nWeek {state[StateKey.WEEK]}")
-    show_stash()
-    menus.show_game_menu(
+def save_game_fn():
+    from goblincommander import savegame
+
+    path = savegame.get_save_path()
+    savegame.save(state, path)
+    print(f"Your campaign has been saved to {path}.")
+
+
+def take_turn(action: Callable[..., Any], *args) -> Screen:
+    """
+    Applies one game action with the given arguments, as picking it from the game menu would, and returns the screen
+    the game moves to next. Scripted drivers step a game one action at a time through here, and so does the game
+    menu, so that every action is recorded while the game is journaled.
+    """
+    if journal is not None:
+        journal.record(action, *args)
+    else:
+        action(*args)
+    return Screen.MAIN_MENU if state[StateKey.VICTORIOUS] else Screen.GAME_MENU
+
+
+def game_menu() -> Screen:
+    console.show_status(get_status_lines())
+    next_screen = menus.show_game_menu(
         raid_fn=raid_fn,
         scout_fn=scout_fn,
-        recruit_goblins_fn=recruit_goblins_fn,
-        recruit_ogres_fn=recruit_ogres_fn,
-        recruit_orcs_fn=recruit_orcs_fn,
-        explore_fn=explore_fn,
-        cull_horde_fn=cull_horde_fn,
+        recruit_goblins_fn=partial(take_turn, recruit_goblins_fn),
+        recruit_ogres_fn=partial(take_turn, recruit_ogres_fn),
+        recruit_orcs_fn=partial(take_turn, recruit_orcs_fn),
+        explore_fn=partial(take_turn, explore_fn),
+        cull_horde_fn=partial(take_turn, cull_horde_fn),
         view_horde_fn=view_horde_fn,
         view_profile_fn=view_profile_fn,
-        quit_fn=main_menu
+        save_fn=save_game_fn,
+        quit_fn=lambda: Screen.MAIN_MENU
     )
 
-    game_menu()
+    if next_screen is Screen.MAIN_MENU or state[StateKey.VICTORIOUS]:
+        console.hide_status()
+        close_journal()
+        return Screen.MAIN_MENU
+    return Screen.GAME_MENU
 
 
 def name_menu():
@@ -380,22 +433,71 @@ def name_menu():
           f"{state[StateKey.COMMANDER].name} the {state[StateKey.COMMANDER].adjective}.")
 
 
-def new_game():
+def new_game() -> Screen:
     console.clear()
 
     print("You are the vaunted commander of a rioting horde. Your skin is green, and your heart is cold. "
           "Lead your minions to victory.\n")
 
     name_menu()
+    # Seeded explicitly so the journal can start the same game again
+    seed = Random().getrandbits(64)
+    start_game(state[StateKey.COMMANDER], Random(seed))
+    open_journal(seed)
+
+    return Screen.GAME_MENU
+
+
+def load_game() -> Screen:
+    from goblincommander import savegame
+
+    try:
+        saved_state = savegame.load()
+    except FileNotFoundError:
+        print("There's no saved campaign to pick up.\n")
+        return Screen.MAIN_MENU
+    except ValueError as e:
+        print(f"That saved campaign can't be loaded. {e}\n")
+        return Screen.MAIN_MENU
+
+    state.update(saved_state)
+    open_journal()
+    console.clear()
+    commander = state[StateKey.COMMANDER]
+    print(f"Welcome back, {commander.name} the {commander.adjective}. Your horde awaits.")
+    return Screen.GAME_MENU
+
+
+def open_journal(seed: Optional[int] = None):
+    """Starts journaling the game in state, which was started from a Random seeded with seed, if given."""
+    global journal
+    from goblincommander.journal import Journal
+
+    close_journal()
+    journal = Journal.start(seed)
+
+
+def close_journal():
+    global journal
+    if journal is not None:
+        journal.close()
+        journal = None
+
+
+def start_game(commander: GoblinCommander, rng: Optional[Random] = None):
+    """
+    Sets up the settlements, horde, stash and calendar of a new game led by the given commander. Every random draw in
+    the game comes from rng, a freshly seeded Random by default.
+    """
+    state[StateKey.COMMANDER] = commander
+    state[StateKey.RNG] = rng = rng or Random()
 
     # Generate settlements
-    generated_settlement_types = choices([NomadEncampment, QuietVillage, BusyTown],
-                                         cum_weights=[55, 90, 100],
-                                         k=randint(5, 10))
-    state[StateKey.SETTLEMENTS] = [settlement_type() for settlement_type in generated_settlement_types]
+    starting_settlements = get_settlement_factory("starting").spawn(1, rng.randint(5, 10), rng)
+    state[StateKey.SETTLEMENTS] = SettlementRegistry(starting_settlements)
 
     # Generate horde
-    state[StateKey.HORDE] = creature_groups.generate_horde(commander=state[StateKey.COMMANDER])
+    state[StateKey.HORDE] = creature_groups.generate_horde(commander=state[StateKey.COMMANDER], rng=rng)
     # Subtract 1 from the count here to ignore the commander
     print(f"\nYou have attracted a stunning horde of {len(state[StateKey.HORDE].members) - 1} goblin(s).")
     horde_upkeep = state[StateKey.HORDE].get_upkeep()
@@ -406,19 +508,40 @@ def new_game():
 
     # Set in-game week
     state[StateKey.WEEK] = 1
+    state[StateKey.VICTORIOUS] = False
 
-    game_menu()
 
+def main_menu() -> Screen:
+    return menus.show_main_menu(new_game_fn=new_game, load_game_fn=load_game, quit_fn=quit_game)
 
-def main_menu():
-    menus.show_main_menu(new_game_fn=new_game, quit_fn=quit_game)
+
+SCREENS: dict[Screen, Callable[[], Screen]] = {
+    Screen.MAIN_MENU: main_menu,
+    Screen.GAME_MENU: game_menu,
+}
+
+
+def run(screen: Screen = Screen.MAIN_MENU):
+    """
+    Runs the game as a state machine. Each screen handles one prompt and returns the next screen, so the stack stays
+    the same depth however long the session runs.
+    """
+    try:
+        while screen is not Screen.QUIT:
+            # Each screen's output reaches the terminal in one write, flushed early only when a prompt needs it
+            with console.buffered_output():
+                screen = SCREENS[screen]()
+    finally:
+        console.hide_status()
+        close_journal()
 
 
 def main():
-    console.clear()
-    print_title_figure("Goblin Commander")
+    with console.buffered_output():
+        console.clear()
+        print_title_figure("Goblin Commander")
 
-    main_menu()
+    run()
 
 
 if __name__ == "__main__":
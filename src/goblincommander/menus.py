@@ -1,77 +1,82 @@
 import sys
+from typing import Optional
 
-from inquirer import List, prompt, Text
-from tabulate import tabulate
 from termcolor import colored
 
+from goblincommander import console
+from goblincommander.battle import win_probability
+from goblincommander.creature_groups import GroupSummary
 from goblincommander.creatures import GoblinCommander
-from goblincommander.settlements import Settlement
-
-MAIN_MENU_SELECTION = [
-    List("main_menu_selection",
-         message="What would you like to do, commander?",
-         choices=[("NEW GAME", "NEW"),
-                  # TODO: Add settings
-                  # "OPTIONS",
-                  "QUIT"],
-         carousel=True)
-]
-
-NAME_MENU_SELECTION = [
-    List("name_menu_select",
-         message="...That said, what's your name again? Should I just come up with something?",
-         choices=[("I already have a name! It's... (enter name)", "enter"),
-                  ("Why don't you tell me what you want to call me? (random name)", "random")])
-]
-
-TITLE_MENU_SELECTION = [
-    List("title_menu_select",
-         message="And what would you say you're known for?",
-         choices=[("I could break a man's skull with my pinky finger. (+5 Beef)", "Skullcracker"),
-                  ("Ain't no defenses that are gonna outwit me. (+5 Cunning)", "Brainy"),
-                  ("Once I beat my own grandpa in a race to get some soup. (+5 Quickness)", "Swift"),
-                  ("I'm known for pulling out teeth when people ask me too many question. (+2.0 Reputation)",
-                   "Notorious")])
-]
-
-GAME_MENU_SELECTION = [
-    List("game_menu_selection",
-         message="What would you like to do, commander?",
-         choices=[("Raid nearby settlement (1 week)", "raid"),
-                  ("Scout nearby settlement (1 week)", "scout"),
-                  ("Explore area for more settlements (1 week)", "explore"),
-                  ("Recruit goblins (2 weeks)", "recruit_goblins"),
-                  ("Recruit ogres (2 weeks)", "recruit_ogres"),
-                  ("Recruit orcs (4 weeks)", "recruit_orcs"),
-                  ("Cull horde", "cull_horde"),
-                  ("View horde", "view_horde"),
-                  ("View your profile", "view_profile"),
-                  ("Return to main menu", "quit")],
-         carousel=True)
-]
+from goblincommander.settlements import Settlement, SettlementRegistry
+
+# Menus are described as keyword arguments for inquirer's List question, which is only imported once a menu is shown
+
+MAIN_MENU_SELECTION = dict(name="main_menu_selection",
+                           message="What would you like to do, commander?",
+                           choices=[("NEW GAME", "NEW"),
+                                    ("LOAD GAME", "LOAD"),
+                                    # TODO: Add settings
+                                    # "OPTIONS",
+                                    "QUIT"],
+                           carousel=True)
+
+NAME_MENU_SELECTION = dict(name="name_menu_select",
+                           message="...That said, what's your name again? Should I just come up with something?",
+                           choices=[("I already have a name! It's... (enter name)", "enter"),
+                                    ("Why don't you tell me what you want to call me? (random name)", "random")])
+
+TITLE_MENU_SELECTION = dict(name="title_menu_select",
+                            message="And what would you say you're known for?",
+                            choices=[("I could break a man's skull with my pinky finger. (+5 Beef)", "Skullcracker"),
+                                     ("Ain't no defenses that are gonna outwit me. (+5 Cunning)", "Brainy"),
+                                     ("Once I beat my own grandpa in a race to get some soup. (+5 Quickness)",
+                                      "Swift"),
+                                     ("I'm known for pulling out teeth when people ask me too many question. "
+                                      "(+2.0 Reputation)", "Notorious")])
+
+GAME_MENU_SELECTION = dict(name="game_menu_selection",
+                           message="What would you like to do, commander?",
+                           choices=[("Raid nearby settlement (1 week)", "raid"),
+                                    ("Scout nearby settlement (1 week)", "scout"),
+                                    ("Explore area for more settlements (1 week)", "explore"),
+                                    ("Recruit goblins (2 weeks)", "recruit_goblins"),
+                                    ("Recruit ogres (2 weeks)", "recruit_ogres"),
+                                    ("Recruit orcs (4 weeks)", "recruit_orcs"),
+                                    ("Cull horde", "cull_horde"),
+                                    ("View horde", "view_horde"),
+                                    ("View your profile", "view_profile"),
+                                    ("Save game", "save"),
+                                    ("Return to main menu", "quit")],
+                           carousel=True)
 
 # TODO: Remove this?
 RAID_MENU_SELECTION = []
 
 
-def process_single_selection_menu(selection_config: list[List]):
-    response = prompt(selection_config)
+def process_single_selection_menu(selection_config: dict):
+    from inquirer import List, prompt
+
+    with console.direct_output():
+        response = prompt([List(**selection_config)])
     if response is None:
         print("Goodbye, commander.")
         sys.exit()
-    return response[selection_config[0].name]
+    return response[selection_config["name"]]
 
 
-def show_main_menu(*, new_game_fn, quit_fn):
-    selection = process_single_selection_menu(MAIN_MENU_SELECTION)
-    match selection:
-        case "NEW":
-            new_game_fn()
-        case "QUIT":
-            quit_fn()
-        case _:
-            print("Please select a different option.\n")
-            show_main_menu(new_game_fn=new_game_fn, quit_fn=quit_fn)
+def show_main_menu(*, new_game_fn, load_game_fn, quit_fn):
+    """Asks until a valid option is picked, then returns the result of its function."""
+    while True:
+        selection = process_single_selection_menu(MAIN_MENU_SELECTION)
+        match selection:
+            case "NEW":
+                return new_game_fn()
+            case "LOAD":
+                return load_game_fn()
+            case "QUIT":
+                return quit_fn()
+            case _:
+                print("Please select a different option.\n")
 
 
 def show_name_menu(*, random_name: str) -> str:
@@ -85,9 +90,20 @@ def show_name_menu(*, random_name: str) -> str:
 
 
 def show_name_input(random_name: str):
-    return prompt([Text("name_input",
-                        "Why don't you write your name down here so I don't forget again?",
-                        random_name)])["name_input"]
+    from inquirer import prompt, Text
+
+    with console.direct_output():
+        return prompt([Text("name_input",
+                            "Why don't you write your name down here so I don't forget again?",
+                            random_name)])["name_input"]
+
+
+def show_more_prompt() -> bool:
+    from inquirer import Confirm, prompt
+
+    with console.direct_output():
+        response = prompt([Confirm("more", message="Show more of your horde?", default=True)])
+    return response is not None and response["more"]
 
 
 def show_title_menu():
@@ -95,58 +111,70 @@ def show_title_menu():
 
 
 def show_game_menu(*, raid_fn, scout_fn, recruit_goblins_fn, recruit_ogres_fn, recruit_orcs_fn, explore_fn,
-                   cull_horde_fn, view_horde_fn, view_profile_fn, quit_fn):
+                   cull_horde_fn, view_horde_fn, view_profile_fn, save_fn, quit_fn):
+    """Runs the function of the selected option and returns its result."""
     selection = process_single_selection_menu(GAME_MENU_SELECTION)
     match selection:
         case "raid":
-            raid_fn()
+            return raid_fn()
         case "scout":
-            scout_fn()
+            return scout_fn()
         case "recruit_goblins":
-            recruit_goblins_fn()
+            return recruit_goblins_fn()
         case "recruit_ogres":
-            recruit_ogres_fn()
+            return recruit_ogres_fn()
         case "recruit_orcs":
-            recruit_orcs_fn()
+            return recruit_orcs_fn()
         case "explore":
-            explore_fn()
+            return explore_fn()
         case "cull_horde":
-            cull_horde_fn()
+            return cull_horde_fn()
         case "view_horde":
-            view_horde_fn()
+            return view_horde_fn()
         case "view_profile":
-            view_profile_fn()
+            return view_profile_fn()
+        case "save":
+            return save_fn()
         case "quit":
-            quit_fn()
+            return quit_fn()
         case _:
             print("Please select a different option.\n")
 
 
-def get_raid_menu_description(settlement: Settlement) -> tuple[str, str, str]:
+def get_raid_menu_description(settlement: Settlement,
+                              horde_summary: Optional[GroupSummary] = None) -> tuple[str, str, str]:
     description = f"{settlement.name}, a {settlement.settlement_type}"
-    guards = f"Guarded by {len(settlement.militia.members)} men"
+    guards = f"Guarded by {settlement.militia_size} men"
 
     if settlement.scouted:
         report = f"(Beef: {settlement.militia.get_total_beef()}," \
                  f" reward: {settlement.reward.food} food, {settlement.reward.gold} gold)"
     else:
         report = f"(expected Beef: {settlement.expected_beef}, " \
-                 f"expected reward: {settlement.expected_food} food, {settlement.expected_gold} gold)"
+                 f"expected reward: {settlement.expected_food} food, {settlement.expected_gold} gold"
+        if horde_summary is not None:
+            # Against the garrison shown above, as the simulation's policies judge it
+            chance = win_probability(horde_summary, settlement.militia_size, settlement.militia_size)
+            report += f", win chance: {chance:.0%}"
+        report += ")"
 
     return description, guards, colored(report, attrs=['dark'])
 
 
-def show_raid_menu(current_beef:int, settlements: list[Settlement], *, raid_fn):
+def show_raid_menu(current_beef: int, settlements: SettlementRegistry, *, raid_fn,
+                   horde_summary: Optional[GroupSummary] = None):
+    from tabulate import tabulate
+
     print(f"Your horde currently has {current_beef} Beef.")
-    valid_settlements = [s for s in settlements if not s.defeated and s.militia]
-    valid_settlements.sort(key=lambda s: s.expected_beef, reverse=True)
-    descriptions = tabulate([get_raid_menu_description(s) for s in valid_settlements]).splitlines()[1:]
+    valid_settlements = settlements.active_by_expected_beef()
+    descriptions = tabulate([get_raid_menu_description(s, horde_summary)
+                             for s in valid_settlements]).splitlines()[1:]
     choices = list(zip(descriptions, valid_settlements))
     choices.append("Back")
-    selection = process_single_selection_menu([List("raid_menu_selection",
-                                               message="Which settlement would you like to raid?",
-                                               choices=choices,
-                                               carousel=True)])
+    selection = process_single_selection_menu(dict(name="raid_menu_selection",
+                                                   message="Which settlement would you like to raid?",
+                                                   choices=choices,
+                                                   carousel=True))
     match selection:
         case Settlement() as s:
             raid_fn(s)
@@ -161,23 +189,26 @@ def show_surrender_menu(settlement: Settlement, commander: GoblinCommander):
           "town's militia in place of their coffers.")
     choices = [("Bring them into the fold, then. Let's turn them loose on their own kind. (absorb militia)", "accept"),
                ("We have no use for their lives. (continue raid)", "raid")]
-    return process_single_selection_menu([List("surrender_menu_selection",
-                                               message="What do you think, commander?",
-                                               choices=choices,
-                                               carousel=True)]) == "accept"
+    return process_single_selection_menu(dict(name="surrender_menu_selection",
+                                              message="What do you think, commander?",
+                                              choices=choices,
+                                              carousel=True)) == "accept"
+
 
+def show_scout_menu(current_beef: int, settlements: SettlementRegistry, *, scout_fn,
+                    horde_summary: Optional[GroupSummary] = None):
+    from tabulate import tabulate
 
-def show_scout_menu(current_beef: int, settlements: list[Settlement], *, scout_fn):
     print(f"Your horde currently has {current_beef} Beef.")
-    valid_settlements = [s for s in settlements if not s.defeated and s.militia and not s.scouted]
-    valid_settlements.sort(key=lambda s: s.expected_beef, reverse=True)
-    descriptions = tabulate([get_raid_menu_description(s) for s in valid_settlements]).splitlines()[1:]
+    valid_settlements = settlements.scoutable_by_expected_beef()
+    descriptions = tabulate([get_raid_menu_description(s, horde_summary)
+                             for s in valid_settlements]).splitlines()[1:]
     choices = list(zip(descriptions, valid_settlements))
     choices.append("Back")
-    selection = process_single_selection_menu([List("scout_menu_selection",
-                                               message="Which settlement would you like to scout?",
-                                               choices=choices,
-                                               carousel=True)])
+    selection = process_single_selection_menu(dict(name="scout_menu_selection",
+                                                   message="Which settlement would you like to scout?",
+                                                   choices=choices,
+                                                   carousel=True))
     match selection:
         case Settlement() as s:
             scout_fn(s)
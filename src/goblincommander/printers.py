@@ -1,16 +1,91 @@
-from pyfiglet import Figlet
-from tabulate import tabulate
+import os
+import re
+import sys
+from functools import cache
+from typing import Callable, Iterable, Optional, TextIO, Type
 
 from goblincommander import console
 from goblincommander.creature_groups import CreatureGroup
+from goblincommander.creatures import Creature, Goblin, Human, Ogre, Orc, get_adjectives
+
+
+# Rendered banners by (font, text), filled from the banner cache file or by rendering
+_banners: dict[tuple[str, str], str] = {}
+
+
+def get_banner_cache_path() -> str:
+    """Location of the persistent banner cache, under GOBLINCOMMANDER_CACHE_DIR or the user's cache directory."""
+    cache_dir = os.environ.get("GOBLINCOMMANDER_CACHE_DIR")
+    if not cache_dir:
+        cache_dir = os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.expanduser(os.path.join("~", ".cache")),
+                                 "goblincommander")
+    return os.path.join(cache_dir, "banners.json")
+
+
+@cache
+def get_pyfiglet_version() -> str:
+    """Reads pyfiglet's version from its version module's source, which is far cheaper than importing pyfiglet."""
+    from importlib.util import find_spec
+
+    spec = find_spec("pyfiglet")
+    try:
+        with open(os.path.join(os.path.dirname(spec.origin), "version.py")) as version_file:
+            match = re.search(r"__version__\s*=\s*['\"]([^'\"]+)", version_file.read())
+        if match:
+            return match.group(1)
+    except (AttributeError, OSError, TypeError):
+        pass
+    import pyfiglet
+    return pyfiglet.__version__
+
+
+@cache
+def get_figlet(font: str):
+    from pyfiglet import Figlet
+
+    return Figlet(font=font)
+
+
+def render_banner(text: str, font: str = "slant") -> str:
+    """
+    Returns text rendered as a Figlet. Each banner is rendered once: afterwards it comes from memory or, in later runs,
+    from the banner cache file, keyed by font, text and pyfiglet version, so pyfiglet is only imported on a miss.
+    """
+    banner = _banners.get((font, text))
+    if banner is not None:
+        return banner
+
+    import json
+
+    path = get_banner_cache_path()
+    key = "\n".join([font, get_pyfiglet_version(), text])
+    try:
+        with open(path) as cache_file:
+            cached = json.load(cache_file)
+    except (OSError, ValueError):
+        cached = {}
+
+    banner = cached.get(key)
+    if banner is None:
+        banner = cached[key] = get_figlet(font).renderText(text)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write a complete file and swap it in, so a concurrent reader never sees half a cache
+            with open(f"{path}.{os.getpid()}.tmp", "w") as cache_file:
+                json.dump(cached, cache_file)
+            os.replace(f"{path}.{os.getpid()}.tmp", path)
+        except OSError:
+            pass
+
+    _banners[(font, text)] = banner
+    return banner
 
 
 def print_title_figure(text):
     """Prints the provided text as a Figlet. Disallows multiple calls."""
     # Prevent the intro from being printed multiple times
     if not print_title_figure.has_been_called:
-        f = Figlet(font='slant')
-        console.print_styled(text, console.ConsoleColor.GREEN, lambda s: f.renderText(s.upper()))
+        console.print_styled(text, console.ConsoleColor.GREEN, lambda s: render_banner(s.upper()))
         print_title_figure.has_been_called = True
 
 
@@ -20,27 +95,126 @@ print_title_figure.has_been_called = False
 
 def print_victory_figure():
     """Prints "Victory" as a Figlet."""
-    f = Figlet(font='slant')
-    console.print_styled("Victory", console.ConsoleColor.GREEN, lambda s: f.renderText(s))
-
-
-def print_creature_group(group: CreatureGroup) -> None:
-    row_data = [[creature.name, type(creature).__name__, creature.adjective,
-                 str(creature.stats.beef.value),
-                 str(creature.stats.cunning.value),
-                 str(creature.stats.quickness.value),
-                 f"{creature.stats.reputation.value:3.2f}"] for creature in group.members
-                if not creature.is_commander]
-    print(tabulate(row_data,
-                   headers=["Name", "Type", "Adjective", "Beef", "Cunning", "Quickness", "Reputation"],
-                   floatfmt=("", "", "", ".0f", ".0f", ".0f", "3.2f")))
-    print()
-    print(tabulate([["Averages",
-                     str(group.get_avg_beef()),
-                     str(group.get_avg_cunning()),
-                     str(group.get_avg_quickness()),
-                     str(group.get_avg_reputation())]],
-                   headers=["", "Beef", "Cunning", "Quickness", "Reputation"],
-                   tablefmt="plain",
-                   floatfmt="3.2f"))
-    print("\n*Averages include your stats")
\ No newline at end of file
+    console.print_styled("Victory", console.ConsoleColor.GREEN, render_banner)
+
+
+# Creature table columns: header, stat field (None for text columns), and, for stats, the value format
+CREATURE_COLUMNS = [("Name", None, None),
+                    ("Type", None, None),
+                    ("Adjective", None, None),
+                    ("Beef", "beef", "d"),
+                    ("Cunning", "cunning", "d"),
+                    ("Quickness", "quickness", "d"),
+                    ("Reputation", "reputation", "3.2f")]
+
+# Number of creature rows written at once, and shown before asking to continue when paging
+PAGE_SIZE = 50
+
+
+@cache
+def get_column_widths() -> tuple[int, ...]:
+    """
+    Creature table column widths, worked out once from the name and adjective tables and the stat ranges rather than
+    from the rows, so a table can be written before all of its rows are known.
+    """
+    creature_types = [Goblin, Human, Ogre, Orc]
+    widths = [max([len(name) for t in creature_types for name in t.name_options]),
+              max([len(t.__name__) for t in creature_types]),
+              max([len(adjective) for bucket in get_adjectives().values() for adjective in bucket])]
+    stat_maximums = {"beef": max([t.MAXIMUM_BEEF for t in creature_types]),
+                     "cunning": max([t.MAXIMUM_CUNNING for t in creature_types]),
+                     "quickness": max([t.MAXIMUM_QUICKNESS for t in creature_types]),
+                     "reputation": 5.0}
+    for header, field, value_format in CREATURE_COLUMNS[3:]:
+        widths.append(max(len(header) + 2, len(format(stat_maximums[field], value_format))))
+    for i, (header, _, _) in enumerate(CREATURE_COLUMNS[:3]):
+        widths[i] = max(widths[i], len(header))
+    return tuple(widths)
+
+
+def format_creature_row(creature: Creature, widths: tuple[int, ...]) -> str:
+    stats = creature.stats
+    return "  ".join([creature.name.ljust(widths[0]),
+                      type(creature).__name__.ljust(widths[1]),
+                      creature.adjective.ljust(widths[2]),
+                      format(stats.get("beef"), "d").rjust(widths[3]),
+                      format(stats.get("cunning"), "d").rjust(widths[4]),
+                      format(stats.get("quickness"), "d").rjust(widths[5]),
+                      format(stats.get("reputation"), "3.2f").rjust(widths[6])]).rstrip()
+
+
+def select_creatures(group: CreatureGroup,
+                     creature_type: Optional[Type[Creature]] = None,
+                     adjective: Optional[str] = None,
+                     minimum_beef: Optional[int] = None,
+                     sort_by: Optional[str] = None,
+                     descending=False) -> Iterable[Creature]:
+    """
+    Yields the group's non-commander members that pass the filters. Unless sorted by a stat field or "name", members
+    stream in group order without being collected first.
+    """
+    creatures = (c for c in group.iter_members() if not c.is_commander
+                 and (creature_type is None or type(c) is creature_type)
+                 and (adjective is None or c.adjective == adjective)
+                 and (minimum_beef is None or c.stats.get("beef") >= minimum_beef))
+    if sort_by == "name":
+        return sorted(creatures, key=lambda c: c.name, reverse=descending)
+    if sort_by is not None:
+        return sorted(creatures, key=lambda c: c.stats.get(sort_by), reverse=descending)
+    return creatures
+
+
+def print_creature_group(group: CreatureGroup,
+                         page_size: int = PAGE_SIZE,
+                         pause: Optional[Callable[[], bool]] = None,
+                         out: Optional[TextIO] = None,
+                         screen: Optional[console.ScreenModel] = None,
+                         **selection) -> None:
+    """
+    Writes the group's members as a table, page_size rows per write, followed by the group's averages. Keyword
+    arguments filter and sort the rows; see select_creatures. If pause is given, it is called between pages and
+    paging stops when it returns False. Given a screen on a terminal, each page is drawn over the last one instead of
+    below it, shrinking pages to fit, and only the rows that changed are rewritten.
+    """
+    out = out or sys.stdout
+    widths = get_column_widths()
+    headers = ["  ".join([header.ljust(width) if field is None else header.rjust(width)
+                          for (header, field, _), width in zip(CREATURE_COLUMNS, widths)]).rstrip(),
+               "  ".join(["-" * width for width in widths])]
+    if screen is not None and console.can_move_cursor(out):
+        # Leave a row for the pause prompt below the page
+        page_size = max(1, min(page_size, screen.available_rows() - len(headers) - 2))
+    else:
+        screen = None
+        out.write("\n".join(headers) + "\n")
+
+    def write_page(rows: list[str]):
+        if screen is not None:
+            screen.render(headers + rows, out)
+        else:
+            out.write("\n".join(rows) + "\n")
+
+    page = []
+    for creature in select_creatures(group, **selection):
+        page.append(format_creature_row(creature, widths))
+        if len(page) == page_size:
+            write_page(page)
+            out.flush()
+            page = []
+            if pause is not None and not pause():
+                break
+    if page:
+        write_page(page)
+
+    # The averages come from the group's running totals, not another pass over the members
+    averages = [("Beef", group.get_avg_beef()),
+                ("Cunning", group.get_avg_cunning()),
+                ("Quickness", group.get_avg_quickness()),
+                ("Reputation", group.get_avg_reputation())]
+    label_width = len("Averages")
+    out.write("\n" + " " * label_width + "  " + "  ".join([header.rjust(len(header) + 2)
+                                                          for header, _ in averages]) + "\n")
+    out.write("Averages  " + "  ".join([format(value, "3.2f").rjust(len(header) + 2)
+                                        for header, value in averages]) + "\n")
+    out.write("\n*Averages include your stats\n")
+    out.flush()
@@ -0,0 +1,22 @@
+from functools import cache
+
+
+@cache
+def load(name: str):
+    """Parses the named JSON resource on first use and returns the cached result afterwards."""
+    import json
+    from importlib.resources import files
+
+    return json.loads(files(__name__).joinpath(f'{name}.json').read_text())
+
+
+class LazyResource:
+    """Class attribute that loads a JSON resource, or one key of it, the first time it is read."""
+
+    def __init__(self, name: str, key=None):
+        self.name = name
+        self.key = key
+
+    def __get__(self, instance, owner=None):
+        data = load(self.name)
+        return data if self.key is None else data[self.key]
@@ -0,0 +1,32 @@
+from hashlib import blake2b
+from random import Random
+
+
+class RandomStream(Random):
+    """
+    A seeded random.Random that can split off independent child streams.
+
+    A stream is identified by its root seed and its path of spawn indices. Each stream is seeded from a hash of that
+    identity rather than from its parent's draws, so spawning never disturbs the parent's sequence and the same seed
+    and path reproduce the same numbers in any process.
+    """
+
+    def __init__(self, seed: int = 0, path: tuple[int, ...] = ()):
+        self.root_seed = seed
+        self.path = path
+        self.children_spawned = 0
+        digest = blake2b(repr((seed, path)).encode(), digest_size=32).digest()
+        super().__init__(int.from_bytes(digest, "big"))
+
+    def spawn(self, n: int) -> list["RandomStream"]:
+        """Returns n new child streams. Repeated calls keep returning new children."""
+        start = self.children_spawned
+        self.children_spawned += n
+        return [RandomStream(self.root_seed, self.path + (i,)) for i in range(start, start + n)]
+
+    def __reduce__(self):
+        return self.__class__, (self.root_seed, self.path), (self.getstate(), self.children_spawned)
+
+    def __setstate__(self, state):
+        generator_state, self.children_spawned = state
+        self.setstate(generator_state)
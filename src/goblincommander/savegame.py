@@ -0,0 +1,618 @@
+"""
+Compact binary snapshots of a game's state.
+
+A save file starts with a magic string and a format version, followed by sections in a fixed order: the string table,
+the calendar and stash, the random number generator, the settlements and the horde. Every integer is little-endian.
+Creature values are stored as packed columns, each in the narrowest integer type that holds it, and names,
+adjectives and settlement descriptions are indices into the string table. The table begins with the label table that
+columnar hordes index their names and adjectives into, so their label columns are saved as they are, then the
+settlement resource tables and any other strings the game used. The label table itself starts with the creature
+resource tables, so most indices are positions in the resource data.
+
+The horde section starts with the horde's aggregates and its pending reputation shift, and every column starts on an
+8-byte boundary, so a saved horde can be used straight from a memory-mapped file; see MappedHorde. Reputations are
+saved as stored, relative to the shift, and each member's place in the per-type index is saved along with it, so a
+loaded horde goes on exactly as the live one would have.
+"""
+import io
+import mmap
+import os
+import struct
+import sys
+from array import array
+from collections import Counter
+from random import Random
+from typing import Any, BinaryIO, Iterable, Iterator, Optional, Sequence
+
+from goblincommander.columns import CreatureColumns, StringTable
+from goblincommander.creature_groups import (TYPE_INDICES, Horde, ReputationShift, get_label_table,
+                                             paused_garbage_collection)
+from goblincommander.creatures import CREATURE_TYPES, Creature, GoblinCommander
+from goblincommander.main import StateKey
+from goblincommander.rng import RandomStream
+from goblincommander.settlements import SETTLEMENT_TYPES, Settlement, SettlementRegistry
+from goblincommander.stash import Stash
+
+MAGIC = b"GOBLINSV"
+FORMAT_VERSION = 4
+
+SETTLEMENT_CLASSES = list(SETTLEMENT_TYPES.values())
+
+# Integer typecodes from narrowest to widest, all the same size on every platform
+INTEGER_TYPECODES = [("b", -2 ** 7, 2 ** 7 - 1), ("h", -2 ** 15, 2 ** 15 - 1), ("i", -2 ** 31, 2 ** 31 - 1),
+                     ("q", -2 ** 63, 2 ** 63 - 1)]
+
+HEADER = struct.Struct("<8sH")
+ARRAY_HEADER = struct.Struct("<cQ")
+# Member count, then the totals of beef, cunning, quickness, reputation, food and gold
+HORDE_HEADER = struct.Struct("<Qqqqdqq")
+# The horde's pending reputation shift: its offset and bounds in reputation steps
+REPUTATION_SHIFT = struct.Struct("<qdd")
+CALENDAR = struct.Struct("<q?qq")
+SETTLEMENT = struct.Struct("<BIIqQqq???")
+RNG_HEADER = struct.Struct("<BB?d")
+
+# RNG section kinds
+RANDOM, RANDOM_STREAM = 0, 1
+
+
+def get_string_table() -> StringTable:
+    """A string table for a new save: the label table as it stands, then every settlement resource string."""
+    strings = StringTable(get_label_table().strings)
+    for config in Settlement.settlement_config.values():
+        for string in config["name_options"] + config["description_options"]:
+            strings[string]
+    return strings
+
+
+def narrowest_typecode(values) -> str:
+    """The narrowest integer typecode that holds every value."""
+    if not values or getattr(values, "typecode", None) == "b":
+        return "b"
+    low, high = min(values), max(values)
+    for typecode, minimum, maximum in INTEGER_TYPECODES:
+        if minimum <= low and high <= maximum:
+            return typecode
+    raise ValueError(f"Column values between {low} and {high} are too large to save.")
+
+
+def pad(out: BinaryIO):
+    """Pads the stream to the next 8-byte boundary."""
+    out.write(bytes(-out.tell() % 8))
+
+
+def write_array(out: BinaryIO, values: array):
+    """Writes a typecode, a length and the values, which start on an 8-byte boundary."""
+    if sys.byteorder == "big":
+        values = array(values.typecode, values)
+        values.byteswap()
+    out.write(ARRAY_HEADER.pack(values.typecode.encode(), len(values)))
+    pad(out)
+    out.write(values.tobytes())
+
+
+def map_array(data: memoryview, offset: int) -> tuple[memoryview, int]:
+    """
+    Returns a view of an array written by write_array at offset, typed but not copied, along with the offset just
+    past it. The view is in the platform's byte order, so it is only meaningful on little-endian platforms.
+    """
+    typecode, length = ARRAY_HEADER.unpack_from(data, offset)
+    offset += ARRAY_HEADER.size
+    offset += -offset % 8
+    itemsize = array(typecode.decode()).itemsize
+    end = offset + length * itemsize
+    return data[offset:end].cast(typecode.decode()), end
+
+
+def read_array(data: memoryview, offset: int) -> tuple[array, int]:
+    """Reads a copy of an array written by write_array at offset, returning it and the offset just past it."""
+    view, end = map_array(data, offset)
+    values = array(view.format)
+    values.frombytes(view.cast("B"))
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values, end
+
+
+def narrow(values: array, typecode: str) -> array:
+    """
+    Copies an integer array into a narrower typecode that holds every value. On a little-endian platform each value is
+    just the low bytes of the wider one, so the copy is a strided slice rather than a conversion of every value.
+    """
+    if sys.byteorder == "big":
+        return array(typecode, values)
+    step = values.itemsize // array(typecode).itemsize
+    return array(typecode, memoryview(values).cast("B").cast(typecode)[::step].tobytes())
+
+
+def widen(values: array | memoryview, typecode: str) -> array:
+    """
+    Copies integer values into an array of a wider typecode. On a little-endian platform a value that isn't negative
+    is its own bytes followed by zeros, so values without negatives are copied with one strided assignment rather
+    than a conversion of every value.
+    """
+    if isinstance(values, memoryview):
+        copy = array(values.format)
+        copy.frombytes(values.cast("B"))
+        values = copy
+    if values.typecode == typecode:
+        return values
+    if sys.byteorder == "big" or not values or min(values) < 0:
+        return array(typecode, values)
+    widened = array(typecode, bytes(len(values) * array(typecode).itemsize))
+    memoryview(widened).cast("B").cast(values.typecode)[::widened.itemsize // values.itemsize] = values
+    return widened
+
+
+def write_integers(out: BinaryIO, values):
+    typecode = narrowest_typecode(values)
+    if not isinstance(values, array):
+        values = array(typecode, values)
+    elif values.typecode != typecode:
+        values = narrow(values, typecode)
+    write_array(out, values)
+
+
+def write_strings(out: BinaryIO, strings: list[str]):
+    encoded = [s.encode() for s in strings]
+    write_integers(out, [len(e) for e in encoded])
+    out.write(b"".join(encoded))
+
+
+def read_strings(data: memoryview, offset: int) -> tuple[list[str], int]:
+    lengths, offset = read_array(data, offset)
+    strings = []
+    for length in lengths:
+        strings.append(str(data[offset:offset + length], "utf-8"))
+        offset += length
+    return strings, offset
+
+
+def write_rng(out: BinaryIO, rng):
+    """Writes the generator's full state, along with a RandomStream's identity so it can keep spawning children."""
+    version, internal_state, gauss_next = rng.getstate()
+    kind = RANDOM_STREAM if isinstance(rng, RandomStream) else RANDOM
+    out.write(RNG_HEADER.pack(kind, version, gauss_next is not None, gauss_next or 0.0))
+    write_array(out, array("q", internal_state))
+    if kind == RANDOM_STREAM:
+        write_strings(out, [str(rng.root_seed)])
+        write_array(out, array("q", rng.path + (rng.children_spawned,)))
+
+
+def read_rng(data: memoryview, offset: int) -> tuple[Random, int]:
+    kind, version, has_gauss, gauss_next = RNG_HEADER.unpack_from(data, offset)
+    internal_state, offset = read_array(data, offset + RNG_HEADER.size)
+    if kind == RANDOM_STREAM:
+        (root_seed,), offset = read_strings(data, offset)
+        path, offset = read_array(data, offset)
+        rng = RandomStream(int(root_seed), tuple(path[:-1]))
+        rng.children_spawned = path[-1]
+    else:
+        rng = Random()
+    rng.setstate((version, tuple(internal_state), gauss_next if has_gauss else None))
+    return rng, offset
+
+
+def get_label_remap(strings: list[str], names: Iterable[int], adjectives: Iterable[int]) -> Optional[list[int]]:
+    """
+    The label table indices of the saved strings that name and adjective columns refer to, or None if they already
+    are label table indices, as they are unless the label table has grown differently since the save was written.
+    """
+    used = max(max(names, default=-1), max(adjectives, default=-1)) + 1
+    labels = get_label_table()
+    remap = [labels[string] for string in strings[:used]]
+    return None if remap == list(range(used)) else remap
+
+
+def remap_labels(labels: array | memoryview, remap: Optional[list[int]]) -> array:
+    return widen(labels, "i") if remap is None else array("i", map(remap.__getitem__, labels))
+
+
+def get_labels(horde: Horde) -> tuple[Sequence[int], Sequence[int], Sequence[int]]:
+    """
+    The type, name and adjective indices of the horde's members, with names and adjectives as label table indices.
+    For a columnar horde these are its own columns, and a MappedHorde doesn't create any members for them.
+    """
+    if isinstance(horde, MappedHorde) and horde.mapped:
+        columns, remap = horde.mapped_columns, horde.get_label_remap()
+        if remap is None:
+            return columns.creature_type, columns.name, columns.adjective
+        return columns.creature_type, remap_labels(columns.name, remap), remap_labels(columns.adjective, remap)
+    if horde.columnar:
+        columns = horde._columns
+        return columns.creature_type, columns.name, columns.adjective
+
+    labels = get_label_table()
+    return ([TYPE_INDICES[type(m)] for m in horde.members],
+            [labels[m.name] for m in horde.members],
+            [labels[m.adjective] for m in horde.members])
+
+
+def write_horde(out: BinaryIO, horde: Horde, labels: tuple[Sequence[int], Sequence[int], Sequence[int]]):
+    """Writes the horde, with labels from get_labels, which has to be called before the save's string table is made."""
+    summary = horde.summarize()
+    upkeep = horde.get_upkeep()
+    out.write(HORDE_HEADER.pack(summary.size, summary.total_beef, summary.total_cunning, summary.total_quickness,
+                                summary.total_reputation, upkeep.food, upkeep.gold))
+    out.write(REPUTATION_SHIFT.pack(*horde.reputation_shift))
+    # Sorted, since the order the values were first seen in doesn't survive a load
+    reputation_counts = sorted(horde.stored_reputation_counts().items())
+    write_array(out, array("d", [value for value, _ in reputation_counts]))
+    write_integers(out, [count for _, count in reputation_counts])
+    write_integers(out, [m._slot for m in horde.commanders])
+
+    for column in labels:
+        write_integers(out, column)
+    # Culls by type pick members through the per-type index, so its order has to survive a load
+    write_integers(out, horde.type_slots())
+    for field in ("beef", "cunning", "quickness", "food", "gold"):
+        write_integers(out, horde.stored_values(field))
+    write_array(out, array("d", horde.stored_values("reputation")))
+
+
+def read_horde(data: memoryview,
+               offset: int,
+               strings: list[str],
+               mapped=False) -> tuple[Horde, Optional[GoblinCommander], int]:
+    """
+    Reads the horde and returns it with its commander, if it has one. A mapped horde works on the columns in data
+    rather than copies of them; see MappedHorde.
+    """
+    size, beef, cunning, quickness, reputation, food, gold = HORDE_HEADER.unpack_from(data, offset)
+    offset += HORDE_HEADER.size
+    reputation_shift = ReputationShift(*REPUTATION_SHIFT.unpack_from(data, offset))
+    reputation_values, offset = read_array(data, offset + REPUTATION_SHIFT.size)
+    reputation_counts, offset = read_array(data, offset)
+    commander_rows, offset = read_array(data, offset)
+
+    read = map_array if mapped else read_array
+    columns = {}
+    for field in ("creature_type", "name", "adjective", "type_slot", "beef", "cunning", "quickness", "food", "gold",
+                  "reputation"):
+        columns[field], offset = read(data, offset)
+
+    totals = dict(beef=beef, cunning=cunning, quickness=quickness, reputation=reputation, food=food, gold=gold)
+    if mapped:
+        horde = MappedHorde(MappedColumns(columns, size), strings, totals,
+                            reputation_counts=Counter(dict(zip(reputation_values, reputation_counts))),
+                            reputation_shift=reputation_shift,
+                            commander_rows=commander_rows)
+    else:
+        remap = get_label_remap(strings, columns["name"], columns["adjective"])
+        columns["name"] = remap_labels(columns["name"], remap)
+        columns["adjective"] = remap_labels(columns["adjective"], remap)
+        creature_columns = CreatureColumns()
+        for field, typecode in CreatureColumns.TYPECODES.items():
+            setattr(creature_columns, field, widen(columns[field], typecode))
+        horde = Horde.from_columns(creature_columns, commander_rows, reputation_shift)
+        # The saved running totals, rather than a fresh sum, so play goes on with the same rounding it had
+        horde._totals.update(totals)
+    commander = {c._slot: c for c in horde.commanders}[commander_rows[0]] if commander_rows else None
+    return horde, commander, offset
+
+
+class MappedColumns:
+    """
+    A saved horde's columns used in place, with the interface of CreatureColumns except for appending. Unlike a
+    CreatureColumns, name and adjective hold indices into the save's string table rather than the label table.
+    Removing a row moves the last row into its place and shortens every column.
+    """
+
+    def __init__(self, views: dict[str, memoryview], length: int):
+        self._views = views
+        self.length = length
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __getattr__(self, field: str) -> memoryview:
+        views = self.__dict__.get("_views", {})
+        if field not in views:
+            raise AttributeError(f"{type(self).__name__!r} object has no attribute {field!r}")
+        return views[field][:self.length]
+
+    def get(self, field: str, row: int) -> int | float:
+        return getattr(self, field)[row]
+
+    def set(self, field: str, row: int, value: int | float):
+        getattr(self, field)[row] = value
+
+    def total(self, field: str) -> int | float:
+        return sum(getattr(self, field))
+
+    def swap_remove(self, row: int):
+        last = self.length - 1
+        for view in self._views.values():
+            view[row] = view[last]
+        self.length = last
+
+
+class LazyMembers:
+    """
+    The member list of a MappedHorde. A member is created the first time it is looked up and kept from then on.
+    Iterating creates passing members for the rows nobody has looked up, without keeping them.
+    """
+
+    def __init__(self, horde: "MappedHorde", length: int):
+        self.horde = horde
+        self.length = length
+        self.created: dict[int, Creature] = {}
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __getitem__(self, row: int) -> Creature:
+        if not 0 <= row < self.length:
+            raise IndexError("member index out of range")
+        creature = self.created.get(row)
+        if creature is None:
+            creature = self.created[row] = self.horde.create_member(row)
+        return creature
+
+    def __setitem__(self, row: int, creature: Creature):
+        self.created[row] = creature
+
+    def __iter__(self) -> Iterator[Creature]:
+        for row in range(self.length):
+            creature = self.created.get(row)
+            yield creature if creature is not None else self.horde.create_member(row)
+
+    def pop(self) -> Creature:
+        creature = self[self.length - 1]
+        del self.created[self.length - 1]
+        self.length -= 1
+        return creature
+
+
+class MappedHorde(Horde):
+    """
+    A saved horde used straight from its memory-mapped save file. Its aggregates come from the totals saved with it,
+    and a member is only created when it is looked up, by paging through the horde or picking members to cull, so
+    opening a horde of millions takes milliseconds and keeps little in memory. The file is mapped copy-on-write, so
+    culling and reputation changes work on the mapped columns without touching the file.
+
+    Adding members, sampling them by type or changing a stat other than reputation needs a growable horde with every
+    member indexed, so it first copies the columns into memory and creates the remaining members; see materialize.
+    """
+
+    def __init__(self,
+                 columns: MappedColumns,
+                 strings: list[str],
+                 totals: dict[str, int | float],
+                 reputation_counts: Counter[float],
+                 reputation_shift: ReputationShift = ReputationShift(),
+                 commander_rows: Iterable[int] = ()):
+        super().__init__(columnar=True)
+        self._columns = columns
+        self._members = LazyMembers(self, len(columns))
+        self._totals = totals
+        self._stored_reputations = reputation_counts
+        self._reputation_shift = reputation_shift
+        self.strings = strings
+        # The rows of each creature type's non-commanders, by type slot, built on the first removal
+        self._type_rows: Optional[dict[int, array]] = None
+        self._label_remap: Optional[list[int]] = None
+        self._label_remap_found = False
+        for row in commander_rows:
+            commander = self._members.created[row] = self.create_member(row, is_commander=True)
+            self._commanders[commander] = None
+
+    @property
+    def mapped(self) -> bool:
+        return isinstance(self._columns, MappedColumns)
+
+    @property
+    def mapped_columns(self) -> Optional[MappedColumns]:
+        return self._columns if self.mapped else None
+
+    def created_members(self) -> dict[int, Creature]:
+        """Members created so far, by row, while the horde is still mapped."""
+        return dict(self._members.created) if self.mapped else {}
+
+    def create_member(self, row: int, is_commander=False) -> Creature:
+        columns = self._columns
+        return self._column_member(CREATURE_TYPES[columns.creature_type[row]],
+                                   self.strings[columns.name[row]],
+                                   self.strings[columns.adjective[row]],
+                                   row,
+                                   is_commander)
+
+    def get_label_remap(self) -> Optional[list[int]]:
+        """The label table indices of the saved strings, or None if they are the same; see get_label_remap."""
+        if not self._label_remap_found:
+            columns = self._columns
+            self._label_remap = get_label_remap(self.strings, columns.name, columns.adjective)
+            self._label_remap_found = True
+        return self._label_remap
+
+    def materialize(self):
+        """Turns the horde into an ordinary columnar horde held in memory, creating every member not created yet."""
+        if not self.mapped:
+            return
+        mapped, created = self._columns, self._members.created
+        remap = self.get_label_remap()
+        columns = CreatureColumns()
+        for field, typecode in CreatureColumns.TYPECODES.items():
+            if field not in ("name", "adjective"):
+                setattr(columns, field, widen(getattr(mapped, field), typecode))
+        columns.name = remap_labels(mapped.name, remap)
+        columns.adjective = remap_labels(mapped.adjective, remap)
+        commander_rows = [c._slot for c in self._commanders]
+
+        self._columns = columns
+        self._members = []
+        self._by_type = {}
+        self._commanders = {}
+        self._type_rows = None
+        with paused_garbage_collection():
+            self._build_members(commander_rows, created)
+
+    @property
+    def members(self) -> list[Creature]:
+        self.materialize()
+        return self._members
+
+    @members.setter
+    def members(self, members: list[Creature]):
+        self.materialize()
+        Horde.members.fset(self, members)
+
+    def label_changed(self, creature: Creature, field: str, label: str):
+        self.materialize()
+        super().label_changed(creature, field, label)
+
+    def field_changed(self, field: str, old_value: int | float, new_value: int | float):
+        # The new value may not fit the saved column's type, so the columns move into memory before it is stored
+        self.materialize()
+        super().field_changed(field, old_value, new_value)
+
+    def _add_members(self, creatures: list[Creature]):
+        self.materialize()
+        super()._add_members(creatures)
+
+    def _remove_member(self, creature: Creature):
+        if not self.mapped:
+            super()._remove_member(creature)
+            return
+        # Without a per-type index of creatures, the type_slot column is kept as a live horde's index would leave it
+        columns, row = self._columns, creature._slot
+        type_rows = self.get_type_rows()
+        if columns.type_slot[row] >= 0:
+            rows = type_rows[columns.creature_type[row]]
+            last_row = rows.pop()
+            if last_row != row:
+                rows[columns.type_slot[row]] = last_row
+                columns.type_slot[last_row] = columns.type_slot[row]
+        super()._remove_member(creature)
+        # The last row moved into the removed one
+        if row < len(columns) and columns.type_slot[row] >= 0:
+            type_rows[columns.creature_type[row]][columns.type_slot[row]] = row
+
+    def get_type_rows(self) -> dict[int, array]:
+        """The rows of each creature type's non-commander members, by type index and then type slot."""
+        if self._type_rows is None:
+            columns = self._columns
+            counts = Counter(kind for kind, slot in zip(columns.creature_type, columns.type_slot) if slot >= 0)
+            self._type_rows = {kind: array("q", bytes(8 * n)) for kind, n in counts.items()}
+            for row, (kind, slot) in enumerate(zip(columns.creature_type, columns.type_slot)):
+                if slot >= 0:
+                    self._type_rows[kind][slot] = row
+        return self._type_rows
+
+    def count_members(self, creature_types: list[type]) -> int:
+        self.materialize()
+        return super().count_members(creature_types)
+
+    def sample_members(self, creature_types: list[type], k: int, rng=None) -> list[Creature]:
+        self.materialize()
+        return super().sample_members(creature_types, k, rng)
+
+    def apply_reputation_shift(self):
+        if self.reputation_shift != ReputationShift():
+            self.materialize()
+        super().apply_reputation_shift()
+
+
+def write_settlements(out: BinaryIO, settlements: SettlementRegistry, strings: StringTable):
+    class_indices = {settlement_class: index for index, settlement_class in enumerate(SETTLEMENT_CLASSES)}
+    out.write(struct.pack("<Q", len(settlements)))
+    for s in settlements:
+        militia_cleared = s.militia_generated and s.militia.size == 0
+        out.write(SETTLEMENT.pack(class_indices[type(s)], strings[s.name], strings[s.description],
+                                  s.militia_size, s.militia_seed, s.reward.food, s.reward.gold,
+                                  s.defeated, s.scouted, militia_cleared))
+
+
+def read_settlements(data: memoryview, offset: int, strings: list[str]) -> tuple[SettlementRegistry, int]:
+    (count,) = struct.unpack_from("<Q", data, offset)
+    offset += struct.calcsize("<Q")
+    settlements = []
+    for _ in range(count):
+        (class_index, name, description, militia_size, militia_seed, food, gold,
+         defeated, scouted, militia_cleared) = SETTLEMENT.unpack_from(data, offset)
+        offset += SETTLEMENT.size
+        settlements.append(SETTLEMENT_CLASSES[class_index].restore(strings[name], strings[description], militia_size,
+                                                                   militia_seed, Stash(food, gold), defeated,
+                                                                   scouted, militia_cleared))
+    return SettlementRegistry(settlements), offset
+
+
+def dump(state: dict[StateKey, Any], out: BinaryIO):
+    """Writes a snapshot of the game state to a binary stream."""
+    # Labels may add to the label table, which the string table starts with
+    labels = get_labels(state[StateKey.HORDE])
+    strings = get_string_table()
+    # Sections that refer to strings are written first, so the finished table can follow the header
+    body = io.BytesIO()
+    stash = state[StateKey.STASH]
+    body.write(CALENDAR.pack(state[StateKey.WEEK], state[StateKey.VICTORIOUS], stash.food, stash.gold))
+    write_rng(body, state[StateKey.RNG])
+    write_settlements(body, state[StateKey.SETTLEMENTS], strings)
+    write_horde(body, state[StateKey.HORDE], labels)
+
+    out.write(HEADER.pack(MAGIC, FORMAT_VERSION))
+    write_strings(out, strings.strings)
+    # The body was laid out from an 8-byte boundary, so it has to start on one
+    pad(out)
+    out.write(body.getbuffer())
+
+
+def loads(data: bytes | memoryview, mapped=False) -> dict[StateKey, Any]:
+    """
+    Rebuilds game state from a snapshot written by dump. With mapped, the horde is a MappedHorde working on data,
+    which has to stay valid and writable for as long as the horde is in use.
+    """
+    data = memoryview(data)
+    magic, version = HEADER.unpack_from(data, 0)
+    if magic != MAGIC:
+        raise ValueError("Not a Goblin Commander save file.")
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Save file format version {version} is not supported (expected {FORMAT_VERSION}).")
+
+    strings, offset = read_strings(data, HEADER.size)
+    offset += -offset % 8
+    week, victorious, food, gold = CALENDAR.unpack_from(data, offset)
+    rng, offset = read_rng(data, offset + CALENDAR.size)
+    settlements, offset = read_settlements(data, offset, strings)
+    horde, commander, offset = read_horde(data, offset, strings, mapped)
+
+    return {StateKey.COMMANDER: commander,
+            StateKey.HORDE: horde,
+            StateKey.SETTLEMENTS: settlements,
+            StateKey.STASH: Stash(food, gold),
+            StateKey.WEEK: week,
+            StateKey.VICTORIOUS: victorious,
+            StateKey.RNG: rng}
+
+
+def get_save_path() -> str:
+    """Location of the save file, under GOBLINCOMMANDER_DATA_DIR or the user's data directory."""
+    data_dir = os.environ.get("GOBLINCOMMANDER_DATA_DIR")
+    if not data_dir:
+        user_data_dir = os.environ.get("XDG_DATA_HOME") or os.path.expanduser(os.path.join("~", ".local", "share"))
+        data_dir = os.path.join(user_data_dir, "goblincommander")
+    return os.path.join(data_dir, "campaign.sav")
+
+
+def save(state: dict[StateKey, Any], path: str | None = None):
+    """Saves the game state, replacing any earlier save only once the new one is completely written."""
+    path = path or get_save_path()
+    if os.name == "nt" and isinstance(state[StateKey.HORDE], MappedHorde):
+        # Windows won't replace a file that is still mapped
+        state[StateKey.HORDE].materialize()
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    temporary_path = f"{path}.{os.getpid()}.tmp"
+    with open(temporary_path, "wb") as save_file:
+        dump(state, save_file)
+    os.replace(temporary_path, path)
+
+
+def load(path: str | None = None, mapped=True) -> dict[StateKey, Any]:
+    """
+    Loads a saved game. The horde is mapped from the file by default, so that only what is used of it is ever read;
+    see MappedHorde. Big-endian platforms always read a copy.
+    """
+    with open(path or get_save_path(), "rb") as save_file:
+        if not mapped or sys.byteorder == "big":
+            return loads(save_file.read())
+        return loads(mmap.mmap(save_file.fileno(), 0, access=mmap.ACCESS_COPY), mapped=True)
@@ -1,18 +1,24 @@
-import json
-from importlib.resources import files
-from random import choice, randint
+import random
+from bisect import bisect_left, bisect_right, insort
+from functools import cache
+from itertools import accumulate
+from typing import Iterable, NamedTuple, Optional, Type
 
-import goblincommander.resources
-from goblincommander import creature_groups
+from goblincommander import creature_groups, resources
 from goblincommander.creatures import Human
+from goblincommander.resources import LazyResource
 from goblincommander.stash import Stash
 
 
 class Settlement:
     """Model representing a human settlement"""
 
-    settlement_config: dict[str, dict] = json.loads(
-        files(goblincommander.resources).joinpath('settlement_data.json').read_text())
+    # Settlement descriptive data, loaded on first use
+    settlement_config: dict[str, dict] = LazyResource("settlement_data")
+
+    # Garrisons at least this large, which only Gleaming Castles reach, are drawn as a StatisticalMilitia, whose Humans
+    # only exist once absorbed
+    STATISTICAL_MILITIA_SIZE = 25
 
     def __init__(self, settlement_type: str,
                  minimum_militia_size: int,
@@ -21,12 +27,15 @@ class Settlement:
                  maximum_food_reward_multiplier: int,
                  minimum_gold_reward_multiplier: int,
                  maximum_gold_reward_multiplier: int,
-                 reputation: float):
-        self.name = choice(Settlement.settlement_config[settlement_type]["name_options"])
-        self.description = choice(Settlement.settlement_config[settlement_type]["description_options"])
+                 reputation: float,
+                 rng=None):
+        rng = rng or random
+        self.name = rng.choice(Settlement.settlement_config[settlement_type]["name_options"])
+        self.description = rng.choice(Settlement.settlement_config[settlement_type]["description_options"])
         self.settlement_type = settlement_type
-        self.defeated = False
-        self.scouted = False
+        self._registry: Optional[SettlementRegistry] = None
+        self._defeated = False
+        self._scouted = False
 
         self.minimum_militia_size = minimum_militia_size
         self.maximum_militia_size = maximum_militia_size
@@ -36,29 +45,100 @@ class Settlement:
         self.minimum_gold_reward_multiplier = minimum_gold_reward_multiplier
         self.maximum_gold_reward_multiplier = maximum_gold_reward_multiplier
 
-        self.militia = creature_groups.generate_militia(minimum_size=minimum_militia_size,
-                                                        maximum_size=maximum_militia_size)
-        self.reward = Stash(food=randint(minimum_food_reward_multiplier,
-                                         maximum_food_reward_multiplier) * len(self.militia.members),
-                            gold=randint(minimum_gold_reward_multiplier,
-                                         maximum_gold_reward_multiplier) * len(self.militia.members))
+        # Only the militia's size and seed are drawn here. Its Humans are generated from the seed on first access, so
+        # they come out the same whenever that happens and settlements nobody looks at never build them.
+        self.militia_size = rng.randint(minimum_militia_size, maximum_militia_size)
+        self.militia_seed = rng.getrandbits(64)
+        self._militia: Optional[creature_groups.Militia] = None
+
+        self.reward = Stash(food=rng.randint(minimum_food_reward_multiplier,
+                                             maximum_food_reward_multiplier) * self.militia_size,
+                            gold=rng.randint(minimum_gold_reward_multiplier,
+                                             maximum_gold_reward_multiplier) * self.militia_size)
 
         self.reputation = reputation
 
-        self.expected_beef = sum([Human.MINIMUM_BEEF, Human.MAXIMUM_BEEF]) / 2 * len(self.militia.members)
-        self.expected_food = sum([self.minimum_food_reward_multiplier, self.maximum_food_reward_multiplier]) / 2 * len(
-            self.militia.members)
-        self.expected_gold = sum([self.minimum_gold_reward_multiplier, self.maximum_gold_reward_multiplier]) / 2 * len(
-            self.militia.members)
+        self._update_expectations()
+
+    def _update_expectations(self):
+        self.expected_beef = sum([Human.MINIMUM_BEEF, Human.MAXIMUM_BEEF]) / 2 * self.militia_size
+        self.expected_food = sum([self.minimum_food_reward_multiplier, self.maximum_food_reward_multiplier]) / 2 * \
+            self.militia_size
+        self.expected_gold = sum([self.minimum_gold_reward_multiplier, self.maximum_gold_reward_multiplier]) / 2 * \
+            self.militia_size
+
+    @classmethod
+    def restore(cls,
+                name: str,
+                description: str,
+                militia_size: int,
+                militia_seed: int,
+                reward: Stash,
+                defeated=False,
+                scouted=False,
+                militia_cleared=False) -> "Settlement":
+        """
+        Rebuilds a saved settlement of this type from the values drawn when it was created. Its militia is generated
+        from the seed again when needed, or left empty if it had already been absorbed or wiped out.
+        """
+        settlement = cls(rng=random.Random(militia_seed))
+        settlement.name = name
+        settlement.description = description
+        settlement.militia_size = militia_size
+        settlement.militia_seed = militia_seed
+        settlement.reward = reward
+        settlement._update_expectations()
+        settlement._defeated = defeated
+        settlement._scouted = scouted
+        if militia_cleared:
+            settlement._militia = creature_groups.Militia()
+        return settlement
 
     def __str__(self):
         return f"{self.name}, a {self.settlement_type}."
 
+    @property
+    def militia(self) -> creature_groups.Militia:
+        """The settlement's defenders, generated from the settlement's militia seed the first time they are needed."""
+        if self._militia is None:
+            statistical = self.militia_size >= Settlement.STATISTICAL_MILITIA_SIZE
+            self._militia = creature_groups.generate_militia(minimum_size=self.militia_size,
+                                                             maximum_size=self.militia_size,
+                                                             rng=random.Random(self.militia_seed),
+                                                             statistical=statistical)
+        return self._militia
+
+    @property
+    def militia_generated(self) -> bool:
+        return self._militia is not None
+
+    @property
+    def defeated(self) -> bool:
+        return self._defeated
+
+    @defeated.setter
+    def defeated(self, value: bool):
+        if value != self._defeated:
+            self._defeated = value
+            if self._registry is not None:
+                self._registry.settlement_changed(self)
+
+    @property
+    def scouted(self) -> bool:
+        return self._scouted
+
+    @scouted.setter
+    def scouted(self, value: bool):
+        if value != self._scouted:
+            self._scouted = value
+            if self._registry is not None:
+                self._registry.settlement_changed(self)
+
 
 class NomadEncampment(Settlement):
     """A small camp of roaming humans."""
 
-    def __init__(self):
+    def __init__(self, rng=None):
         super().__init__(settlement_type="nomad encampment",
                          minimum_militia_size=2,
                          maximum_militia_size=4,
@@ -66,13 +146,14 @@ class NomadEncampment(Settlement):
                          maximum_food_reward_multiplier=15,
                          minimum_gold_reward_multiplier=1,
                          maximum_gold_reward_multiplier=5,
-                         reputation=0.05)
+                         reputation=0.05,
+                         rng=rng)
 
 
 class QuietVillage(Settlement):
     """A quiet, picturesque human village."""
 
-    def __init__(self):
+    def __init__(self, rng=None):
         super().__init__(settlement_type="quiet village",
                          minimum_militia_size=4,
                          maximum_militia_size=10,
@@ -80,13 +161,14 @@ class QuietVillage(Settlement):
                          maximum_food_reward_multiplier=24,
                          minimum_gold_reward_multiplier=3,
                          maximum_gold_reward_multiplier=7,
-                         reputation=0.1)
+                         reputation=0.1,
+                         rng=rng)
 
 
 class BusyTown(Settlement):
     """A busy merchant town just waiting to be raided."""
 
-    def __init__(self):
+    def __init__(self, rng=None):
         super().__init__(settlement_type="busy town",
                          minimum_militia_size=8,
                          maximum_militia_size=16,
@@ -94,13 +176,14 @@ class BusyTown(Settlement):
                          maximum_food_reward_multiplier=35,
                          minimum_gold_reward_multiplier=4,
                          maximum_gold_reward_multiplier=9,
-                         reputation=0.15)
+                         reputation=0.15,
+                         rng=rng)
 
 
 class BustlingCity(Settlement):
     """A bustling city in the shadow of the capital."""
 
-    def __init__(self):
+    def __init__(self, rng=None):
         super().__init__(settlement_type="bustling city",
                          minimum_militia_size=12,
                          maximum_militia_size=22,
@@ -108,13 +191,14 @@ class BustlingCity(Settlement):
                          maximum_food_reward_multiplier=40,
                          minimum_gold_reward_multiplier=6,
                          maximum_gold_reward_multiplier=10,
-                         reputation=0.25)
+                         reputation=0.25,
+                         rng=rng)
 
 
 class GleamingCastle(Settlement):
     """A bright castle bristling with defenses."""
 
-    def __init__(self):
+    def __init__(self, rng=None):
         super().__init__(settlement_type="gleaming castle",
                          minimum_militia_size=25,
                          maximum_militia_size=50,
@@ -122,4 +206,172 @@ class GleamingCastle(Settlement):
                          maximum_food_reward_multiplier=70,
                          minimum_gold_reward_multiplier=10,
                          maximum_gold_reward_multiplier=20,
-                         reputation=0.5)
+                         reputation=0.5,
+                         rng=rng)
+
+
+# Settlement classes by the settlement type name used in the resource data
+SETTLEMENT_TYPES: dict[str, Type[Settlement]] = {
+    "nomad encampment": NomadEncampment,
+    "quiet village": QuietVillage,
+    "busy town": BusyTown,
+    "bustling city": BustlingCity,
+    "gleaming castle": GleamingCastle,
+}
+
+
+class SpawnBand(NamedTuple):
+    """
+    Settlements that can appear before a given week (or from then on, for None). A band either draws types by weight
+    or always spawns the same roster.
+    """
+    until_week: Optional[int]
+    types: tuple[Type[Settlement], ...] = ()
+    cum_weights: tuple[int, ...] = ()
+    roster: tuple[Type[Settlement], ...] = ()
+
+
+class SettlementFactory:
+    """
+    Week-banded spawn table for settlements. The settlement class is picked from the band first and only that class is
+    built, so no settlement, and no militia, is generated just to be thrown away.
+    """
+
+    def __init__(self, bands: list[SpawnBand]):
+        self.bands = bands
+        self._limits = [band.until_week for band in bands if band.until_week is not None]
+
+    @classmethod
+    def from_config(cls, config: list[dict]) -> "SettlementFactory":
+        bands = []
+        for band in config:
+            weights = band.get("weights", {})
+            bands.append(SpawnBand(until_week=band["until_week"],
+                                   types=tuple([SETTLEMENT_TYPES[name] for name in weights]),
+                                   cum_weights=tuple(accumulate(weights.values())),
+                                   roster=tuple([SETTLEMENT_TYPES[name] for name in band.get("roster", [])])))
+        return cls(bands)
+
+    def band(self, week_number: int) -> SpawnBand:
+        return self.bands[bisect_right(self._limits, week_number)]
+
+    def pick_types(self, week_number: int, k: int = 1, rng=None) -> list[Type[Settlement]]:
+        """Picks k settlement classes for the week, or the band's roster if it has one."""
+        band = self.band(week_number)
+        if band.roster:
+            return list(band.roster)
+        return (rng or random).choices(band.types, cum_weights=band.cum_weights, k=k)
+
+    def spawn(self, week_number: int, k: int = 1, rng=None) -> list[Settlement]:
+        """Builds k settlements for the week, or the band's roster if it has one."""
+        return [settlement_type(rng) for settlement_type in self.pick_types(week_number, k, rng)]
+
+
+@cache
+def get_settlement_factory(table: str) -> SettlementFactory:
+    """Returns the factory for one of the spawn tables in the settlement spawn data: starting, minimum or random."""
+    return SettlementFactory.from_config(resources.load("settlement_spawn_data")[table])
+
+
+class SettlementRegistry:
+    """
+    The settlements of a game, indexed by state.
+
+    Settlements report every change to their defeated and scouted flags to the registry holding them, so the active,
+    defeated and scoutable indexes and the by-expected-beef views are kept up to date incrementally and queries never
+    walk the settlements that have already been conquered. Iterating the registry yields every settlement in the order
+    it was added.
+    """
+
+    def __init__(self, settlements: Iterable[Settlement] = ()):
+        # Insertion order of every settlement, which also breaks ties in the sorted views
+        self._order: dict[Settlement, int] = {}
+        self._active: dict[Settlement, None] = {}
+        self._defeated: dict[Settlement, None] = {}
+        self._scoutable: dict[Settlement, None] = {}
+        self._by_type: dict[type, list[Settlement]] = {}
+        # Active and scoutable settlements, kept sorted by (-expected_beef, insertion order, settlement)
+        self._active_by_beef: list[tuple] = []
+        self._scoutable_by_beef: list[tuple] = []
+        self.extend(settlements)
+
+    def __iter__(self):
+        return iter(self._order)
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def position(self, settlement: Settlement) -> int:
+        """The settlement's place in the order settlements were added, which never changes."""
+        return self._order[settlement]
+
+    def append(self, settlement: Settlement):
+        if settlement._registry is not None:
+            raise ValueError(f"{settlement.name} is already in a settlement registry.")
+        settlement._registry = self
+        self._order[settlement] = len(self._order)
+        self._by_type.setdefault(type(settlement), []).append(settlement)
+        self._index(settlement)
+
+    def extend(self, settlements: Iterable[Settlement]):
+        for settlement in settlements:
+            self.append(settlement)
+
+    def settlement_changed(self, settlement: Settlement):
+        """Moves a settlement between indexes after its defeated or scouted flag changed."""
+        self._index(settlement)
+
+    def _index(self, settlement: Settlement):
+        active = not settlement.defeated
+        scoutable = active and not settlement.scouted
+        self._place(settlement, active, self._active, self._active_by_beef)
+        self._place(settlement, scoutable, self._scoutable, self._scoutable_by_beef)
+        if active:
+            self._defeated.pop(settlement, None)
+        else:
+            self._defeated[settlement] = None
+
+    def _place(self, settlement: Settlement, member: bool, index: dict[Settlement, None], by_beef: list[tuple]):
+        if member == (settlement in index):
+            return
+        key = (-settlement.expected_beef, self._order[settlement])
+        if member:
+            index[settlement] = None
+            insort(by_beef, key + (settlement,))
+        else:
+            del index[settlement]
+            del by_beef[bisect_left(by_beef, key)]
+
+    @property
+    def active_count(self) -> int:
+        return len(self._active)
+
+    @property
+    def defeated_count(self) -> int:
+        return len(self._defeated)
+
+    def active(self) -> list[Settlement]:
+        """Undefeated settlements, in the order they were added."""
+        return list(self._active)
+
+    def defeated(self) -> list[Settlement]:
+        return list(self._defeated)
+
+    def scoutable(self) -> list[Settlement]:
+        """Undefeated settlements that have not been scouted, in the order they were added."""
+        return list(self._scoutable)
+
+    def of_type(self, settlement_type: Type[Settlement]) -> list[Settlement]:
+        """Every settlement of exactly the given type, defeated or not."""
+        return list(self._by_type.get(settlement_type, []))
+
+    def has_type(self, settlement_type: Type[Settlement]) -> bool:
+        return bool(self._by_type.get(settlement_type))
+
+    def active_by_expected_beef(self) -> list[Settlement]:
+        """Undefeated settlements, toughest first. Ties keep the order the settlements were added."""
+        return [entry[-1] for entry in self._active_by_beef]
+
+    def scoutable_by_expected_beef(self) -> list[Settlement]:
+        """Scoutable settlements, toughest first. Ties keep the order the settlements were added."""
+        return [entry[-1] for entry in self._scoutable_by_beef]
@@ -0,0 +1,192 @@
+import os
+from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from enum import Enum
+from functools import partial
+from random import Random
+from statistics import mean
+from typing import Any, NamedTuple, Optional
+
+from goblincommander import battle, main
+from goblincommander.creatures import GoblinCommander
+from goblincommander.main import Screen, StateKey
+from goblincommander.rng import RandomStream
+from goblincommander.settlements import Settlement
+
+
+class Action(str, Enum):
+    RAID = "raid"
+    SCOUT = "scout"
+    RECRUIT_GOBLINS = "recruit_goblins"
+    RECRUIT_OGRES = "recruit_ogres"
+    RECRUIT_ORCS = "recruit_orcs"
+    EXPLORE = "explore"
+    CULL_HORDE = "cull_horde"
+
+
+# Weeks each action needs the stash to cover before it can be taken
+ACTION_WEEKS = {
+    Action.RAID: 1,
+    Action.SCOUT: 1,
+    Action.RECRUIT_GOBLINS: 2,
+    Action.RECRUIT_OGRES: 2,
+    Action.RECRUIT_ORCS: 4,
+    Action.EXPLORE: 1,
+    Action.CULL_HORDE: 0,
+}
+
+
+class Policy(ABC):
+    """
+    Decides a headless game's moves in place of the menus. Subclasses implement choose_action; simulations pickle
+    the policy to each worker process, so it should hold only plain configuration.
+    """
+
+    commander_title = "Skullcracker"
+
+    @abstractmethod
+    def choose_action(self, state: dict[StateKey, Any], rng: Random) -> tuple[Action, Optional[Settlement]]:
+        """
+        Returns the next action and, for raids and scouting, the target settlement. Any random draws the policy needs
+        come from rng, a stream of the policy's own, so they never change the game's draws.
+        """
+
+    def accept_surrender(self, settlement: Settlement, commander: GoblinCommander) -> bool:
+        return True
+
+
+class GreedyPolicy(Policy):
+    """Raids the active settlement most likely to fall once its odds are good enough, and recruits goblins otherwise."""
+
+    def __init__(self, minimum_win_chance: float = 0.6, commander_title: str = "Skullcracker"):
+        self.minimum_win_chance = minimum_win_chance
+        self.commander_title = commander_title
+
+    @staticmethod
+    def win_chance(settlement: Settlement, horde_summary, rng: Random) -> float:
+        if settlement.scouted:
+            outcome = battle.resolve_raid(horde_summary, settlement.militia.summarize(), scouted=True, rng=rng)
+            return 1.0 if outcome.victory else 0.0
+        return battle.win_probability(horde_summary, settlement.militia_size, settlement.militia_size)
+
+    def choose_action(self, state: dict[StateKey, Any], rng: Random) -> tuple[Action, Optional[Settlement]]:
+        horde_summary = state[StateKey.HORDE].summarize()
+        active_settlements = state[StateKey.SETTLEMENTS].active()
+        if not active_settlements:
+            return Action.EXPLORE, None
+
+        chances = [(self.win_chance(s, horde_summary, rng), s.reward.food + s.reward.gold, s)
+                   for s in active_settlements]
+        chance, _, target = max(chances, key=lambda c: c[:2])
+        if chance >= self.minimum_win_chance or not can_afford(state, ACTION_WEEKS[Action.RECRUIT_GOBLINS]):
+            return Action.RAID, target
+        return Action.RECRUIT_GOBLINS, None
+
+
+class GameResult(NamedTuple):
+    victory: bool
+    weeks: int
+    peak_horde_size: int
+    settlements_defeated: int
+
+
+class SimulationSummary(NamedTuple):
+    games: int
+    victories: int
+    loss_rate: float
+    mean_weeks_to_victory: Optional[float]
+    mean_peak_horde_size: float
+    max_peak_horde_size: int
+
+
+def can_afford(state: dict[StateKey, Any], weeks: int) -> bool:
+    upkeep = state[StateKey.HORDE].get_upkeep()
+    stash = state[StateKey.STASH]
+    return upkeep.food * weeks <= stash.food and upkeep.gold * weeks <= stash.gold
+
+
+def take_action(action: Action, target: Optional[Settlement], policy: Policy) -> Screen:
+    """Carries out one turn through the same game functions the menus call, returning the screen the game moves to."""
+    match action:
+        case Action.RAID:
+            return main.take_turn(main.raid, target, policy.accept_surrender)
+        case Action.SCOUT:
+            return main.take_turn(main.scout, target)
+        case Action.RECRUIT_GOBLINS:
+            return main.take_turn(main.recruit_goblins_fn)
+        case Action.RECRUIT_OGRES:
+            return main.take_turn(main.recruit_ogres_fn)
+        case Action.RECRUIT_ORCS:
+            return main.take_turn(main.recruit_orcs_fn)
+        case Action.EXPLORE:
+            return main.take_turn(main.explore_fn)
+        case Action.CULL_HORDE:
+            return main.take_turn(main.cull_horde_fn)
+
+
+def play_game(rng: RandomStream | int, policy: Policy, max_weeks: int = 200, max_turns: int = 1000) -> GameResult:
+    """
+    Plays one complete game without prompts or output, with the policy choosing every move and every random draw
+    coming from rng, or from a stream seeded with it. The policy draws from a child of that stream, so its draws are
+    reproducible too but never shift the game's. The game is lost when the stash can no longer cover a week of
+    upkeep, or when it runs past max_weeks.
+    """
+    if isinstance(rng, int):
+        rng = RandomStream(rng)
+    policy_rng = rng.spawn(1)[0]
+    state = main.state
+    with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+        main.start_game(GoblinCommander("Simulated", policy.commander_title), rng)
+        peak_horde_size = len(state[StateKey.HORDE].members)
+
+        for _ in range(max_turns):
+            if state[StateKey.WEEK] > max_weeks or not can_afford(state, 1):
+                break
+            action, target = policy.choose_action(state, policy_rng)
+            screen = take_action(action, target, policy)
+            peak_horde_size = max(peak_horde_size, len(state[StateKey.HORDE].members))
+            if screen is not Screen.GAME_MENU:
+                break
+
+    return GameResult(victory=state[StateKey.VICTORIOUS],
+                      weeks=state[StateKey.WEEK],
+                      peak_horde_size=peak_horde_size,
+                      settlements_defeated=state[StateKey.SETTLEMENTS].defeated_count)
+
+
+def summarize_results(results: list[GameResult]) -> SimulationSummary:
+    victories = [r for r in results if r.victory]
+    return SimulationSummary(games=len(results),
+                             victories=len(victories),
+                             loss_rate=1 - len(victories) / len(results),
+                             mean_weeks_to_victory=mean(r.weeks for r in victories) if victories else None,
+                             mean_peak_horde_size=mean(r.peak_horde_size for r in results),
+                             max_peak_horde_size=max(r.peak_horde_size for r in results))
+
+
+def simulate_games(n: int,
+                   policy: Optional[Policy] = None,
+                   seed: int = 0,
+                   workers: Optional[int] = None,
+                   max_weeks: int = 200) -> tuple[SimulationSummary, list[GameResult]]:
+    """
+    Plays n independent games across a pool of worker processes. Game i draws from child stream i of a RandomStream
+    seeded with seed, so results are reproducible whatever the number of workers. Each worker has its own copy of the
+    game state, so games never share anything but the policy's configuration. Results come back in game order along
+    with their summary.
+    """
+    policy = policy or GreedyPolicy()
+    streams = RandomStream(seed).spawn(n)
+    play = partial(play_game, policy=policy, max_weeks=max_weeks)
+
+    if workers == 1:
+        results = list(map(play, streams))
+    else:
+        workers = workers or os.cpu_count() or 1
+        # Hand out streams in chunks so the per-task pickling overhead stays small next to the games themselves
+        chunksize = max(1, n // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(play, streams, chunksize=chunksize))
+
+    return summarize_results(results), results
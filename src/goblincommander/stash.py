@@ -4,6 +4,8 @@ from __future__ import annotations
 class Stash:
     """Represents a collection of resources."""
 
+    __slots__ = ("food", "gold")
+
     def __init__(self, food: int, gold: int):
         self.food = food
         self.gold = gold
@@ -1,44 +1,125 @@
+from __future__ import annotations
+
+from typing import Type
+
+from goblincommander.columns import ColumnView
+
+
 class Stat:
-    """Base creature stat class"""
+    """
+    Base creature stat class
+
+    Stat metadata is shared on each subclass. An instance is only a lightweight view of one value held by a Stats.
+    """
+
+    __slots__ = ("_stats",)
 
-    def __init__(self, name: str, short_name: str, description: str, value: int | float):
-        self.name = name
-        self.short_name = short_name
-        self.description = description
-        self.value = value
+    name: str = ""
+    short_name: str = ""
+    description: str = ""
+    field: str = ""
+
+    def __init__(self, stats: Stats):
+        self._stats = stats
+
+    @property
+    def value(self) -> int | float:
+        return self._stats.get(self.field)
+
+    @value.setter
+    def value(self, value: int | float):
+        self._stats.set(self.field, value)
 
 
 class BeefStat(Stat):
     """Beef creature stat"""
 
-    def __init__(self, value: int):
-        super().__init__("Beef", "BF", "A creature's strength and hardiness.", value)
+    __slots__ = ()
+
+    name = "Beef"
+    short_name = "BF"
+    description = "A creature's strength and hardiness."
+    field = "beef"
 
 
 class CunningStat(Stat):
     """Cunning creature stat"""
 
-    def __init__(self, value: int):
-        super().__init__("Cunning", "CUN", "A creature's mental sharpness and aptitude for conniving.", value)
+    __slots__ = ()
+
+    name = "Cunning"
+    short_name = "CUN"
+    description = "A creature's mental sharpness and aptitude for conniving."
+    field = "cunning"
 
 
 class QuicknessStat(Stat):
     """Quickness creature stat"""
 
-    def __init__(self, value: int):
-        super().__init__("Quickness", "QCK", "A creature's physical speed and circus capabilities.", value)
+    __slots__ = ()
+
+    name = "Quickness"
+    short_name = "QCK"
+    description = "A creature's physical speed and circus capabilities."
+    field = "quickness"
 
 
 class ReputationStat(Stat):
     """Reputation creature stat"""
 
-    def __init__(self, value: float):
-        super().__init__("Reputation", "REP", "A creature's status among goblins and other creatures.", value)
+    __slots__ = ()
 
+    name = "Reputation"
+    short_name = "REP"
+    description = "A creature's status among goblins and other creatures."
+    field = "reputation"
+
+
+class StatDescriptor:
+    """
+    Class-level accessor for one stat on Stats. Reading it from an instance returns a view of that instance's value;
+    reading it from the Stats class returns the Stat type and its metadata.
+    """
+
+    def __init__(self, stat_type: Type[Stat]):
+        self.stat_type = stat_type
+
+    def __get__(self, stats: Stats | None, owner=None) -> Stat | Type[Stat]:
+        if stats is None:
+            return self.stat_type
+        return self.stat_type(stats)
+
+
+class Stats(ColumnView):
+    """A creature's stat values. Each Stat reads its value through here, so the values can live in group columns."""
+
+    __slots__ = ("_beef", "_cunning", "_quickness", "_reputation")
+
+    FIELDS = ("beef", "cunning", "quickness", "reputation")
+
+    beef = StatDescriptor(BeefStat)
+    cunning = StatDescriptor(CunningStat)
+    quickness = StatDescriptor(QuicknessStat)
+    reputation = StatDescriptor(ReputationStat)
 
-class Stats:
     def __init__(self, beef: int, cunning: int, quickness: int, reputation: float):
-        self.beef = BeefStat(beef)
-        self.cunning = CunningStat(cunning)
-        self.quickness = QuicknessStat(quickness)
-        self.reputation = ReputationStat(reputation)
+        super().__init__()
+        self._beef = beef
+        self._cunning = cunning
+        self._quickness = quickness
+        self._reputation = reputation
+
+    # While attached, the stored reputation is relative to the owning group's reputation shift, which is applied on
+    # read. See CreatureGroup.shift_reputation.
+
+    def get(self, field: str) -> int | float:
+        value = self.load(field)
+        if field == "reputation" and self._owner is not None:
+            return self._owner.reputation_shift.apply(value)
+        return value
+
+    def set(self, field: str, value: int | float):
+        if field == "reputation" and self._owner is not None:
+            self._owner.reputation_written(self, value)
+        else:
+            super().set(field, value)
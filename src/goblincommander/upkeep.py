@@ -1,6 +1,30 @@
-class Upkeep:
+from goblincommander.columns import ColumnView
+
+
+class Upkeep(ColumnView):
     """Weekly value to keep a creature happy, healthy, and in your horde"""
 
+    __slots__ = ("_food", "_gold")
+
+    FIELDS = ("food", "gold")
+
     def __init__(self, food: int, gold: int):
-        self.food = food
-        self.gold = gold
+        super().__init__()
+        self._food = food
+        self._gold = gold
+
+    @property
+    def food(self) -> int:
+        return self.get("food")
+
+    @food.setter
+    def food(self, value: int):
+        self.set("food", value)
+
+    @property
+    def gold(self) -> int:
+        return self.get("gold")
+
+    @gold.setter
+    def gold(self, value: int):
+        self.set("gold", value)
@@ -0,0 +1,50 @@
+from itertools import product
+from math import isclose
+
+from goblincommander.battle import ModifierKind, resolve_raid, surrender_offered, win_probability
+from goblincommander.creature_groups import GroupSummary
+from goblincommander.creatures import Human
+
+
+def test_fast_clever_horde_wins():
+    horde = GroupSummary(size=10, total_beef=30, total_cunning=80, total_quickness=60, total_reputation=20.0)
+    militia = GroupSummary(size=10, total_beef=30, total_cunning=50, total_quickness=30, total_reputation=20.0)
+
+    outcome = resolve_raid(horde, militia, scouted=False)
+
+    assert [m.kind for m in outcome.modifiers] == [ModifierKind.AMBUSHED, ModifierKind.CUNNING_EDGE]
+    assert outcome.militia_beef == 27.0
+    assert outcome.horde_beef == 33.0
+    assert outcome.victory
+    assert outcome.casualties == 0
+
+
+def test_famous_horde_demoralizes_and_may_be_offered_surrender():
+    horde = GroupSummary(size=2, total_beef=2, total_cunning=10, total_quickness=2, total_reputation=9.5)
+    militia = GroupSummary(size=2, total_beef=20, total_cunning=16, total_quickness=12, total_reputation=2.0)
+
+    assert surrender_offered(horde, militia)
+    outcome = resolve_raid(horde, militia, scouted=True)
+
+    assert [m.kind for m in outcome.modifiers] == [ModifierKind.DEMORALIZED, ModifierKind.SCOUTED_RALLY,
+                                                   ModifierKind.SCOUTED_EDGE]
+    assert not outcome.victory
+    assert 3 <= outcome.casualties <= 5
+
+
+def test_win_probability_matches_exhaustive_enumeration():
+    horde = GroupSummary(size=3, total_beef=7, total_cunning=18, total_quickness=10, total_reputation=6.0)
+    humans = list(product(range(Human.MINIMUM_BEEF, Human.MAXIMUM_BEEF + 1),
+                          range(Human.MINIMUM_CUNNING, Human.MAXIMUM_CUNNING + 1),
+                          range(Human.MINIMUM_QUICKNESS, Human.MAXIMUM_QUICKNESS + 1)))
+
+    def exact(militia_size: int) -> float:
+        wins = 0
+        militias = list(product(humans, repeat=militia_size))
+        for militia in militias:
+            beef, cunning, quickness = (sum(values) for values in zip(*militia))
+            summary = GroupSummary(militia_size, beef, cunning, quickness, 0.0)
+            wins += resolve_raid(horde, summary, scouted=False).victory
+        return wins / len(militias)
+
+    assert isclose(win_probability(horde, 1, 2), (exact(1) + exact(2)) / 2)
@@ -0,0 +1,16 @@
+import pytest
+
+from goblincommander.creature_groups import CreatureGroup
+
+
+@pytest.fixture(autouse=True)
+def check_aggregates(monkeypatch):
+    """Verifies every running aggregate against a full recompute while tests run."""
+    monkeypatch.setattr(CreatureGroup, "check_aggregates", True)
+
+
+@pytest.fixture(autouse=True)
+def user_dirs(monkeypatch, tmp_path):
+    """Keeps the banner cache and save files out of the user's own directories while tests run."""
+    monkeypatch.setenv("GOBLINCOMMANDER_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setenv("GOBLINCOMMANDER_DATA_DIR", str(tmp_path / "data"))
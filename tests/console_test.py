@@ -0,0 +1,68 @@
+import sys
+
+from goblincommander import console
+
+
+class RecordingTerminal:
+    def __init__(self):
+        self.writes = []
+
+    def write(self, text: str):
+        self.writes.append(text)
+
+    def flush(self):
+        pass
+
+    def isatty(self) -> bool:
+        return True
+
+
+def use_terminal(monkeypatch):
+    """Puts a recording 80x24 ANSI terminal in place of stdout."""
+    terminal = RecordingTerminal()
+    monkeypatch.setattr(sys, "stdout", terminal)
+    monkeypatch.setattr(console, "supports_ansi", lambda: True)
+    monkeypatch.setenv("COLUMNS", "80")
+    monkeypatch.setenv("LINES", "24")
+    return terminal
+
+
+def test_a_screen_is_written_in_one_write_flushed_early_for_prompts(monkeypatch):
+    terminal = use_terminal(monkeypatch)
+    with console.buffered_output():
+        console.print_header("recruit")
+        print("Seems no one showed up today.")
+        with console.direct_output():
+            assert sys.stdout is terminal
+            print("prompt")
+        print("Week 2")
+
+    assert sys.stdout is terminal
+    assert len(terminal.writes[0].split("\n")) == 3
+    assert terminal.writes[0].startswith(console.ANSI_CLEAR)
+    assert terminal.writes[1:] == ["prompt", "\n", "Week 2\n"]
+
+
+def test_screen_model_rewrites_only_changed_rows(monkeypatch):
+    terminal = use_terminal(monkeypatch)
+    screen = console.ScreenModel(top=3)
+    screen.render(["Week 1", "100 food", "20 gold"])
+    assert terminal.writes[-1] == "\033[3;1HWeek 1\033[K\033[4;1H100 food\033[K\033[5;1H20 gold\033[K\033[6;1H\033[J"
+
+    screen.render(["Week 2", "100 food"])
+    assert terminal.writes[-1] == "\033[3;1HWeek 2\033[K\033[5;1H\033[J"
+
+
+def test_status_stays_pinned_and_updates_in_place(monkeypatch):
+    terminal = use_terminal(monkeypatch)
+    console.show_status(["Week 1", "100 food"])
+    assert "\033[3r" in terminal.writes[-1]
+    assert console.body_top() == 3
+
+    console.clear()
+    assert terminal.writes[-1] == "\033[3;1H\033[J"
+    console.show_status(["Week 2", "100 food"])
+    assert terminal.writes[-1] == "\0337\033[1;1HWeek 2\033[K\0338"
+
+    console.hide_status()
+    assert console.body_top() == 1
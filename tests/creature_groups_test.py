@@ -0,0 +1,170 @@
+from bisect import bisect_right
+from collections import Counter
+from math import isclose, sqrt
+from random import Random
+
+from fixed_random import fixed_random
+from goblincommander.creature_groups import Horde, ReputationShift, StatisticalMilitia, generate_horde, generate_militia
+from goblincommander.creatures import Goblin, GoblinCommander, Ogre, REPUTATION_STEPS
+
+
+@fixed_random(42)
+def test_columnar_horde_matches_list_horde():
+    list_horde = generate_horde(50, 50)
+    expected = [list_horde.get_total_beef(), list_horde.get_total_cunning(), list_horde.get_avg_quickness(),
+                list_horde.get_total_reputation(), list_horde.get_upkeep().food]
+
+    members = list_horde.members
+    list_horde.members = []
+    columnar_horde = Horde(columnar=True)
+    columnar_horde.members = members
+
+    assert [columnar_horde.get_total_beef(), columnar_horde.get_total_cunning(), columnar_horde.get_avg_quickness(),
+            columnar_horde.get_total_reputation(), columnar_horde.get_upkeep().food] == expected
+
+
+@fixed_random(42)
+def test_columnar_members_are_views_over_columns():
+    commander = GoblinCommander("Grub", "Swift")
+    horde = generate_horde(5, 5, commander=commander, columnar=True)
+    total_beef = horde.get_total_beef()
+
+    commander.stats.beef.value += 10
+    assert horde.get_total_beef() == total_beef + 10
+
+    ogre = Ogre()
+    horde.bolster([ogre])
+    horde.cull([commander])
+    assert horde.get_total_beef() == total_beef - 3 + ogre.stats.beef.value
+    assert commander.stats.beef.value == 13
+
+
+@fixed_random(7)
+def test_running_totals_follow_membership_and_stat_changes():
+    horde = generate_horde(20, 20)
+    horde.get_total_beef()
+
+    horde.bolster([Ogre(), Ogre()])
+    horde.cull(horde.members[:5])
+    for creature in horde.members:
+        creature.stats.reputation.value = min(creature.stats.reputation.value + 0.25, 5.0)
+    horde.members[0].upkeep.food += 3
+    horde.verify_totals()
+
+    horde.members = horde.members[3:]
+    assert horde.get_total_cunning() == sum(m.stats.cunning.value for m in horde.members)
+    assert horde.get_upkeep().gold == sum(m.upkeep.gold for m in horde.members)
+
+
+@fixed_random(11)
+def test_cull_swaps_last_member_into_vacated_slot():
+    commander = GoblinCommander("Grub", "Brainy")
+    horde = generate_horde(10, 10, commander=commander, columnar=True)
+    horde.bolster([Ogre(), Ogre()])
+    first, last = horde.members[0], horde.members[-1]
+
+    horde.cull([first])
+    assert horde.members[0] is last
+    assert horde.count_members([Goblin]) == 9
+    assert horde.count_members([Ogre]) == 2
+    assert all(horde.members[i]._slot == i for i in range(len(horde.members)))
+
+    victims = horde.sample_members([Goblin, Ogre], 50)
+    assert len(victims) == 11
+    assert commander not in victims
+    horde.cull(victims)
+    assert horde.members == [commander]
+    assert horde.get_total_cunning() == commander.stats.cunning.value
+
+
+def test_statistical_militia_matches_per_creature_generation():
+    rng = Random(16)
+    samples = 1500
+    per_creature = [generate_militia(30, 30, rng=rng).summarize() for _ in range(samples)]
+    statistical = [StatisticalMilitia(30, rng=rng).summarize() for _ in range(samples)]
+
+    # Two-sample Kolmogorov-Smirnov test on each total, at a significance level of 0.001
+    critical_distance = 1.95 * sqrt(2 / samples)
+    for field in ("total_beef", "total_cunning", "total_quickness", "total_reputation"):
+        a = sorted([getattr(s, field) for s in per_creature])
+        b = sorted([getattr(s, field) for s in statistical])
+        distance = max([abs(bisect_right(a, x) - bisect_right(b, x)) / samples for x in a + b])
+        assert distance < critical_distance, field
+
+
+def test_statistical_militia_materializes_its_drawn_totals():
+    militia = StatisticalMilitia(10_000, rng=Random(3))
+    summary = militia.summarize()
+    assert not militia.materialized and summary.size == 10_000
+
+    assert len(militia.members) == 10_000
+    assert militia.materialized
+    assert militia.summarize() == summary
+    militia.verify_totals()
+
+
+@fixed_random(17)
+def test_reputation_shift_matches_clamping_every_member():
+    for columnar in (False, True):
+        horde = generate_horde(40, 40, commander=GoblinCommander("Grub", "Notorious"), columnar=columnar)
+        expected = {id(c): c.stats.reputation.value for c in horde.members}
+
+        for delta in (0.5, 0.25, -0.5, -4.0, 0.1, 1.5, 0.15):
+            horde.shift_reputation(delta)
+            expected = {key: min(max(value + delta, 0.0), 5.0) for key, value in expected.items()}
+            if delta == -4.0:
+                # Writes and arrivals outside what the pending shift can produce force it to be applied
+                horde.members[3].stats.reputation.value = 5.0
+                expected[id(horde.members[3])] = 5.0
+                recruit = Goblin()
+                recruit.stats.reputation.value = 4.5
+                horde.bolster([recruit])
+                expected[id(recruit)] = 4.5
+
+        culled = horde.members[5]
+        horde.cull([culled])
+        assert isclose(culled.stats.reputation.value, expected.pop(id(culled)))
+        for creature in horde.members:
+            assert isclose(creature.stats.reputation.value, expected[id(creature)])
+        assert isclose(horde.get_total_reputation(), sum(expected.values()))
+
+
+def test_reputation_shifts_compose_exactly_and_total_ignores_counter_order():
+    deltas = (0.1, 0.05, -0.15, 0.25, 0.1, -0.05, 0.5, 0.1, 0.1, 0.05)
+    one_by_one = ReputationShift()
+    for delta in deltas:
+        one_by_one = one_by_one.then(delta, 0.0, 5.0)
+    for value in REPUTATION_STEPS:
+        steps = round(value * 20)
+        for delta in deltas:
+            steps = min(max(steps + round(delta * 20), 0), 100)
+        assert one_by_one.apply(value) == steps / 20
+
+    horde = generate_horde(30, 30, rng=Random(4))
+    reordered = generate_horde(30, 30, rng=Random(4))
+    reordered._stored_reputations = Counter(dict(reversed(reordered._stored_reputations.items())))
+    for group in (horde, reordered):
+        for delta in deltas:
+            group.shift_reputation(delta)
+    assert horde.get_total_reputation() == reordered.get_total_reputation()
+
+
+@fixed_random(23)
+def test_weakest_members_matches_a_full_sort_and_spares_the_commander():
+    for columnar in (False, True):
+        commander = GoblinCommander("Grub", "Brainy")
+        commander.stats.beef.value = 0
+        horde = generate_horde(60, 60, commander=commander, columnar=columnar)
+        candidates = [c for c in horde.members if not c.is_commander]
+
+        weakest = horde.weakest_members(12)
+        expected = sorted(candidates, key=lambda c: c.stats.beef.value)[:12]
+
+        assert commander not in weakest
+        assert sorted([c.stats.beef.value for c in weakest]) == [c.stats.beef.value for c in expected]
+        assert len(set(map(id, weakest))) == 12
+        assert len(horde.weakest_members(1000)) == len(candidates)
+
+        horde.cull(weakest)
+        assert commander in horde.members
+        assert horde.size == 61 - 12
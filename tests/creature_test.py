@@ -1,6 +1,13 @@
+import sys
+import tracemalloc
+
+import pytest
+
 import goblincommander.creatures
 from fixed_random import fixed_random
-from goblincommander.creatures import get_stat_rating, get_adjective
+from goblincommander.creatures import BYTES_PER_CREATURE, Human, Ogre, generate_batch, get_adjective_table, \
+    get_stat_rating, get_adjective
+from goblincommander.printers import get_column_widths
 from goblincommander.stats import Stats
 
 ADJECTIVES = {
@@ -19,12 +26,57 @@ ADJECTIVES = {
 }
 
 
+@pytest.fixture
+def stub_adjectives(monkeypatch):
+    """Replaces the adjective data for one test, dropping printer column widths worked out from either table."""
+    monkeypatch.setattr(goblincommander.creatures, "adjectives", ADJECTIVES, raising=False)
+    get_column_widths.cache_clear()
+    yield ADJECTIVES
+    get_column_widths.cache_clear()
+
+
 def test_get_stat_rating():
     assert get_stat_rating(5, 4, 6) == 0.5
 
 
 @fixed_random(123)
-def test_get_adjective():
-    goblincommander.creatures.adjectives = ADJECTIVES
+def test_get_adjective(stub_adjectives):
     stats = Stats(10, 10, 10, 5.0)
     assert get_adjective(stats, 4, 6, 4, 6, 4, 6) == "generic"
+
+
+@fixed_random(5)
+def test_creature_memory_footprint():
+    creature_count = 5000
+    Human()  # Build the shared adjective table outside the measurement
+    tracemalloc.start()
+    baseline, _ = tracemalloc.get_traced_memory()
+    creatures = [Human() for _ in range(creature_count)]
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    list_bytes = sys.getsizeof(creatures)
+    assert (allocated - baseline - list_bytes) / creature_count <= BYTES_PER_CREATURE
+
+
+@fixed_random(3)
+def test_generate_batch_draws_stats_within_type_ranges(stub_adjectives):
+    ogres = generate_batch(Ogre, 200)
+
+    assert len(ogres) == 200
+    assert all(type(o) is Ogre for o in ogres)
+    assert {o.stats.beef.value for o in ogres} == set(range(Ogre.MINIMUM_BEEF, Ogre.MAXIMUM_BEEF + 1))
+    assert all(Ogre.MINIMUM_CUNNING <= o.stats.cunning.value <= Ogre.MAXIMUM_CUNNING for o in ogres)
+    assert all(o.name in Ogre.name_options and o.adjective in ADJECTIVES for o in ogres)
+    assert generate_batch(Ogre, 0) == []
+
+
+def test_adjective_table_matches_get_adjective_buckets(stub_adjectives):
+    table = get_adjective_table(Ogre)
+
+    candidates, cum_weights = table.candidates((Ogre.MAXIMUM_BEEF, Ogre.MINIMUM_CUNNING, 3, 2.5))
+    assert candidates == ["generic", "strong", "himbo", "dumb"]
+    assert cum_weights == [1, 2, 3, 4]
+
+    # Out-of-range stats fall back to computing the buckets
+    assert table.candidates((50, 50, 50, 5.0))[0] == ["generic", "strong", "smart", "fast", "popular", "rounded"]
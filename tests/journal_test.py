@@ -0,0 +1,124 @@
+import io
+import json
+from contextlib import redirect_stdout
+from random import Random
+
+import pytest
+
+from goblincommander import journal, main, menus, savegame
+from goblincommander.creature_groups import ReputationShift
+from goblincommander.creatures import GoblinCommander
+from goblincommander.main import StateKey
+from goblincommander.simulation import GreedyPolicy, take_action
+
+
+def play_session(monkeypatch, turns: int):
+    """Plays a new game through the menus for the given number of turns, cycling through the journaled actions."""
+    actions = iter(["raid", "explore", "recruit_goblins", "scout", "cull_horde", "recruit_ogres"] * turns)
+    selections = {"main_menu_selection": iter(["NEW", "QUIT"]),
+                  "name_menu_select": iter(["random"]),
+                  "title_menu_select": iter(["Brainy"]),
+                  "game_menu_selection": iter([next(actions) for _ in range(turns)] + ["quit"]),
+                  "surrender_menu_selection": iter(lambda: "accept", None)}
+
+    def scripted_selection(selection_config: dict):
+        if selection_config["name"] in ("raid_menu_selection", "scout_menu_selection"):
+            # The settlement at the top of the menu, or "Back" if there are none
+            first_choice = selection_config["choices"][0]
+            return first_choice[1] if isinstance(first_choice, tuple) else first_choice
+        return next(selections[selection_config["name"]])
+
+    monkeypatch.setattr(menus, "process_single_selection_menu", scripted_selection)
+    monkeypatch.setattr(journal, "CHECKPOINT_INTERVAL", 5)
+    main.run()
+
+
+def write_entries(path, entries):
+    path.write_text("".join([json.dumps(e) + "\n" for e in entries]))
+
+
+def dumps(state) -> bytes:
+    out = io.BytesIO()
+    savegame.dump(state, out)
+    return out.getvalue()
+
+
+def test_replaying_a_journal_rebuilds_the_game(monkeypatch):
+    play_session(monkeypatch, 24)
+    expected = dumps(main.state)
+    entries = journal.read_entries()
+    actions = [e["action"] for e in entries if e["event"] == "action"]
+    assert actions[:3] == ["raid", "explore", "recruit_goblins"]
+    # A win can end the session before every scripted turn is played
+    assert [e["turn"] for e in entries if e["event"] == "checkpoint"] == list(range(5, len(actions) + 1, 5))
+
+    main.state.clear()
+    assert dumps(journal.replay()) == expected
+
+
+def test_checkpoints_hold_the_live_game_exactly(tmp_path):
+    shifted_checkpoints = 0
+    for seed in range(4):
+        path = tmp_path / f"{seed}.journal"
+        main.start_game(GoblinCommander("Grub", "Brainy"), Random(seed))
+        main.journal = journal.Journal.start(seed, str(path), checkpoint_interval=7)
+        policy, policy_rng = GreedyPolicy(), Random(seed)
+        live = {}
+        for turn in range(1, 43):
+            take_action(*policy.choose_action(main.state, policy_rng), policy)
+            live[turn] = dumps(main.state)
+            if turn % 7 == 0:
+                shifted_checkpoints += main.state[StateKey.HORDE].reputation_shift != ReputationShift()
+        main.close_journal()
+
+        for turn in (14, 17, 28, 31):
+            assert dumps(journal.replay(str(path), turn)) == live[turn]
+    # Raids leave the horde's reputation shift pending, which the checkpoints have to carry over
+    assert shifted_checkpoints
+
+
+def test_checkpoints_keep_the_order_creatures_are_culled_by_type_in(tmp_path):
+    path = tmp_path / "culls.journal"
+    with redirect_stdout(io.StringIO()):
+        main.start_game(GoblinCommander("Grub", "Brainy"), Random(8))
+        main.journal = journal.Journal.start(8, str(path), checkpoint_interval=3)
+        live = []
+        # Ogres swap into the slots of culled goblins, so member order and the per-type order drift apart
+        for _ in range(4):
+            for function in (main.recruit_goblins_fn, main.recruit_ogres_fn):
+                main.take_turn(function)
+                live.append(dumps(main.state))
+        main.close_journal()
+
+    for turn in (4, 5, 7, 8):
+        assert dumps(journal.replay(str(path), turn)) == live[turn - 1]
+
+
+def test_sessions_keep_their_own_journals(monkeypatch):
+    play_session(monkeypatch, 6)
+    first = journal.get_latest_journal_path()
+    first_entries = journal.read_entries(first)
+    play_session(monkeypatch, 4)
+
+    assert journal.get_latest_journal_path() != first
+    assert journal.read_entries(first) == first_entries
+    assert len([e for e in journal.read_entries() if e["event"] == "action"]) == 4
+
+
+def test_fast_forwarding_from_a_checkpoint_matches_replaying_from_the_start(monkeypatch, tmp_path):
+    play_session(monkeypatch, 24)
+    without_checkpoints = tmp_path / "from-seed.journal"
+    write_entries(without_checkpoints, [e for e in journal.read_entries() if e["event"] != "checkpoint"])
+
+    assert dumps(journal.replay(turn=17)) == dumps(journal.replay(str(without_checkpoints), turn=17))
+
+
+def test_replay_reports_where_it_diverges(monkeypatch, tmp_path):
+    play_session(monkeypatch, 8)
+    entries = [e for e in journal.read_entries() if e["event"] != "checkpoint"]
+    entries[3]["outcome"]["food"] += 1
+    tampered = tmp_path / "tampered.journal"
+    write_entries(tampered, entries)
+
+    with pytest.raises(ValueError, match=f"Turn {entries[3]['turn']} replayed differently.*food"):
+        journal.replay(str(tampered))
@@ -0,0 +1,29 @@
+import sys
+
+from goblincommander import main, menus
+
+
+def test_long_session_keeps_a_constant_stack_depth(monkeypatch):
+    selections = iter(["NEW", "random", "Brainy"] + ["view_profile", "explore"] * 600 + ["quit", "QUIT"])
+    depths = []
+
+    def scripted_selection(selection_config: dict):
+        depths.append(len(_frames()))
+        return next(selections)
+
+    monkeypatch.setattr(menus, "process_single_selection_menu", scripted_selection)
+    monkeypatch.setattr(main, "view_profile_fn", lambda: None)
+
+    main.run()
+
+    assert next(selections, None) is None
+    assert max(depths[3:]) == min(depths[3:])
+
+
+def _frames() -> list:
+    frames = []
+    frame = sys._getframe(1)
+    while frame:
+        frames.append(frame)
+        frame = frame.f_back
+    return frames
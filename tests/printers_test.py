@@ -1,4 +1,10 @@
-from goblincommander.printers import print_title_figure
+import io
+
+from fixed_random import fixed_random
+from goblincommander.creature_groups import generate_horde
+from goblincommander.creatures import GoblinCommander
+from goblincommander import console, printers
+from goblincommander.printers import print_creature_group, print_title_figure, render_banner
 
 
 def test_print_title_figure_prints_only_once(capsys):
@@ -8,3 +14,59 @@ def test_print_title_figure_prints_only_once(capsys):
     print_title_figure('test')
     captured = capsys.readouterr()
     assert captured.out == ''
+
+
+@fixed_random(4)
+def test_print_creature_group_streams_filtered_pages_with_an_aggregate_footer():
+    horde = generate_horde(30, 30, commander=GoblinCommander("Grub", "Swift"))
+    strong = sorted([c for c in horde.members if not c.is_commander and c.stats.beef.value >= 3],
+                    key=lambda c: c.stats.beef.value, reverse=True)
+    pages = []
+
+    out = io.StringIO()
+    print_creature_group(horde, page_size=4, pause=lambda: pages.append(out.tell()) or len(pages) < 2, out=out,
+                         minimum_beef=3, sort_by="beef", descending=True)
+    lines = out.getvalue().splitlines()
+
+    assert len(pages) == 2
+    rows = lines[2:2 + 8]
+    assert [row.split()[0] for row in rows] == [c.name for c in strong[:8]]
+    assert "Grub" not in out.getvalue()
+    assert lines[-3].split()[1:] == [f"{horde.get_avg_beef():3.2f}", f"{horde.get_avg_cunning():3.2f}",
+                                     f"{horde.get_avg_quickness():3.2f}", f"{horde.get_avg_reputation():3.2f}"]
+
+
+def test_banners_render_once_then_come_from_the_cache_file(monkeypatch):
+    banner = render_banner("Cached")
+    assert "____" in banner
+
+    # With nothing in memory and no way to render, the banner can only come from the cache file
+    def no_figlet(font):
+        raise AssertionError("banner was rendered again")
+
+    monkeypatch.setattr(printers, "_banners", {})
+    monkeypatch.setattr(printers, "get_figlet", no_figlet)
+    assert render_banner("Cached") == banner
+
+
+@fixed_random(4)
+def test_print_creature_group_draws_pages_over_each_other_on_a_screen(monkeypatch):
+    horde = generate_horde(30, 30, commander=GoblinCommander("Grub", "Swift"))
+    monkeypatch.setattr(console, "supports_ansi", lambda: True)
+    monkeypatch.setenv("COLUMNS", "120")
+    monkeypatch.setenv("LINES", "10")
+
+    class Terminal(io.StringIO):
+        def isatty(self):
+            return True
+
+    out = Terminal()
+    pages = []
+    print_creature_group(horde, pause=lambda: pages.append(out.tell()) or len(pages) < 2, out=out,
+                         screen=console.ScreenModel(top=2))
+    second_page = out.getvalue()[pages[0]:pages[1]]
+
+    # Below the headers on rows 2 and 3, which are only written once, rows 4 to 8 hold creatures and 9 the prompt
+    assert second_page.count("\033[K") <= 5
+    assert "\033[2;1H" not in second_page and "\033[3;1H" not in second_page
+    assert second_page.endswith("\033[9;1H\033[J")
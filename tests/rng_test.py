@@ -0,0 +1,25 @@
+from goblincommander.creature_groups import generate_horde
+from goblincommander.rng import RandomStream
+from goblincommander.settlements import BusyTown
+
+
+def test_child_streams_are_reproducible_and_independent():
+    parent = RandomStream(8)
+    untouched = RandomStream(8)
+    children = parent.spawn(2)
+
+    assert parent.random() == untouched.random()
+    assert [c.path for c in children] == [(0,), (1,)]
+    assert children[0].random() != children[1].random()
+    assert [c.random() for c in parent.spawn(1)] == [RandomStream(8, (2,)).random()]
+
+
+def test_generators_draw_only_from_the_given_stream():
+    first = generate_horde(rng=RandomStream(4))
+    second = generate_horde(rng=RandomStream(4))
+    assert [(c.name, c.adjective, c.stats_string()) for c in first.members] == \
+           [(c.name, c.adjective, c.stats_string()) for c in second.members]
+
+    first_town, second_town = BusyTown(RandomStream(5)), BusyTown(RandomStream(5))
+    assert (first_town.name, first_town.reward.food, len(first_town.militia.members)) == \
+           (second_town.name, second_town.reward.food, len(second_town.militia.members))
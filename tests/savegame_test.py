@@ -0,0 +1,116 @@
+import io
+from random import Random
+
+from goblincommander import main, savegame
+from goblincommander.creatures import Goblin, GoblinCommander
+from goblincommander.main import StateKey
+from goblincommander.simulation import Action, GreedyPolicy, play_game, take_action
+
+
+def snapshot(state) -> tuple:
+    horde = state[StateKey.HORDE]
+    return (state[StateKey.WEEK], state[StateKey.VICTORIOUS], state[StateKey.STASH].food, state[StateKey.STASH].gold,
+            state[StateKey.RNG].getstate(), state[StateKey.COMMANDER].name,
+            [(type(s), s.name, s.description, s.militia_size, s.militia_seed, s.reward.food, s.reward.gold,
+              s.defeated, s.scouted, s.militia.size) for s in state[StateKey.SETTLEMENTS]],
+            [(type(m), m.name, m.adjective, m.is_commander, m.stats.beef.value, m.stats.cunning.value,
+              m.stats.quickness.value, m.stats.reputation.value, m.upkeep.food, m.upkeep.gold) for m in horde.members],
+            horde.get_total_beef(), horde.get_total_cunning(), horde.get_total_quickness(),
+            round(horde.get_total_reputation(), 9), horde.get_upkeep().food, horde.get_upkeep().gold)
+
+
+def dumps(state) -> bytes:
+    out = io.BytesIO()
+    savegame.dump(state, out)
+    return out.getvalue()
+
+
+def test_saved_games_round_trip_and_play_on_like_the_live_game():
+    play_game(5, GreedyPolicy(), max_weeks=30)
+    saved = dumps(main.state)
+    expected = snapshot(main.state)
+
+    loaded = savegame.loads(saved)
+    assert snapshot(loaded) == expected
+    assert loaded[StateKey.COMMANDER] in loaded[StateKey.HORDE].members
+    assert dumps(loaded) == saved
+
+    # Ogres recruited between culls of goblins leave the per-type index out of member order
+    turns = [Action.RECRUIT_GOBLINS, Action.RECRUIT_OGRES] * 4
+    main.start_game(GoblinCommander("Grub", "Brainy"), Random(8))
+    for action in turns[:3]:
+        take_action(action, None, GreedyPolicy())
+    saved = dumps(main.state)
+    for action in turns[3:]:
+        take_action(action, None, GreedyPolicy())
+    live = dumps(main.state)
+
+    main.state.update(savegame.loads(saved))
+    for action in turns[3:]:
+        take_action(action, None, GreedyPolicy())
+    assert dumps(main.state) == live
+
+
+def test_save_and_load_through_the_save_file():
+    play_game(8, GreedyPolicy(), max_weeks=5)
+    savegame.save(main.state)
+
+    assert snapshot(savegame.load()) == snapshot(main.state)
+
+
+def test_loaded_hordes_save_members_under_their_new_labels():
+    play_game(5, GreedyPolicy(), max_weeks=10)
+    savegame.save(main.state)
+
+    for loaded in (savegame.load(mapped=False), savegame.load()):
+        loaded[StateKey.COMMANDER].name = "Snaggletooth"
+        members = loaded[StateKey.HORDE].members
+        members[-1].adjective = members[0].adjective
+        assert snapshot(savegame.loads(dumps(loaded))) == snapshot(loaded)
+
+
+def test_mapped_hordes_create_members_only_when_used():
+    play_game(5, GreedyPolicy(), max_weeks=30)
+    savegame.save(main.state)
+    saved_horde = main.state[StateKey.HORDE]
+
+    loaded = savegame.load()
+    horde = loaded[StateKey.HORDE]
+    assert isinstance(horde, savegame.MappedHorde) and horde.mapped
+    assert horde.summarize() == saved_horde.summarize()
+    assert (horde.get_upkeep().food, horde.get_upkeep().gold) == (saved_horde.get_upkeep().food,
+                                                                   saved_horde.get_upkeep().gold)
+    assert list(horde.created_members().values()) == [loaded[StateKey.COMMANDER]]
+
+    # Culls and reputation changes work on the mapped columns
+    horde.cull(horde.weakest_members(3))
+    horde.shift_reputation(-0.5)
+    assert horde.mapped and horde.size == saved_horde.size - 3
+    assert len(horde.created_members()) <= 4
+
+    # Anything else moves the horde into memory first
+    main.state.update(loaded)
+    main.add_members_to_horde(horde, Goblin, 2, 2)
+    assert not horde.mapped and horde.size == saved_horde.size - 1
+
+
+def test_mapped_and_loaded_hordes_play_on_like_the_live_game():
+    # Culls on the mapped columns come before culls by type, which move the horde into memory
+    actions = [Action.CULL_HORDE, Action.RECRUIT_OGRES, Action.CULL_HORDE, Action.RECRUIT_OGRES, Action.EXPLORE,
+               Action.RECRUIT_GOBLINS, Action.CULL_HORDE, Action.RECRUIT_OGRES]
+
+    def play_on(shifts) -> bytes:
+        # As winning and losing raids do, over stored reputations counted in whatever order the load found them
+        for shift in shifts:
+            main.state[StateKey.HORDE].shift_reputation(shift)
+        for action in actions:
+            take_action(action, None, GreedyPolicy())
+        return dumps(main.state)
+
+    for shifts in ((), (0.25, -0.5, 0.15, 0.1)):
+        play_game(2, GreedyPolicy(), max_weeks=30)
+        savegame.save(main.state)
+        expected = play_on(shifts)
+        for mapped in (True, False):
+            main.state.update(savegame.load(mapped=mapped))
+            assert play_on(shifts) == expected
@@ -0,0 +1,61 @@
+from random import Random
+
+from goblincommander.creature_groups import generate_militia
+from goblincommander.creatures import Human
+from goblincommander.settlements import BusyTown, BustlingCity, GleamingCastle, NomadEncampment, QuietVillage, \
+    SettlementRegistry, get_settlement_factory
+
+
+def test_registry_indexes_follow_defeated_and_scouted_flags():
+    settlements = [NomadEncampment(), BusyTown(), QuietVillage(), BusyTown()]
+    registry = SettlementRegistry(settlements)
+
+    def expected_order(candidates):
+        return sorted(candidates, key=lambda s: s.expected_beef, reverse=True)
+
+    assert registry.active_by_expected_beef() == expected_order(settlements)
+
+    settlements[1].scouted = True
+    settlements[2].defeated = True
+
+    assert registry.active() == [settlements[0], settlements[1], settlements[3]]
+    assert registry.defeated() == [settlements[2]]
+    assert registry.scoutable() == [settlements[0], settlements[3]]
+    assert registry.active_by_expected_beef() == expected_order([settlements[0], settlements[1], settlements[3]])
+    assert registry.scoutable_by_expected_beef() == expected_order([settlements[0], settlements[3]])
+    assert registry.of_type(BusyTown) == [settlements[1], settlements[3]]
+    assert not registry.has_type(GleamingCastle)
+    assert list(registry) == settlements
+
+    for settlement in settlements:
+        settlement.defeated = True
+    assert registry.active_count == 0
+    assert registry.defeated_count == len(registry) == 4
+    assert registry.scoutable_by_expected_beef() == []
+
+
+def test_factories_pick_from_the_week_band_before_building():
+    random_factory = get_settlement_factory("random")
+    rng = Random(2)
+
+    assert set(random_factory.pick_types(4, 50, rng)) == {NomadEncampment, QuietVillage}
+    assert set(random_factory.pick_types(5, 50, rng)) == {QuietVillage, BusyTown, BustlingCity}
+    assert set(random_factory.pick_types(40, 50, rng)) == {BustlingCity, GleamingCastle}
+    assert [type(s) for s in get_settlement_factory("minimum").spawn(12, rng=rng)] == [BusyTown, BusyTown,
+                                                                                       BustlingCity]
+    assert len(get_settlement_factory("starting").spawn(1, 7, rng)) == 7
+
+
+def test_militia_is_generated_on_first_access_as_if_eagerly():
+    rng = Random(9)
+    deferred = BustlingCity(rng)
+    rng.random()
+    assert not deferred.militia_generated
+
+    eager = generate_militia(minimum_size=deferred.militia_size, maximum_size=deferred.militia_size,
+                             rng=Random(deferred.militia_seed))
+    eager_members = [(h.name, h.adjective, h.stats_string()) for h in eager.members]
+
+    assert [(h.name, h.adjective, h.stats_string()) for h in deferred.militia.members] == eager_members
+    assert len(eager_members) == deferred.militia_size
+    assert deferred.expected_beef == (Human.MINIMUM_BEEF + Human.MAXIMUM_BEEF) / 2 * deferred.militia_size
@@ -0,0 +1,38 @@
+import random
+
+import pytest
+
+from goblincommander.simulation import GreedyPolicy, Policy, play_game, simulate_games
+
+
+def test_games_are_reproducible_by_seed():
+    policy = GreedyPolicy()
+
+    assert play_game(3, policy) == play_game(3, policy)
+
+
+def test_parallel_simulation_matches_serial():
+    serial_summary, serial_results = simulate_games(6, seed=10, workers=1)
+    parallel_summary, parallel_results = simulate_games(6, seed=10, workers=2)
+
+    assert parallel_results == serial_results
+    assert parallel_summary == serial_summary
+    assert serial_summary.games == 6
+    assert serial_summary.loss_rate == 1 - serial_summary.victories / 6
+    assert serial_summary.max_peak_horde_size >= 1
+
+
+def test_games_never_draw_from_the_global_random_module():
+    before = random.getstate()
+
+    play_game(4, GreedyPolicy(), max_weeks=60)
+
+    assert random.getstate() == before
+
+
+def test_policies_must_choose_actions():
+    class Idle(Policy):
+        pass
+
+    with pytest.raises(TypeError):
+        Idle()